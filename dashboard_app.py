@@ -13,9 +13,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'grid
 
 from agents.normalizer import normalize_term
 from agents.query_parser import QueryParserAgent
-from agents.retriever_opentargets import get_targets_for_disease, get_diseases_for_drug
+from agents.retriever_opentargets import get_for_intent
 from agents.matcher import MatcherAgent
 from agents.output_generator import OutputGeneratorAgent
+from agents.records import parse_indications, parse_targets
 
 # Initialize agents
 parser = QueryParserAgent()
@@ -74,7 +75,7 @@ if st.button("Run Query"):
 
         retrieved_data = {}
         if entity_type == "disease":
-            data = get_targets_for_disease(norm["resolved_id"])
+            data = get_for_intent(parsed, norm["resolved_id"])
             with st.expander("Raw API Output"):
                 st.json(data)
             rows = (
@@ -85,16 +86,9 @@ if st.button("Run Query"):
             )
             if not rows:
                 st.warning("No data found for this query.")
-            retrieved_data["targets"] = [
-                {
-                    "id": r.get("target", {}).get("id"),
-                    "approvedSymbol": r.get("target", {}).get("approvedSymbol"),
-                    "score": r.get("score"),
-                }
-                for r in rows
-            ]
+            retrieved_data["targets"] = parse_targets(rows)
         elif entity_type == "drug":
-            data = get_diseases_for_drug(norm["resolved_id"])
+            data = get_for_intent(parsed, norm.get("chembl_id") or norm["resolved_id"])
             with st.expander("Raw API Output"):
                 st.json(data)
             rows = (
@@ -105,13 +99,7 @@ if st.button("Run Query"):
             )
             if not rows:
                 st.warning("No data found for this query.")
-            retrieved_data["diseases"] = [
-                {
-                    "name": r.get("disease", {}).get("name"),
-                    "phase": r.get("status"),
-                }
-                for r in rows
-            ]
+            retrieved_data["diseases"] = parse_indications(rows)
 
         matched = matcher.match(parsed, retrieved_data)
 
@@ -0,0 +1,222 @@
+"""Response caching for GRID agents.
+
+This module defines:
+
+- ``ResponseCache``: a small SQLite-backed key/value store with per-entry TTL,
+  size-bounded LRU eviction and hit/miss statistics.  The Open Targets
+  retriever uses it underneath ``_post`` so repeated GraphQL queries for the
+  same entity are answered from disk instead of the network.
+- ``LRUCache``: the in-process equivalent, used as the first tier in front of
+  a ``ResponseCache`` by the normalizer.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "grid_agentic_ai", "responses.sqlite"
+)
+
+
+class ResponseCache:
+    """SQLite-backed cache of JSON-serialisable responses.
+
+    Parameters
+    ----------
+    path:
+        Location of the SQLite database. Use ``":memory:"`` for a
+        process-local cache.
+    ttl:
+        Default lifetime of an entry in seconds.
+    max_entries:
+        Maximum number of entries kept; the least recently used entries are
+        evicted once the limit is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = 24 * 3600,
+        max_entries: int = 10000,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+        self._last_access = 0.0
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, variables: Optional[Dict[str, Any]] = None) -> str:
+        """Return a stable cache key for a query text and its variables."""
+        payload = json.dumps(
+            {"query": " ".join(query.split()), "variables": variables or {}},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _tick(self) -> float:
+        """Return a strictly increasing access timestamp (lock must be held)."""
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        with self._lock:
+            now = self._tick()
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._stats["hits"] += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` and evict old entries if needed."""
+        data = json.dumps(value)
+        with self._lock:
+            now = self._tick()
+            expires_at = now + (self.ttl if ttl is None else ttl)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                (key, data, expires_at, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._stats["evictions"] += excess
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current entry count."""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return dict(self._stats, entries=count)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self.stats()["entries"]
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with per-entry TTL.
+
+    Parameters
+    ----------
+    max_entries:
+        Maximum number of entries kept before the least recently used one is
+        evicted.
+    ttl:
+        Default lifetime of an entry in seconds; ``None`` keeps entries until
+        they are evicted.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if needed."""
+        lifetime = self.ttl if ttl is None else ttl
+        expires_at = None if lifetime is None else time.monotonic() + lifetime
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current entry count."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,136 @@
+"""Column-oriented expression data for vectorised matching.
+
+``ExpressionColumns`` stores expression records as parallel arrays (IDs,
+integer tissue codes and float expression values) so that ``MatcherAgent``
+can apply tissue and threshold filters as NumPy masks instead of looping over
+dictionaries.  Build it once per table and pass it in place of the list under
+``expression_data`` or ``targets``::
+
+    >>> table = ExpressionColumns.from_records(records)
+    >>> MatcherAgent().match(parsed, {"expression_data": table})
+
+Tables built with ``from_records`` return the original record objects, so
+results are identical to the dict path.  NumPy is optional; without it only
+the dict path is available.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+
+def _factorize(values: Iterable[Hashable]):
+    """Return ``(categories, codes)`` for ``values`` in first-seen order."""
+    lookup: Dict[Hashable, int] = {}
+    codes = [lookup.setdefault(value, len(lookup)) for value in values]
+    return list(lookup), np.array(codes, dtype=np.int32)
+
+
+class ExpressionColumns:
+    """Expression records held as NumPy columns.
+
+    Parameters
+    ----------
+    ids:
+        Record IDs, stored under ``id_key`` in each row.
+    expression:
+        Expression values; ``None`` or NaN marks a missing value.
+    tissues:
+        Optional tissue label per record.
+    id_key:
+        Row key holding the ID: ``"target"`` for ``expression_data`` rows and
+        ``"id"`` for ``targets`` rows.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[Any],
+        expression: Sequence[Any],
+        tissues: Optional[Sequence[Any]] = None,
+        id_key: str = "target",
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for columnar expression data")
+        self.id_key = id_key
+        self.ids = ids.tolist() if isinstance(ids, np.ndarray) else list(ids)
+        if isinstance(expression, np.ndarray):
+            self.values = expression.astype(np.float64, copy=False)
+            self.present = ~np.isnan(self.values)
+            self._raw: Optional[List[Any]] = None
+        else:
+            raw = list(expression)
+            self.values = np.array(
+                [np.nan if v is None else float(v) for v in raw], dtype=np.float64
+            )
+            self.present = np.array([v is not None for v in raw], dtype=bool)
+            self._raw = raw
+        if len(self.ids) != len(self.values):
+            raise ValueError("ids and expression must have the same length")
+        self.tissues: Optional[List[Any]] = None
+        self.tissue_codes = None
+        if tissues is not None:
+            self.tissues, self.tissue_codes = _factorize(
+                tissues.tolist() if isinstance(tissues, np.ndarray) else tissues
+            )
+            if len(self.tissue_codes) != len(self.values):
+                raise ValueError("tissues and expression must have the same length")
+        self._records: Optional[List[Dict]] = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], id_key: str = "target") -> "ExpressionColumns":
+        """Build columns from ``{id_key, "tissue", "expression"}`` dictionaries."""
+        records = list(records)
+        table = cls(
+            [r.get(id_key) for r in records],
+            [r.get("expression") for r in records],
+            [r.get("tissue") for r in records],
+            id_key=id_key,
+        )
+        table._records = records
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.rows(range(len(self))))
+
+    def expression(self, i: int) -> Any:
+        """Return the expression value of record ``i`` as it was given."""
+        if self._raw is not None:
+            return self._raw[i]
+        return float(self.values[i]) if self.present[i] else None
+
+    def rows(self, indices: Iterable[int]) -> List[Dict]:
+        """Return the records at ``indices`` as dictionaries."""
+        if isinstance(indices, np.ndarray):
+            indices = indices.tolist()
+        if self._records is not None:
+            return [self._records[i] for i in indices]
+        rows = []
+        for i in indices:
+            row = {self.id_key: self.ids[i], "expression": self.expression(i)}
+            if self.tissues is not None:
+                row["tissue"] = self.tissues[self.tissue_codes[i]]
+            rows.append(row)
+        return rows
+
+    def select(self, threshold: Optional[float] = None, tissue: Any = None):
+        """Return the indices of records with a value, optionally filtered.
+
+        ``tissue`` keeps records with that exact tissue label and ``threshold``
+        keeps values ``>= threshold``.
+        """
+        mask = self.present
+        if tissue is not None:
+            if self.tissues is None or tissue not in self.tissues:
+                return np.empty(0, dtype=np.intp)
+            mask = mask & (self.tissue_codes == self.tissues.index(tissue))
+        if threshold is not None:
+            mask = mask & (self.values >= threshold)
+        return np.flatnonzero(mask)
@@ -0,0 +1,131 @@
+"""Approximate matching of misspelled entity names.
+
+``FuzzyIndex`` keeps an n-gram inverted index over known entity names.  A
+search first collects names that share enough n-grams with the query to be
+within the requested edit distance (the q-gram count filter), then verifies
+the survivors with a bounded Levenshtein distance, so only a handful of
+strings are ever compared in full.
+
+Example::
+
+    >>> index = FuzzyIndex([("drug", "imatinib"), ("drug", "dasatinib")])
+    >>> index.search("imatinb", term_type="drug")[0]
+    FuzzyMatch(term='imatinib', term_type='drug', distance=1, confidence=0.875)
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .synonym_index import normalize_key
+
+
+class FuzzyMatch(NamedTuple):
+    term: str
+    term_type: str
+    distance: int
+    confidence: float
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Return the edit distance between ``a`` and ``b`` if it is <= ``max_distance``."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for j, cb in enumerate(b, 1):
+        current = [j]
+        row_min = j
+        for i, ca in enumerate(a, 1):
+            cost = min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + (ca != cb))
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class FuzzyIndex:
+    """n-gram index over ``(term_type, name)`` pairs for typo-tolerant lookups."""
+
+    def __init__(self, names: Iterable[Tuple[str, str]], n: int = 3) -> None:
+        self.n = n
+        self._terms: List[str] = []
+        self._types: List[str] = []
+        self._gram_counts: List[int] = []
+        self._postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        seen = set()
+        for term_type, name in names:
+            key = normalize_key(name)
+            if not key or (term_type, key) in seen:
+                continue
+            seen.add((term_type, key))
+            idx = len(self._terms)
+            self._terms.append(key)
+            self._types.append(term_type)
+            self._by_length[len(key)].append(idx)
+            grams = set(self._grams(key))
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram, len(key)].append(idx)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _grams(self, text: str) -> List[str]:
+        pad = " " * (self.n - 1)
+        padded = f"{pad}{text}{pad}"
+        return [padded[i:i + self.n] for i in range(len(padded) - self.n + 1)]
+
+    def _candidates(self, key: str, max_distance: int) -> Iterable[int]:
+        # Each edit destroys at most n grams of either string, so a match within
+        # ``max_distance`` shares at least ``distinct grams - n * max_distance``
+        # grams with the query, counted from both sides. Postings are split by
+        # name length so only names of a feasible length are counted.
+        grams = set(self._grams(key))
+        slack = self.n * max_distance
+        low, high = len(key) - max_distance, len(key) + max_distance
+        if len(grams) <= slack:
+            return (i for length in range(max(low, 1), high + 1) for i in self._by_length[length])
+        counts: Counter = Counter()
+        postings = self._postings
+        for length in range(max(low, 1), high + 1):
+            for gram in grams:
+                counts.update(postings.get((gram, length), ()))
+        floor = len(grams) - slack
+        gram_counts = self._gram_counts
+        return (
+            i for i, shared in counts.items()
+            if shared >= floor and shared >= gram_counts[i] - slack
+        )
+
+    def search(
+        self,
+        query: str,
+        max_distance: int = 2,
+        limit: int = 5,
+        term_type: Optional[str] = None,
+    ) -> List[FuzzyMatch]:
+        """Return up to ``limit`` names within ``max_distance`` edits, best first.
+
+        ``confidence`` is ``1 - distance / max(len(query), len(name))``.
+        """
+        key = normalize_key(query)
+        if not key:
+            return []
+        matches = []
+        for idx in self._candidates(key, max_distance):
+            if term_type is not None and self._types[idx] != term_type:
+                continue
+            term = self._terms[idx]
+            distance = bounded_levenshtein(key, term, max_distance)
+            if distance is None:
+                continue
+            confidence = 1 - distance / max(len(key), len(term))
+            matches.append(FuzzyMatch(term, self._types[idx], distance, round(confidence, 4)))
+        matches.sort(key=lambda m: (m.distance, -m.confidence, m.term))
+        return matches[:limit]
@@ -0,0 +1,139 @@
+"""Shared HTTP client for GRID agents.
+
+All outbound calls made by the retriever and normalizer go through a single
+``HTTPClient`` so that TCP/TLS connections are kept alive and reused instead
+of being re-established for every request.  Connection pool sizes and
+timeouts can be tuned globally or per host.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    requests = None  # type: ignore
+    HTTPAdapter = None  # type: ignore
+
+DEFAULT_TIMEOUT = 10.0
+
+# Hosts contacted by the agents, with pool sizes matching their typical load.
+DEFAULT_HOSTS: Dict[str, Dict[str, Any]] = {
+    "api.platform.opentargets.org": {"pool_maxsize": 20},
+    "clinicaltrials.gov": {"pool_maxsize": 10},
+    "mygene.info": {"pool_maxsize": 10},
+    "www.ebi.ac.uk": {"pool_maxsize": 10},
+}
+
+
+class HTTPClient:
+    """Thin wrapper around a pooled ``requests.Session``.
+
+    Parameters
+    ----------
+    timeout:
+        Default timeout in seconds applied when a call does not pass one.
+    pool_connections:
+        Number of per-host connection pools to cache.
+    pool_maxsize:
+        Default maximum number of connections kept alive per host.
+    hosts:
+        Optional per-host overrides, e.g.
+        ``{"mygene.info": {"pool_maxsize": 4, "timeout": 5}}``.
+    session:
+        Pre-built session object to use instead of creating one.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        hosts: Optional[Dict[str, Dict[str, Any]]] = None,
+        session: Any = None,
+    ) -> None:
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.hosts = dict(DEFAULT_HOSTS if hosts is None else hosts)
+        self._session = session
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> Any:
+        """Return the shared session, creating it on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> Any:
+        if requests is None:
+            raise RuntimeError("The 'requests' package is required for HTTP access")
+        session = requests.Session()
+        if HTTPAdapter is None:
+            return session
+        default = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", default)
+        session.mount("http://", default)
+        for host, cfg in self.hosts.items():
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=cfg.get("pool_maxsize", self.pool_maxsize),
+            )
+            session.mount(f"https://{host}", adapter)
+            session.mount(f"http://{host}", adapter)
+        return session
+
+    def timeout_for(self, url: str) -> float:
+        """Return the configured timeout for the host of ``url``."""
+        host = urlsplit(url).hostname or ""
+        return self.hosts.get(host, {}).get("timeout", self.timeout)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        """Send a GET request over the pooled session."""
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """Send a POST request over the pooled session."""
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        return self.session.post(url, **kwargs)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Return the process-wide ``HTTPClient``."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def configure_client(**kwargs: Any) -> HTTPClient:
+    """Replace the process-wide client with one built from ``kwargs``."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HTTPClient(**kwargs)
+    return _client
@@ -0,0 +1,268 @@
+"""Offline Open Targets backend built from Platform release files.
+
+``LocalOpenTargetsStore`` ingests the Open Targets Platform release datasets
+into an indexed SQLite database and answers ``get_targets_for_disease`` and
+``get_diseases_for_drug`` with the same response shapes as the GraphQL API.
+Select it with ``retriever_opentargets.use_local_backend`` or the
+``GRID_OT_BACKEND`` environment variable to take the network off the hot path.
+
+Datasets read from a release directory (JSON lines or parquet part files)::
+
+    targets/                      id, approvedSymbol
+    diseases/                     id, name
+    associationByOverallDirect/   diseaseId, targetId, score
+    molecule/                     id, name
+    indication/                   id, indications[disease, maxPhaseForIndication]
+
+Build a store from the command line::
+
+    python -m grid_agentic_ai.agents.local_backend /data/ot/25.03 ot_local.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import threading
+from itertools import islice
+from urllib.parse import quote
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    pq = None  # type: ignore
+
+ASSOCIATION_DATASETS = ("associationByOverallDirect", "associationByOverallIndirect")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    id TEXT PRIMARY KEY, approved_symbol TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS diseases (
+    id TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS drugs (
+    id TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS associations (
+    disease_id TEXT NOT NULL, target_id TEXT NOT NULL, score REAL);
+CREATE TABLE IF NOT EXISTS indications (
+    drug_id TEXT NOT NULL, disease_id TEXT NOT NULL, phase REAL, status TEXT);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS associations_by_disease ON associations(disease_id, score DESC);
+CREATE INDEX IF NOT EXISTS indications_by_drug ON indications(drug_id);
+"""
+
+
+def iter_release_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield records from a release dataset file or directory of part files."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if not name.startswith((".", "_")):
+                yield from iter_release_records(os.path.join(path, name))
+        return
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError("pyarrow is required to read parquet release files")
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches():
+            yield from batch.to_pylist()
+        return
+    if path.endswith((".json", ".jsonl", ".json.gz", ".jsonl.gz")):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class LocalOpenTargetsStore:
+    """Indexed SQLite copy of the Open Targets data used by the pipeline.
+
+    Stores are opened read-only and must already exist; only ``build`` (or
+    ``writable=True``) creates one.
+    """
+
+    def __init__(self, path: str, writable: bool = False) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        if writable:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        else:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"No local Open Targets store at {path}")
+            uri = f"file:{quote(os.path.abspath(path))}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @classmethod
+    def build(cls, release_dir: str, path: str) -> "LocalOpenTargetsStore":
+        """Create a new store at ``path`` from an unpacked release directory."""
+        if os.path.exists(path):
+            os.remove(path)
+        store = cls(path, writable=True)
+        datasets = {
+            "targets": store.ingest_targets,
+            "diseases": store.ingest_diseases,
+            "molecule": store.ingest_molecules,
+            "indication": store.ingest_indications,
+        }
+        for name, ingest in datasets.items():
+            dataset = os.path.join(release_dir, name)
+            if os.path.exists(dataset):
+                ingest(iter_release_records(dataset))
+        for name in ASSOCIATION_DATASETS:
+            dataset = os.path.join(release_dir, name)
+            if os.path.exists(dataset):
+                store.ingest_associations(iter_release_records(dataset))
+                break
+        store.create_indexes()
+        return store
+
+    def create_indexes(self) -> None:
+        """Create the lookup indexes; call once after ingesting all datasets."""
+        with self._lock:
+            self._conn.executescript(_INDEXES)
+            self._conn.commit()
+
+    def _insert(self, sql: str, rows: Iterable[Tuple], chunk_size: int = 10000) -> int:
+        count = 0
+        iterator = iter(rows)
+        with self._lock:
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                self._conn.executemany(sql, chunk)
+                count += len(chunk)
+            self._conn.commit()
+        return count
+
+    def ingest_targets(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Load ``targets`` records (``id``, ``approvedSymbol``)."""
+        return self._insert(
+            "INSERT OR REPLACE INTO targets VALUES (?, ?)",
+            ((r["id"], r.get("approvedSymbol")) for r in records),
+        )
+
+    def ingest_diseases(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Load ``diseases`` records (``id``, ``name``)."""
+        return self._insert(
+            "INSERT OR REPLACE INTO diseases VALUES (?, ?)",
+            ((r["id"], r.get("name")) for r in records),
+        )
+
+    def ingest_molecules(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Load ``molecule`` records (``id``, ``name``)."""
+        return self._insert(
+            "INSERT OR REPLACE INTO drugs VALUES (?, ?)",
+            ((r["id"], r.get("name")) for r in records),
+        )
+
+    def ingest_associations(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Load overall association records (``diseaseId``, ``targetId``, ``score``)."""
+        return self._insert(
+            "INSERT INTO associations VALUES (?, ?, ?)",
+            ((r["diseaseId"], r["targetId"], r.get("score")) for r in records),
+        )
+
+    def ingest_indications(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Load ``indication`` records, one row per drug/disease pair."""
+
+        def rows() -> Iterator[Tuple]:
+            for record in records:
+                for ind in record.get("indications") or []:
+                    yield (
+                        record["id"],
+                        ind.get("disease"),
+                        ind.get("maxPhaseForIndication"),
+                        ind.get("status"),
+                    )
+
+        return self._insert("INSERT INTO indications VALUES (?, ?, ?, ?)", rows())
+
+    def _fetch(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def iter_targets_for_disease(
+        self, efo_id: str, min_score: Optional[float] = None, top_n: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """Yield ``associatedTargets`` rows for a disease, highest score first."""
+        sql = (
+            "SELECT a.target_id, t.approved_symbol, a.score FROM associations a"
+            " LEFT JOIN targets t ON t.id = a.target_id WHERE a.disease_id = ?"
+        )
+        params: Tuple = (efo_id,)
+        if min_score is not None:
+            sql += " AND a.score >= ?"
+            params += (min_score,)
+        sql += " ORDER BY a.score DESC"
+        if top_n is not None:
+            sql += " LIMIT ?"
+            params += (top_n,)
+        for target_id, symbol, score in self._fetch(sql, params):
+            yield {"target": {"id": target_id, "approvedSymbol": symbol}, "score": score}
+
+    def get_targets_for_disease(self, efo_id: str) -> Optional[Dict]:
+        """Return targets for a disease in the shape of the GraphQL response."""
+        found = self._fetch("SELECT id, name FROM diseases WHERE id = ?", (efo_id,))
+        rows = list(self.iter_targets_for_disease(efo_id))
+        if not found and not rows:
+            return {"data": {"disease": None}}
+        name = found[0][1] if found else None
+        return {
+            "data": {
+                "disease": {
+                    "id": efo_id,
+                    "name": name,
+                    "associatedTargets": {"rows": rows},
+                }
+            }
+        }
+
+    def get_diseases_for_drug(self, chembl_id: str) -> Optional[Dict]:
+        """Return indications for a drug in the shape of the GraphQL response."""
+        found = self._fetch("SELECT id, name FROM drugs WHERE id = ?", (chembl_id,))
+        indications = self._fetch(
+            "SELECT i.disease_id, d.name, i.phase, i.status FROM indications i"
+            " LEFT JOIN diseases d ON d.id = i.disease_id WHERE i.drug_id = ?"
+            " ORDER BY i.phase DESC",
+            (chembl_id,),
+        )
+        if not found and not indications:
+            return {"data": {"drug": None}}
+        rows = [
+            {"disease": {"id": disease_id, "name": name}, "phase": phase, "status": status}
+            for disease_id, name, phase, status in indications
+        ]
+        return {
+            "data": {
+                "drug": {
+                    "id": chembl_id,
+                    "name": found[0][1] if found else None,
+                    "indications": {"rows": rows},
+                }
+            }
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a local store from an Open Targets release directory."""
+    argp = argparse.ArgumentParser(description="Build an offline Open Targets store")
+    argp.add_argument("release_dir", help="Unpacked Open Targets Platform release")
+    argp.add_argument("store", help="Path of the SQLite store to create")
+    args = argp.parse_args(argv)
+    LocalOpenTargetsStore.build(args.release_dir, args.store).close()
+    print("Local Open Targets store written to", args.store)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,39 +3,72 @@
 This module provides:
 - `match_targets_to_drugs`: helper to pair targets with drug data.
 - `MatcherAgent`: rule-based matcher combining parsed queries with retrieved data.
+
+Expression data may also be passed as ``columnar.ExpressionColumns``, in which
+case tissue and threshold filters run as vectorised masks, and the whole
+retrieval may be wrapped in ``prepared.PreparedData`` to reuse indexes across
+many ``match`` calls.
 """
 
 from __future__ import annotations
-from typing import List, Dict, Any
 
+import heapq
+from collections import defaultdict
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from .columnar import ExpressionColumns
+from .prepared import PreparedData
 
-def match_targets_to_drugs(targets: List[Dict], drug_data: List[Dict]) -> List[Dict]:
+
+def match_targets_to_drugs(
+    targets: Iterable[Dict],
+    drug_data: Iterable[Dict],
+    top_k: Optional[int] = None,
+) -> List[Dict]:
     """Match targets with drugs based on overlapping target IDs.
 
+    Drugs are indexed by ``targetId`` once, so the join is linear in the
+    number of targets plus drugs. ``targets`` is consumed lazily and may be a
+    stream of rows; ``drug_data`` is read in full to build the index.
+
     Args:
-        targets: List of dictionaries with keys ``id``, ``approvedSymbol``, and optional ``score``.
-        drug_data: List of dictionaries with keys ``targetId``, ``drugName``, and optional ``status``.
+        targets: Iterable of dictionaries with keys ``id``, ``approvedSymbol``, and
+            optional ``score``.
+        drug_data: Iterable of dictionaries with keys ``targetId``, ``drugName``, and
+            optional ``status``.
+        top_k: If given, only the ``top_k`` highest scoring matches are kept, using
+            a bounded heap instead of a full sort.
 
     Returns:
-        List of matched target-drug dictionaries sorted by score descending.
+        List of matched target-drug dictionaries sorted by score descending;
+        matches with equal scores keep target order, then drug order.
     """
-    matches: List[Dict] = []
-    for target in targets:
-        for drug in drug_data:
-            if drug.get("targetId") == target.get("id"):
-                matches.append({
-                    "target": target.get("approvedSymbol"),
-                    "drug": drug.get("drugName"),
-                    "status": drug.get("status"),
-                    "score": target.get("score", 0)
-                })
-    return sorted(matches, key=lambda x: x["score"], reverse=True)
+    drugs_by_target: Dict[Any, List[Dict]] = defaultdict(list)
+    for drug in drug_data:
+        drugs_by_target[drug.get("targetId")].append(drug)
+
+    matches = (
+        {
+            "target": target.get("approvedSymbol"),
+            "drug": drug.get("drugName"),
+            "status": drug.get("status"),
+            "score": target.get("score", 0),
+        }
+        for target in targets
+        for drug in drugs_by_target.get(target.get("id"), ())
+    )
+    if top_k is not None:
+        return heapq.nlargest(top_k, matches, key=itemgetter("score"))
+    return sorted(matches, key=itemgetter("score"), reverse=True)
 
 
 class MatcherAgent:
     """Rule-based matcher for combining parsed queries with retrieved data."""
 
-    def match(self, parsed_query: Dict[str, Any], retrieved_data: Dict[str, Any]) -> Dict[str, Any]:
+    def match(
+        self, parsed_query: Dict[str, Any], retrieved_data: Mapping[str, Any]
+    ) -> Dict[str, Any]:
         """Return a filtered result set based on the query type.
 
         Parameters
@@ -43,7 +76,8 @@ class MatcherAgent:
         parsed_query:
             Structured query as produced by ``QueryParserAgent``.
         retrieved_data:
-            Dictionary of previously retrieved data relevant to the query.
+            Dictionary of previously retrieved data relevant to the query, or a
+            ``PreparedData`` wrapping one.
         """
 
         action = parsed_query.get("action")
@@ -51,6 +85,8 @@ class MatcherAgent:
         filters = parsed_query.get("filters", {})
 
         if action in {"list", "find"} and entity_type == "disease" and "phase" in filters:
+            if isinstance(retrieved_data, PreparedData):
+                return {"diseases_by_phase": retrieved_data.diseases_by_phase(filters["phase"])}
             phase = str(filters["phase"]).lower()
             diseases = []
             for d in retrieved_data.get("diseases", []):
@@ -60,8 +96,11 @@ class MatcherAgent:
             return {"diseases_by_phase": diseases}
 
         if action in {"list", "find"} and entity_type == "drug" and "phase" in filters:
-            phase = str(filters["phase"]).lower()
             drug_name = parsed_query.get("entity")
+            if isinstance(retrieved_data, PreparedData):
+                trials = retrieved_data.trials_by_drug_phase(drug_name, filters["phase"])
+                return {"trials_by_drug_phase": trials}
+            phase = str(filters["phase"]).lower()
             trials = []
             for t in retrieved_data.get("trials", []):
                 if t.get("drug") != drug_name:
@@ -72,12 +111,19 @@ class MatcherAgent:
             return {"trials_by_drug_phase": trials}
 
         if entity_type == "target" and filters.get("snp"):
+            if isinstance(retrieved_data, PreparedData):
+                return {"targets_with_snps": retrieved_data.targets_with_snps()}
             targets = [t for t in retrieved_data.get("targets", []) if t.get("snps")]
             return {"targets_with_snps": targets}
 
         if entity_type in {"target", "gene"} and retrieved_data.get("expression_data") is not None:
             tissue = filters.get("tissue")
             threshold = float(filters.get("expression_threshold", 0))
+            if isinstance(retrieved_data, PreparedData):
+                return {"expression_data": retrieved_data.expression_data(tissue, threshold)}
+            table = retrieved_data["expression_data"]
+            if isinstance(table, ExpressionColumns):
+                return {"expression_data": table.rows(table.select(threshold, tissue))}
             expr_matches = [
                 rec
                 for rec in retrieved_data.get("expression_data", [])
@@ -88,6 +134,23 @@ class MatcherAgent:
             return {"expression_data": expr_matches}
 
         if entity_type in {"target", "gene"} and retrieved_data.get("targets") is not None:
+            if isinstance(retrieved_data, PreparedData):
+                threshold = filters.get("expression_threshold")
+                return {"gene_expression": retrieved_data.target_expression(threshold)}
+            table = retrieved_data["targets"]
+            if isinstance(table, ExpressionColumns):
+                if table.id_key != "id":
+                    raise ValueError(
+                        "targets columns must be keyed by 'id'; build them with "
+                        "ExpressionColumns.from_records(targets, id_key='id')"
+                    )
+                threshold = filters.get("expression_threshold")
+                selected = table.select(None if threshold is None else float(threshold))
+                results = [
+                    {"target": table.ids[i], "expression": table.expression(i)}
+                    for i in selected.tolist()
+                ]
+                return {"gene_expression": results}
             if "expression_threshold" in filters:
                 threshold = float(filters["expression_threshold"])
                 results = [
@@ -12,8 +12,10 @@ Output: {"input": "Imatinib", "resolved_id": "CHEMBL1201581", "source": "PubChem
 
 """Utilities for resolving biomedical terms via external APIs."""
 
-from typing import Dict, Any, Callable
+import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
 
 try:
     import requests  # type: ignore
@@ -25,22 +27,255 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     pcp = None  # type: ignore
 
+from .cache import LRUCache, ResponseCache
+from .http_client import get_client
+from .retry import get_policy
+from .singleflight import SingleFlight
+from .synonym_index import SynonymIndex, normalize_key
+from .fuzzy import FuzzyIndex
+from .xref import XrefTable, chembl_number
 
-def _request_with_retry(func: Callable[[], Any]) -> Any:
-    """Call ``func`` with simple retry logic."""
+MYGENE_BATCH_URL = "https://mygene.info/v3/query"
+MYGENE_BATCH_SIZE = 1000
+
+TERM_TYPES = ("drug", "gene", "disease")
+
+# Sources that only answer exact names or synonyms.
+EXACT_SOURCES = {"PubChem"}
+
+# Lifetimes of resolved terms and of terms the resolver found nothing for, in
+# seconds.  Failed lookups (errors, exhausted retries, open circuits) are not
+# cached at all.
+POSITIVE_TTL = 7 * 24 * 3600
+NEGATIVE_TTL = 15 * 60
+
+NOT_FOUND = "Unable to resolve term"
+LOOKUP_FAILED = "Lookup failed"
+
+# Spelling correction is skipped for names shorter than this, and gene symbols
+# need at least ``GENE_MIN_CONFIDENCE``: short names and symbols such as
+# BRCA1/BRCA2 or TP53/TP63 are one edit away from another valid name.
+MIN_CORRECTION_LENGTH = 6
+GENE_MIN_CONFIDENCE = 0.9
+
+_inflight = SingleFlight()
+_memory_cache = LRUCache(max_entries=4096)
+_disk_cache: Optional[ResponseCache] = None
+_synonym_index: Optional[SynonymIndex] = None
+_fuzzy_index: Optional[FuzzyIndex] = None
+_fuzzy_settings = {"max_distance": 2, "min_confidence": 0.8}
+_xref_table: Optional[XrefTable] = None
+
+
+def use_synonym_index(path: Optional[str]) -> Optional[SynonymIndex]:
+    """Consult the local synonym index at ``path`` before any network lookup.
+
+    Pass ``None`` to stop using a local index.
+    """
+    global _synonym_index
+    if _synonym_index is not None:
+        _synonym_index.close()
+    _synonym_index = SynonymIndex(path) if path else None
+    return _synonym_index
+
+
+def use_xref_table(path: Optional[str]) -> Optional[XrefTable]:
+    """Annotate drug results with ChEMBL IDs or CIDs from the table at ``path``.
+
+    Pass ``None`` to stop using a cross-reference table.
+    """
+    global _xref_table
+    if _xref_table is not None:
+        _xref_table.close()
+    _xref_table = XrefTable(path) if path else None
+    return _xref_table
+
+
+def _add_xref(term_type: str, result: Dict) -> Dict:
+    """Add ``chembl_id`` to PubChem drug results and ``pubchem_cid`` to ChEMBL ones."""
+    resolved_id = result.get("resolved_id")
+    if _xref_table is None or term_type != "drug" or resolved_id is None:
+        return result
+    if chembl_number(resolved_id):
+        cid = _xref_table.cid_for_chembl(resolved_id)
+        if cid is not None:
+            result["pubchem_cid"] = cid
+    else:
+        chembl_id = _xref_table.chembl_for_cid(resolved_id)
+        if chembl_id is not None:
+            result["chembl_id"] = chembl_id
+    return result
+
+
+def configure_cache(
+    path: Optional[str] = None,
+    memory_entries: int = 4096,
+    disk_entries: int = 100000,
+) -> None:
+    """Reset the normalizer caches, optionally backed by a SQLite file at ``path``."""
+    global _memory_cache, _disk_cache
+    _memory_cache = LRUCache(max_entries=memory_entries)
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = (
+        ResponseCache(path, ttl=POSITIVE_TTL, max_entries=disk_entries) if path else None
+    )
+
+
+def use_fuzzy_index(
+    index: Optional[FuzzyIndex] = None,
+    max_distance: int = 2,
+    min_confidence: float = 0.8,
+    enabled: bool = True,
+) -> Optional[FuzzyIndex]:
+    """Correct misspelled terms that could not be resolved as typed.
+
+    Without ``index`` the fuzzy index is built over the names in the active
+    synonym index. A correction is applied only when the best candidate is
+    within ``max_distance`` edits and at least ``min_confidence`` confident
+    (``GENE_MIN_CONFIDENCE`` for genes), and never to names shorter than
+    ``MIN_CORRECTION_LENGTH``. Pass ``enabled=False`` to turn correction off.
+    """
+    global _fuzzy_index
+    if not enabled:
+        _fuzzy_index = None
+        return None
+    if index is None:
+        if _synonym_index is None:
+            raise ValueError("A FuzzyIndex or an active synonym index is required")
+        index = FuzzyIndex(_synonym_index.terms())
+    _fuzzy_index = index
+    _fuzzy_settings.update(max_distance=max_distance, min_confidence=min_confidence)
+    return _fuzzy_index
+
+
+def _correct_spelling(term_type: str, query: str) -> Optional[Dict[str, Any]]:
+    """Return the confident fuzzy correction of ``query``, if one exists."""
+    if _fuzzy_index is None or len(normalize_key(query)) < MIN_CORRECTION_LENGTH:
+        return None
+    min_confidence = _fuzzy_settings["min_confidence"]
+    if term_type == "gene":
+        min_confidence = max(min_confidence, GENE_MIN_CONFIDENCE)
+    matches = _fuzzy_index.search(
+        query, max_distance=_fuzzy_settings["max_distance"], limit=2, term_type=term_type
+    )
+    if not matches or matches[0].distance == 0:
+        return None
+    best = matches[0]
+    ambiguous = len(matches) > 1 and matches[1].distance == best.distance
+    if ambiguous or best.confidence < min_confidence:
+        return None
+    return {"matched": best.term, "confidence": best.confidence}
+
+
+def _apply_correction(term_type: str, query: str, result: Dict) -> Dict:
+    """Retry a term the resolver did not find under its spelling correction.
+
+    ``result`` is returned unchanged unless it is ``NOT_FOUND`` and the
+    corrected name resolves.
+    """
+    if result.get("resolved_id") is not None or result.get("error") != NOT_FOUND:
+        return result
+    correction = _correct_spelling(term_type, query)
+    if correction is None:
+        return result
+    corrected = normalize_term(term_type, correction["matched"])
+    if corrected.get("resolved_id") is None:
+        return result
+    return dict(corrected, **correction)
+
+
+if os.environ.get("GRID_NORMALIZER_CACHE"):
+    configure_cache(os.environ["GRID_NORMALIZER_CACHE"])
+
+if os.environ.get("GRID_SYNONYM_INDEX"):
+    use_synonym_index(os.environ["GRID_SYNONYM_INDEX"])
+
+if os.environ.get("GRID_XREF_TABLE"):
+    use_xref_table(os.environ["GRID_XREF_TABLE"])
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return statistics for the memory tier and, if enabled, the disk tier."""
+    stats = {"memory": _memory_cache.stats()}
+    if _disk_cache is not None:
+        stats["disk"] = _disk_cache.stats()
+    return stats
+
+
+def _cache_key(term_type: str, query: str) -> Tuple[str, str]:
+    return term_type, normalize_key(query)
+
+
+def _cached_lookup(key: Tuple[str, str]) -> Optional[Dict]:
+    """Return a cached result from the memory tier, then the disk tier."""
+    result = _memory_cache.get(key)
+    if result is None and _disk_cache is not None:
+        result = _disk_cache.get("\x1f".join(key))
+        if result is not None:
+            _memory_cache.set(key, result, _ttl_for(result))
+    return result
+
+
+def _ttl_for(result: Dict) -> float:
+    return POSITIVE_TTL if result.get("resolved_id") is not None else NEGATIVE_TTL
+
+
+def _store(key: Tuple[str, str], result: Dict) -> Dict:
+    if result.get("resolved_id") is None and result.get("error") != NOT_FOUND:
+        return result
+    ttl = _ttl_for(result)
+    _memory_cache.set(key, result, ttl)
+    if _disk_cache is not None:
+        _disk_cache.set("\x1f".join(key), result, ttl)
+    return result
+
+
+def _resolve_and_store(key: Tuple[str, str], term_type: str, query: str) -> Dict:
+    return _store(key, _resolve_term(term_type, query))
+
+
+def _request_with_retry(func: Callable[[], Any], host: str = "") -> Any:
+    """Call ``func`` under the shared retry policy."""
     if not requests:
         return None
-    for attempt in range(3):
-        try:
-            return func()
-        except requests.exceptions.RequestException:  # type: ignore[attr-defined]
-            if attempt == 2:
-                return None
-            time.sleep(2)
+    return get_policy().call(
+        func, host, retry_on=(requests.exceptions.RequestException,)  # type: ignore[attr-defined]
+    )
 
 
 def normalize_term(term_type: str, query: str) -> Dict:
-    """Return standardized identifiers for drugs, genes or diseases."""
+    """Return standardized identifiers for drugs, genes or diseases.
+
+    Results are cached per ``(term_type, casefolded query)`` in memory and,
+    when configured, on disk; terms the resolver found nothing for are cached
+    for ``NEGATIVE_TTL`` only, and failed lookups are not cached.
+    Concurrent calls for the same term share a single lookup, and each caller
+    receives its own copy of the result. A local synonym index, when enabled,
+    is consulted before either. With a fuzzy index, a term that none of these
+    found is retried under its spelling correction, and the result records
+    the ``matched`` name and its ``confidence``. With a cross-reference
+    table, drug results also carry ``chembl_id`` (for PubChem CIDs) or
+    ``pubchem_cid`` (for ChEMBL IDs).
+    """
+    if _synonym_index is not None:
+        local = _synonym_index.lookup(term_type, query)
+        if local is not None:
+            return _add_xref(term_type, local)
+    key = _cache_key(term_type, query)
+    result = _cached_lookup(key)
+    if result is None:
+        result = _inflight.do(key, lambda: _resolve_and_store(key, term_type, query))
+    result = _apply_correction(term_type, query, result)
+    return _add_xref(term_type, dict(result, input=query))
+
+
+def _resolve_term(term_type: str, query: str) -> Dict:
+    """Look ``query`` up with the resolver for ``term_type``.
+
+    The result's ``error`` is ``NOT_FOUND`` when the resolver answered without
+    a match and ``LOOKUP_FAILED`` when the lookup itself failed.
+    """
 
     if term_type == "drug" and pcp:
         results = pcp.get_compounds(query, "name")
@@ -51,10 +286,12 @@ def normalize_term(term_type: str, query: str) -> Dict:
                 "source": "PubChem",
             }
     elif term_type == "gene" and requests:
-        r = _request_with_retry(lambda: requests.get(
+        r = _request_with_retry(lambda: get_client().get(
             f"https://mygene.info/v3/query?q={query}&species=human"
-        ))
-        if r is not None and r.status_code == 200 and r.json().get("hits"):
+        ), "mygene.info")
+        if r is None or r.status_code != 200:
+            return {"input": query, "resolved_id": None, "error": LOOKUP_FAILED}
+        if r.json().get("hits"):
             hit = r.json()["hits"][0]
             return {
                 "input": query,
@@ -64,12 +301,10 @@ def normalize_term(term_type: str, query: str) -> Dict:
             }
     elif term_type == "disease" and requests:
         ols_url = f"https://www.ebi.ac.uk/ols/api/search?q={query}&ontology=efo"
-        r = _request_with_retry(lambda: requests.get(ols_url))
-        if (
-            r is not None
-            and r.status_code == 200
-            and r.json().get("response", {}).get("numFound", 0) > 0
-        ):
+        r = _request_with_retry(lambda: get_client().get(ols_url), "www.ebi.ac.uk")
+        if r is None or r.status_code != 200:
+            return {"input": query, "resolved_id": None, "error": LOOKUP_FAILED}
+        if r.json().get("response", {}).get("numFound", 0) > 0:
             doc = r.json()["response"]["docs"][0]
             return {
                 "input": query,
@@ -78,5 +313,165 @@ def normalize_term(term_type: str, query: str) -> Dict:
                 "source": "OLS/EFO",
             }
 
-    return {"input": query, "resolved_id": None, "error": "Unable to resolve term"}
+    return {"input": query, "resolved_id": None, "error": NOT_FOUND}
+
+
+def _resolve_genes_batch(genes: List[Tuple[Tuple[str, str], str]]) -> Dict[Tuple[str, str], Dict]:
+    """Resolve genes with mygene.info batch queries and cache the results.
+
+    Terms whose batch request failed are left out of the returned mapping.
+    """
+    resolved: Dict[Tuple[str, str], Dict] = {}
+    for start in range(0, len(genes), MYGENE_BATCH_SIZE):
+        chunk = genes[start:start + MYGENE_BATCH_SIZE]
+        terms = {query.strip(): key for key, query in chunk}
+        payload = {
+            "q": ",".join(terms),
+            "scopes": "symbol,alias",
+            "fields": "symbol",
+            "species": "human",
+        }
+        r = _request_with_retry(
+            lambda: get_client().post(MYGENE_BATCH_URL, data=payload), "mygene.info"
+        )
+        if r is None or r.status_code != 200:
+            continue
+        hits: Dict[str, Dict] = {}
+        for hit in r.json():
+            if not hit.get("notfound"):
+                hits.setdefault(hit.get("query"), hit)
+        for term, key in terms.items():
+            hit = hits.get(term)
+            if hit is None:
+                result = {"input": term, "resolved_id": None, "error": NOT_FOUND}
+            else:
+                result = {
+                    "input": term,
+                    "resolved_id": hit.get("symbol"),
+                    "entrez_id": hit.get("_id"),
+                    "source": "mygene.info",
+                }
+            resolved[key] = _store(key, result)
+    return resolved
+
+
+def normalize_terms(items: Iterable[Tuple[str, str]], max_workers: int = 8) -> List[Dict]:
+    """Resolve many ``(term_type, query)`` pairs at once, returning results in input order.
+
+    Cached terms are answered directly and duplicates are resolved once.
+    Terms that were not found are spelling-corrected as in ``normalize_term``. Genes
+    go through mygene.info batch queries; drugs, diseases and genes the batch
+    could not answer are resolved in parallel on ``max_workers`` threads.
+    """
+    items = list(items)
+    results: Dict[Tuple[str, str], Dict] = {}
+    pending: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    looked_up: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for term_type, query in items:
+        key = _cache_key(term_type, query)
+        if key in results or key in pending:
+            continue
+        local = _synonym_index.lookup(term_type, query) if _synonym_index else None
+        if local is not None:
+            results[key] = local
+            continue
+        looked_up[key] = (term_type, query)
+        cached = _cached_lookup(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending[key] = (term_type, query)
+
+    genes = [
+        (key, query) for key, (term_type, query) in pending.items()
+        if term_type == "gene" and "," not in query
+    ]
+    if genes and requests:
+        results.update(_resolve_genes_batch(genes))
+
+    remaining = [(key, t, q) for key, (t, q) in pending.items() if key not in results]
+    if remaining:
+
+        def _resolve(entry: Tuple[Tuple[str, str], str, str]) -> Dict:
+            key, term_type, query = entry
+            return _inflight.do(key, lambda: _resolve_and_store(key, term_type, query))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for entry, result in zip(remaining, pool.map(_resolve, remaining)):
+                results[entry[0]] = result
+
+    if _fuzzy_index is not None:
+        for key, (term_type, query) in looked_up.items():
+            results[key] = _apply_correction(term_type, query, results[key])
+
+    return [_add_xref(t, dict(results[_cache_key(t, q)], input=q)) for t, q in items]
+
+
+def _match_score(query: str, result: Dict) -> float:
+    """Score a resolution: 1.0 for an exact name match, 0.5 for a search hit.
+
+    Fuzzy corrections are scaled by their ``confidence``.
+    """
+    if result.get("resolved_id") is None:
+        return 0.0
+    key = normalize_key(query)
+    names = {normalize_key(str(result.get(f) or "")) for f in ("resolved_id", "label", "matched")}
+    source = result.get("source") or ""
+    exact = key in names or source in EXACT_SOURCES or source.endswith("(local index)")
+    return (1.0 if exact else 0.5) * result.get("confidence", 1.0)
+
+
+def normalize_any(
+    query: str,
+    term_types: Iterable[str] = TERM_TYPES,
+    timeout: float = 10.0,
+) -> Dict:
+    """Resolve ``query`` with several resolvers concurrently and return the best hit.
+
+    Every type in ``term_types`` is tried in parallel through ``normalize_term``
+    and the highest scoring resolution wins; ties go to the type listed first,
+    so pass the parser's guess first. The search stops as soon as an exact
+    match is known to win or after ``timeout`` seconds, and lookups still
+    queued are cancelled (running ones finish in the background and only
+    warm the cache). The result carries the winning ``type``.
+    """
+    term_types = list(dict.fromkeys(term_types))
+    if not term_types:
+        raise ValueError("term_types must not be empty")
+    pool = ThreadPoolExecutor(max_workers=len(term_types))
+    futures = {pool.submit(normalize_term, t, query): t for t in term_types}
+    done: Dict[str, Dict] = {}
+    pending = set(futures)
+    try:
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            finished, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in finished:
+                try:
+                    done[futures[future]] = future.result()
+                except Exception as exc:
+                    print(f"Resolver for {futures[future]} failed:", exc)
+                    done[futures[future]] = {"input": query, "resolved_id": None, "error": str(exc)}
+            # Stop once an exact hit has no unfinished rival listed before it.
+            for term_type in term_types:
+                if term_type not in done:
+                    break
+                if _match_score(query, done[term_type]) >= 1.0:
+                    pending = set()
+                    break
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
+    best: Optional[Dict] = None
+    best_score = 0.0
+    for term_type in term_types:
+        result = done.get(term_type)
+        score = _match_score(query, result) if result is not None else 0.0
+        if score > best_score:
+            best, best_score = dict(result, type=term_type), score
+    if best is None:
+        return {"input": query, "resolved_id": None, "error": NOT_FOUND}
+    return best
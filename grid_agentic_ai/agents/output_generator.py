@@ -1,16 +1,41 @@
-"""Utilities for exporting GRID agent results."""
+"""Utilities for exporting GRID agent results.
+
+``to_csv`` and ``to_ndjson`` stream their input: ``results`` may be any
+iterable of row mappings (a generator over a multi-million-row association
+table, say) and rows are written one at a time, so memory use does not grow
+with the number of rows.  The CSV header comes from ``fields`` when given,
+otherwise from the first row.
+
+``to_parquet`` and ``to_arrow`` (requires ``pyarrow``) write the same rows in
+``batch_size`` chunks to columnar files.  Column types are inferred from the
+first chunk unless a ``schema`` is given, and repeated strings such as phase,
+status and symbol columns are dictionary encoded.
+"""
 
 from __future__ import annotations
 
 import csv
+import itertools
 import json
-from typing import Any, Dict, List
+import warnings
+from collections.abc import Iterable, Mapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from .records import _Record
 
 try:
     import pandas as pd  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     pd = None  # type: ignore
 
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.ipc  # type: ignore  # noqa: F401
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
 try:
     import matplotlib.pyplot as plt  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
@@ -22,44 +47,302 @@ except Exception:  # pragma: no cover - optional dependency
     nx = None  # type: ignore
 
 
-class OutputGeneratorAgent:
-    """Helper class for exporting results in various formats."""
+def _json_default(value: Any) -> Any:
+    # Record types from ``records`` are mappings but not dicts.
+    if isinstance(value, Mapping):
+        to_dict = getattr(value, "to_dict", None)
+        return to_dict() if to_dict is not None else dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
-    def to_csv(self, results: Any, filepath: str) -> None:
-        """Write ``results`` to ``filepath`` as CSV."""
-        if not results:
-            # create empty file
-            open(filepath, "w").close()
+
+def write_csv(rows: Iterable[Mapping], fh: TextIO, fields: Optional[Sequence[str]] = None) -> int:
+    """Write ``rows`` to the open file ``fh`` as CSV and return the row count.
+
+    Columns are ``fields`` or, without it, the fields of the first row: all
+    fields of a record type from ``records`` (including those that are
+    ``None``) or the keys of a plain mapping.  Keys missing from a row are
+    written empty.  Keys not in an inferred header cannot be added once rows
+    have been written, so they are dropped with a warning; pass ``fields`` to
+    include them (keys not in ``fields`` are dropped silently).  Nothing is
+    written for an empty ``rows`` without ``fields``.
+    """
+    rows = iter(rows)
+    infer = fields is None
+    if infer:
+        first = next(rows, None)
+        if first is None:
+            return 0
+        fields = list(first.__slots__ if isinstance(first, _Record) else first.keys())
+        rows = itertools.chain((first,), rows)
+    writer = csv.DictWriter(fh, fieldnames=fields, restval="", extrasaction="ignore")
+    writer.writeheader()
+    header = set(fields) if infer else None
+    count = 0
+    writerow = writer.writerow
+    for row in rows:
+        if header is not None and not header.issuperset(row.keys()):
+            dropped = sorted(map(str, row.keys() - header))
+            warnings.warn(
+                f"CSV row {count} has fields not in the header, which are dropped: "
+                f"{', '.join(dropped)}; pass fields to include them",
+                stacklevel=2,
+            )
+            header = None
+        writerow(row)
+        count += 1
+    return count
+
+
+def write_ndjson(rows: Iterable[Any], fh: TextIO) -> int:
+    """Write each of ``rows`` to the open file ``fh`` as one JSON line; return the count."""
+    encode = json.JSONEncoder(separators=(",", ":"), default=_json_default).encode
+    write = fh.write
+    count = 0
+    for row in rows:
+        write(encode(row))
+        write("\n")
+        count += 1
+    return count
+
+
+# String columns that are always dictionary encoded when the caller does not
+# choose.  Other string columns are encoded when at most half of the values in
+# the first batch are distinct.
+DICTIONARY_FIELDS = frozenset(
+    {"phase", "status", "approvedSymbol", "symbol", "target", "tissue"}
+)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Mapping]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
             return
+        yield chunk
+
+
+def _strings(values: List[Any]) -> Any:
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _arrow_array(values: List[Any], type: Any = None, name: Optional[str] = None) -> Any:
+    """Convert ``values`` to an Arrow array of ``type``.
+
+    Without ``type`` (schema inference) values of mixed types become strings.
+    With ``type`` (later batches) values are converted to strings for string
+    columns and cast safely otherwise; a ``ValueError`` is raised instead of
+    truncating or changing a value, e.g. a float in an integer column.
+    """
+    if type is not None and pa.types.is_string(type):
+        try:
+            return pa.array(values, type=type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return _strings(values)
+    try:
+        array = pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        array = None
+    if array is None or (type is not None and pa.types.is_string(array.type)):
+        if type is not None:
+            raise ValueError(
+                f"Column {name!r} has values that do not fit the {type} type "
+                f"inferred from the first batch; pass a schema"
+            )
+        return _strings(values)
+    if type is None or array.type == type:
+        return array
+    try:
+        return array.cast(type, safe=True)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        raise ValueError(
+            f"Column {name!r} has {array.type} values that cannot be stored without loss "
+            f"in the {type} type inferred from the first batch; pass a schema"
+        ) from None
 
-        if pd is not None:
-            try:
-                df = pd.DataFrame(results)
-                df.to_csv(filepath, index=False)
-                return
-            except Exception:
-                pass  # fallback to csv module
 
-        # Fallback: basic CSV writing
+def infer_arrow_schema(
+    rows: Sequence[Mapping], dictionary: Optional[Iterable[str]] = None
+) -> Any:
+    """Infer an Arrow schema from a sample of row mappings.
+
+    Columns are the union of the rows' keys in first-seen order.  Columns with
+    values of mixed types become strings and all-``None`` columns become
+    strings.  String columns named in ``dictionary`` (by default
+    ``DICTIONARY_FIELDS`` plus low-cardinality columns) are dictionary encoded.
+    """
+    names: Dict[str, None] = {}
+    for row in rows:
+        names.update(dict.fromkeys(row.keys()))
+    encode = set(dictionary) if dictionary is not None else None
+    fields = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        array = _arrow_array(values)
+        column_type = pa.string() if pa.types.is_null(array.type) else array.type
+        if pa.types.is_string(column_type):
+            if encode is None:
+                repeated = len(array.unique()) <= len(array) // 2
+                use_dictionary = name in DICTIONARY_FIELDS or repeated
+            else:
+                use_dictionary = name in encode
+            if use_dictionary:
+                column_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(name, column_type))
+    return pa.schema(fields)
+
+
+class _BatchEncoder:
+    """Converts chunks of row mappings into record batches of one schema.
+
+    With ``shared_dictionaries`` each dictionary-encoded string column keeps
+    one growing dictionary, so every batch's dictionary extends the previous
+    one, as the Arrow IPC file format requires (it accepts dictionary deltas
+    but not replacements).  Otherwise each batch gets its own dictionary,
+    which suits Parquet, where dictionaries are per row group anyway.
+    """
+
+    def __init__(self, schema: Any, shared_dictionaries: bool = False) -> None:
+        self.schema = schema
+        self.shared_dictionaries = shared_dictionaries
+        self.dictionaries: Dict[str, Dict[str, int]] = {
+            field.name: {}
+            for field in schema
+            if pa.types.is_dictionary(field.type) and pa.types.is_string(field.type.value_type)
+        }
+
+    def _encode_dictionary(self, values: List[Any], codes: Dict[str, int]) -> Any:
+        batch = _arrow_array(values, pa.string()).dictionary_encode()
+        if not self.shared_dictionaries:
+            return batch
+        if not codes:
+            # An empty dictionary followed by a non-empty one is written as a
+            # replacement, so start every shared dictionary with one entry.
+            codes[""] = 0
+        # Map this batch's dictionary onto the shared one and remap the indices.
+        mapping = [codes.setdefault(value, len(codes)) for value in batch.dictionary.to_pylist()]
+        indices = pa.array(mapping, type=pa.int32()).take(batch.indices)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(list(codes), type=pa.string()))
+
+    def encode(self, rows: List[Mapping]) -> Any:
+        columns = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            codes = self.dictionaries.get(field.name)
+            if codes is not None:
+                columns.append(self._encode_dictionary(values, codes))
+            else:
+                columns.append(_arrow_array(values, field.type, field.name))
+        return pa.record_batch(columns, schema=self.schema)
+
+
+class OutputGeneratorAgent:
+    """Helper class for exporting results in various formats."""
+
+    def to_csv(self, results: Any, filepath: str, fields: Optional[Sequence[str]] = None) -> int:
+        """Write ``results`` to ``filepath`` as CSV and return the number of rows.
+
+        ``results`` is an iterable of row mappings, which is streamed to the
+        file, or a single mapping, which is written as ``key,value`` rows.
+        """
         with open(filepath, "w", newline="") as f:
-            writer = csv.writer(f)
-            if isinstance(results, list):
+            if isinstance(results, Mapping):
+                return write_csv(({"key": k, "value": v} for k, v in results.items()), f)
+            if isinstance(results, (str, bytes)) or not isinstance(results, Iterable):
                 if results:
-                    header = list(results[0].keys())
-                    writer.writerow(header)
-                    for row in results:
-                        writer.writerow([row.get(h, "") for h in header])
-            elif isinstance(results, dict):
-                writer.writerow(["key", "value"])
-                for k, v in results.items():
-                    writer.writerow([k, v])
-            else:
-                writer.writerow([str(results)])
+                    csv.writer(f).writerow([str(results)])
+                return 0
+            return write_csv(results, f, fields)
+
+    def to_ndjson(self, results: Any, filepath: str) -> int:
+        """Write ``results`` to ``filepath`` as newline-delimited JSON.
+
+        Each row of an iterable is streamed as one line; a single mapping is
+        written as one line.  Returns the number of lines written.
+        """
+        if results is None or isinstance(results, Mapping):
+            results = [results] if results else []
+        with open(filepath, "w") as f:
+            return write_ndjson(results, f)
 
     def to_json(self, results: Any, filepath: str) -> None:
         """Write ``results`` to ``filepath`` as JSON."""
         with open(filepath, "w") as f:
-            json.dump(results if results is not None else {}, f, indent=2)
+            json.dump(results if results is not None else {}, f, indent=2, default=_json_default)
+
+    def to_parquet(
+        self,
+        results: Any,
+        filepath: str,
+        compression: Optional[str] = "zstd",
+        schema: Any = None,
+        batch_size: int = 65536,
+        dictionary: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Write ``results`` to ``filepath`` as Parquet and return the number of rows.
+
+        ``compression`` is any Parquet codec (``"zstd"``, ``"snappy"``,
+        ``"gzip"``, ``"brotli"``, ``"lz4"`` or ``None``).  ``results`` is an
+        iterable of row mappings, streamed in ``batch_size`` row groups, or a
+        single mapping written as one row.  Nothing is written for empty
+        ``results`` without a ``schema``.
+        """
+        if pq is None:
+            raise RuntimeError("pyarrow is required for Parquet export")
+        return self._write_columnar(
+            results, schema, batch_size, dictionary, False,
+            lambda s: pq.ParquetWriter(filepath, s, compression=compression or "none"),
+        )
+
+    def to_arrow(
+        self,
+        results: Any,
+        filepath: str,
+        compression: Optional[str] = "lz4",
+        schema: Any = None,
+        batch_size: int = 65536,
+        dictionary: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Write ``results`` to ``filepath`` as an Arrow IPC (Feather v2) file.
+
+        ``compression`` is ``"lz4"``, ``"zstd"`` or ``None``; other arguments
+        are as for ``to_parquet``.  Returns the number of rows written.
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Arrow export")
+        options = pa.ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+        return self._write_columnar(
+            results, schema, batch_size, dictionary, True,
+            lambda s: pa.ipc.new_file(filepath, s, options=options),
+        )
+
+    def _write_columnar(
+        self,
+        results: Any,
+        schema: Any,
+        batch_size: int,
+        dictionary: Optional[Iterable[str]],
+        shared_dictionaries: bool,
+        open_writer: Callable[[Any], Any],
+    ) -> int:
+        if results is None or isinstance(results, Mapping):
+            results = [results] if results else []
+        chunks = _chunks(results, batch_size)
+        first = next(chunks, None)
+        if first is None:
+            if schema is None:
+                return 0
+        else:
+            chunks = itertools.chain((first,), chunks)
+            if schema is None:
+                schema = infer_arrow_schema(first, dictionary)
+        encoder = _BatchEncoder(schema, shared_dictionaries)
+        count = 0
+        with open_writer(schema) as writer:
+            for chunk in chunks:
+                writer.write_batch(encoder.encode(chunk))
+                count += len(chunk)
+        return count
 
     def to_table(self, results: Any) -> str:
         """Return ``results`` as a formatted table string."""
@@ -0,0 +1,163 @@
+"""Indexed view of retrieved data for repeated matching.
+
+``PreparedData`` wraps a ``retrieved_data`` dictionary and builds indexes the
+first time each kind of filter is used, so that matching many parsed queries
+against the same retrieval does not rescan every record:
+
+- diseases and trials grouped by their lowercased status/phase string, so a
+  phase filter only checks each distinct status once;
+- trials grouped by drug name;
+- targets that carry SNPs;
+- expression values sorted per tissue (and overall) for threshold lookups.
+
+Pass it to ``MatcherAgent.match`` in place of the dictionary; results are the
+same record objects, in the same order, as the unindexed path::
+
+    >>> prepared = PreparedData(retrieved)
+    >>> matcher.match(parsed_a, prepared)
+    >>> matcher.match(parsed_b, prepared)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Tuple
+
+# Key of the expression index covering all tissues.
+_ALL_TISSUES = object()
+
+# (sorted expression values, record index for each value)
+_SortedIndex = Tuple[List[float], List[int]]
+
+
+def _status(record: Dict) -> str:
+    return str(record.get("status", record.get("phase", ""))).lower()
+
+
+def _group_by_status(records: Iterable[Dict]) -> Dict[str, List[int]]:
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for i, record in enumerate(records):
+        groups[_status(record)].append(i)
+    return dict(groups)
+
+
+def _sorted_index(pairs: Iterable[Tuple[float, int]]) -> _SortedIndex:
+    ordered = sorted(pairs)
+    return [value for value, _ in ordered], [i for _, i in ordered]
+
+
+def _at_least(index: _SortedIndex, threshold: float) -> List[int]:
+    """Return record indices with values ``>= threshold`` in record order."""
+    values, positions = index
+    if math.isnan(threshold):
+        return []
+    return sorted(positions[bisect_left(values, threshold):])
+
+
+class PreparedData(Mapping):
+    """Read-only ``retrieved_data`` mapping with lazily built match indexes."""
+
+    def __init__(self, retrieved_data: Mapping[str, Any]) -> None:
+        self._data = {key: value for key, value in retrieved_data.items()}
+        self._lists: Dict[str, List[Dict]] = {}
+        self._indexes: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def records(self, key: str) -> List[Dict]:
+        """Return the records under ``key`` as a list (empty when missing)."""
+        if key not in self._lists:
+            self._lists[key] = list(self._data.get(key) or [])
+        return self._lists[key]
+
+    def _index(self, name: str, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if name not in self._indexes:
+                self._indexes[name] = build()
+            return self._indexes[name]
+
+    def _by_phase(self, groups: Dict[str, List[int]], phase: Any) -> List[int]:
+        phase = str(phase).lower()
+        return list(heapq.merge(*(ids for status, ids in groups.items() if phase in status)))
+
+    def diseases_by_phase(self, phase: Any) -> List[Dict]:
+        """Diseases whose status (or phase) contains ``phase``, case-insensitively."""
+        diseases = self.records("diseases")
+        groups = self._index("disease_status", lambda: _group_by_status(diseases))
+        return [diseases[i] for i in self._by_phase(groups, phase)]
+
+    def trials_by_drug_phase(self, drug: Hashable, phase: Any) -> List[Dict]:
+        """Trials of ``drug`` whose status (or phase) contains ``phase``."""
+        trials = self.records("trials")
+
+        def build() -> Dict[Hashable, Dict[str, List[int]]]:
+            by_drug: Dict[Hashable, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+            for i, trial in enumerate(trials):
+                by_drug[trial.get("drug")][_status(trial)].append(i)
+            return {name: dict(groups) for name, groups in by_drug.items()}
+
+        groups = self._index("trial_drug_status", build).get(drug, {})
+        return [trials[i] for i in self._by_phase(groups, phase)]
+
+    def targets_with_snps(self) -> List[Dict]:
+        """Targets with a non-empty ``snps`` field."""
+        targets = self.records("targets")
+        return list(self._index("target_snps", lambda: [t for t in targets if t.get("snps")]))
+
+    def expression_data(self, tissue: Any, threshold: float) -> List[Dict]:
+        """Expression records in ``tissue`` (any if ``None``) with values ``>= threshold``."""
+        records = self.records("expression_data")
+
+        def build() -> Dict[Any, _SortedIndex]:
+            pairs: Dict[Any, List[Tuple[float, int]]] = defaultdict(list)
+            for i, record in enumerate(records):
+                if record.get("expression") is None:
+                    continue
+                value = float(record.get("expression"))
+                if not math.isnan(value):
+                    pairs[_ALL_TISSUES].append((value, i))
+                    pairs[record.get("tissue")].append((value, i))
+            return {key: _sorted_index(items) for key, items in pairs.items()}
+
+        index = self._index("expression_by_tissue", build)
+        key = _ALL_TISSUES if tissue is None else tissue
+        return [records[i] for i in _at_least(index.get(key, ([], [])), threshold)]
+
+    def target_expression(self, threshold: Any = None) -> List[Dict]:
+        """``{"target", "expression"}`` rows for targets with an expression value.
+
+        With ``threshold`` only values ``>= threshold`` are kept.
+        """
+        targets = self.records("targets")
+        if threshold is None:
+            selected: Iterable[int] = self._index(
+                "target_expression",
+                lambda: [i for i, t in enumerate(targets) if t.get("expression") is not None],
+            )
+        else:
+            index = self._index(
+                "target_expression_sorted",
+                lambda: _sorted_index(
+                    (float(t.get("expression")), i)
+                    for i, t in enumerate(targets)
+                    if t.get("expression") is not None
+                    and not math.isnan(float(t.get("expression")))
+                ),
+            )
+            selected = _at_least(index, float(threshold))
+        return [
+            {"target": targets[i].get("id"), "expression": targets[i].get("expression")}
+            for i in selected
+        ]
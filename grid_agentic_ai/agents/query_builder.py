@@ -0,0 +1,133 @@
+"""Minimal GraphQL documents for parsed GRID queries.
+
+``build_query`` turns a query parsed by ``QueryParserAgent`` into an Open
+Targets GraphQL document that selects only the fields the matcher,
+summarizer and exporters need for that intent, together with its variables.
+Compiled documents are cached, so repeated intents reuse the same text (and
+therefore the same response-cache keys).
+
+Example::
+
+    >>> doc, variables = build_query(
+    ...     {"entity_type": "drug", "filters": {"phase": "2"}}, "CHEMBL941"
+    ... )
+    >>> variables
+    {'id': 'CHEMBL941'}
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# entity type -> (root field, ID argument, row collection, collection wraps ``rows``)
+ROOTS: Dict[str, Tuple[str, str, str, bool]] = {
+    "drug": ("drug", "chemblId", "indications", True),
+    "disease": ("disease", "efoId", "associatedTargets", True),
+    "target": ("target", "ensemblId", "expressions", False),
+}
+
+# Collections that accept ``page`` and ``orderByScore`` arguments.
+PAGEABLE = {"associatedTargets"}
+
+ENTITY_ROOTS = {"drug": "drug", "disease": "disease", "target": "target", "gene": "target"}
+
+
+def select_fields(
+    entity_type: Optional[str], filters: Dict[str, Any]
+) -> Tuple[str, Tuple[str, ...]]:
+    """Return the root and the dotted row fields needed for an intent."""
+    root = ENTITY_ROOTS.get(entity_type or "")
+    if root is None:
+        raise ValueError(f"No Open Targets query for entity type {entity_type!r}")
+    if root == "drug":
+        fields = ["disease.id", "disease.name"]
+        if "phase" in filters:
+            fields += ["phase", "status"]
+    elif root == "disease":
+        fields = ["target.id", "target.approvedSymbol", "score"]
+    else:
+        fields = ["rna.value"]
+        if "tissue" in filters or "expression_threshold" in filters:
+            fields.insert(0, "tissue.label")
+    return root, tuple(fields)
+
+
+def _render(paths: Iterable[str], indent: str) -> str:
+    """Render dotted field paths as a nested GraphQL selection."""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+
+    def emit(node: Dict[str, Any], pad: str) -> str:
+        lines = []
+        for name, children in node.items():
+            if children:
+                lines.append(f"{pad}{name} {{\n{emit(children, pad + '  ')}{pad}}}\n")
+            else:
+                lines.append(f"{pad}{name}\n")
+        return "".join(lines)
+
+    return emit(tree, indent)
+
+
+@lru_cache(maxsize=128)
+def compile_query(
+    root: str, fields: Tuple[str, ...], paged: bool = False, ordered: bool = False
+) -> str:
+    """Return the GraphQL document selecting ``fields`` on the rows of ``root``."""
+    root_field, argument, collection, wraps_rows = ROOTS[root]
+    definitions = ["$id: String!"]
+    arguments = []
+    if collection in PAGEABLE:
+        if paged:
+            definitions += ["$index: Int!", "$size: Int!"]
+            arguments.append("page: {index: $index, size: $size}")
+        if ordered:
+            definitions.append("$orderByScore: String")
+            arguments.append("orderByScore: $orderByScore")
+    args = f"({', '.join(arguments)})" if arguments else ""
+    name = f"{root_field.capitalize()}{collection[0].upper()}{collection[1:]}"
+
+    rows = _render(fields, " " * 8 if wraps_rows else " " * 6)
+    if wraps_rows:
+        count = "      count\n" if paged else ""
+        body = f"{count}      rows {{\n{rows}      }}\n"
+    else:
+        body = rows
+    return (
+        f"query {name}({', '.join(definitions)}) {{\n"
+        f"  {root_field}({argument}: $id) {{\n"
+        "    id\n"
+        f"    {collection}{args} {{\n"
+        f"{body}"
+        "    }\n"
+        "  }\n"
+        "}\n"
+    )
+
+
+def build_query(
+    parsed: Dict[str, Any],
+    entity_id: str,
+    page_size: Optional[int] = None,
+    page_index: int = 0,
+    order_by_score: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Return ``(document, variables)`` for a parsed query and resolved entity ID.
+
+    ``page_size``/``page_index`` and ``order_by_score`` are only applied to
+    collections that support them (currently ``associatedTargets``).
+    """
+    root, fields = select_fields(parsed.get("entity_type"), parsed.get("filters") or {})
+    pageable = ROOTS[root][2] in PAGEABLE
+    paged = pageable and page_size is not None
+    ordered = pageable and order_by_score is not None
+    variables: Dict[str, Any] = {"id": entity_id}
+    if paged:
+        variables.update(index=page_index, size=page_size)
+    if ordered:
+        variables["orderByScore"] = order_by_score
+    return compile_query(root, fields, paged, ordered), variables
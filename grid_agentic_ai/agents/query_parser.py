@@ -17,55 +17,167 @@ Example supported queries::
 from __future__ import annotations
 
 import re
-from typing import Dict, Any
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from .cache import LRUCache
+
+# (pattern, entity type, literals every match contains) in priority order: the
+# first pattern found anywhere in the query wins.
+ENTITY_PATTERNS: List[Tuple[str, str, Tuple[str, ...]]] = [
+    (r"in\s+phase[-\s]*\d+\s+for\s+([A-Za-z0-9\-]+)", "drug", ("phase", "for")),
+    (r"targeting\s+([A-Za-z0-9\-]+)", "target", ("targeting",)),
+    (r"gene\s+([A-Za-z0-9\-]+)", "gene", ("gene",)),
+    (r"drug\s+([A-Za-z0-9\-]+)", "drug", ("drug",)),
+    (r"for\s+([A-Za-z0-9' \-]+\sdisease)", "disease", ("for", "disease")),
+    (r"disease\s+([A-Za-z0-9' \-]+)", "disease", ("disease",)),
+    (r"associated with\s+([A-Za-z0-9' \-]+)", "drug", ("associated with",)),
+    (r"trials for\s+([A-Za-z0-9\-]+)", "drug", ("trials for",)),
+    (r"is\s+([A-Za-z0-9\-]+)\s+approved", "drug", ("is", "approved")),
+    (r"for\s+([A-Za-z0-9\-]+)\s+in\s+phase", "drug", ("for", "phase")),
+]
+
+_PUNCTUATION = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2010": "-", "\u2011": "-", "\u2013": "-", "\u2014": "-", "\u2212": "-",
+})
+
+_parse_cache: Optional[LRUCache] = LRUCache(max_entries=1024)
+
+
+def configure_parse_cache(max_entries: int = 1024) -> None:
+    """Reset the shared cache of parse results; ``0`` disables caching."""
+    global _parse_cache
+    _parse_cache = LRUCache(max_entries=max_entries) if max_entries > 0 else None
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    """Return statistics for the parse cache (empty when caching is disabled)."""
+    return _parse_cache.stats() if _parse_cache is not None else {}
+
+
+def canonical_query(query: str) -> str:
+    """Return ``query`` with typographic quotes and dashes replaced by ASCII,
+    whitespace collapsed and trailing ``?``, ``!`` or ``.`` removed."""
+    if not query.isascii():
+        query = query.translate(_PUNCTUATION)
+    return " ".join(query.split()).rstrip("?!. ")
+
+
+# (parsed result, span of the entity in the canonical query or ``None``)
+_Parsed = Tuple[Dict[str, Any], Optional[Tuple[int, int]]]
 
 
 class QueryParserAgent:
-    """Lightweight rule-based query parser."""
+    """Lightweight rule-based query parser.
+
+    Patterns are compiled once per class. The keywords and pattern literals
+    present in the lowercased text are collected up front; for ASCII queries
+    a pattern is only searched when all of its literals are present, so most
+    patterns are skipped without running the regex engine.
+
+    Queries are parsed in their ``canonical_query`` form, and results for
+    ASCII queries are kept in a shared LRU cache keyed on that form in lower
+    case. A cache hit takes the entity's casing from the new query, and every
+    call returns a fresh copy that callers may modify.
+    """
 
     ACTION_KEYWORDS = ["list", "find", "describe", "show", "get", "which"]
+    TYPE_KEYWORDS = ["drug", "gene", "disease", "target"]
+
+    _ENTITY_RES: List[Tuple[Pattern[str], str, FrozenSet[str]]] = [
+        (re.compile(pattern, re.I), etype, frozenset(literals))
+        for pattern, etype, literals in ENTITY_PATTERNS
+    ]
+    _PHASE_SUFFIX_RE = re.compile(r"\s+phase.*", re.I)
+    _FALLBACK_HINTS = frozenset({"phase", "approved", "trial"})
+    _FALLBACK_ENTITY_RE = re.compile(r"(?:for|is)\s+([A-Za-z0-9\-]+)")
+    _FOR_ENTITY_RE = re.compile(r"for\s+([A-Za-z0-9\-]+)", re.I)
+    # (filter name, pattern, literals of which a match contains at least one)
+    _FILTER_RES: List[Tuple[str, Pattern[str], FrozenSet[str]]] = [
+        ("phase", re.compile(r"phase[-\s]*(\d+)"), frozenset({"phase"})),
+        (
+            "expression_threshold",
+            re.compile(r"expression\s*[>=]+\s*(\d+(?:\.\d+)?)"),
+            frozenset({"expression"}),
+        ),
+        (
+            "species",
+            re.compile(r"\b(human|mouse|rat|zebrafish)\b"),
+            frozenset({"human", "mouse", "rat", "zebrafish"}),
+        ),
+    ]
+    _WORDS = frozenset(ACTION_KEYWORDS + TYPE_KEYWORDS).union(
+        _FALLBACK_HINTS,
+        *(literals for _, _, literals in ENTITY_PATTERNS),
+        *(literals for _, _, literals in _FILTER_RES),
+    )
 
     def parse(self, query: str) -> Dict[str, Any]:
         """Parse a natural language query into structured components."""
+        if _parse_cache is None:
+            return self._parse(canonical_query(query))[0]
+        return self._cached("parse", query, self._parse)
+
+    def parse_with_fallback(self, query: str) -> Dict[str, Any]:
+        """Parse ``query`` and fill gaps with looser heuristics.
+
+        Queries without an entity take the word after ``for`` (as a drug when
+        no type was found), and disease queries phrased with ``for`` are
+        treated as drug queries.
+        """
+        if _parse_cache is None:
+            return self._parse_with_fallback(canonical_query(query))[0]
+        return self._cached("fallback", query, self._parse_with_fallback)
+
+    def _cached(
+        self, mode: str, query: str, parse: Callable[[str], _Parsed]
+    ) -> Dict[str, Any]:
+        text = canonical_query(query)
+        cache = _parse_cache
+        if cache is None or not text.isascii():
+            # a fresh result needs neither a copy nor the entity re-sliced
+            return parse(text)[0]
+        key = (mode, text.lower())
+        parsed: Optional[_Parsed] = cache.get(key)
+        if parsed is None:
+            parsed = parse(text)
+            cache.set(key, parsed)
+        result, span = parsed
+        result = dict(result, filters=dict(result["filters"]))
+        if span is not None:
+            result["entity"] = text[span[0]:span[1]]
+        return result
+
+    def _parse(self, query: str) -> _Parsed:
         text = query.lower()
-        action = next((a for a in self.ACTION_KEYWORDS if a in text), "unknown")
+        words = {word for word in self._WORDS if word in text}
+        action = next((a for a in self.ACTION_KEYWORDS if a in words), "unknown")
 
         entity_type = None
 
         entity = None
-        patterns = [
-            (r"in\s+phase[-\s]*\d+\s+for\s+([A-Za-z0-9\-]+)", "drug"),
-            (r"targeting\s+([A-Za-z0-9\-]+)", "target"),
-            (r"gene\s+([A-Za-z0-9\-]+)", "gene"),
-            (r"drug\s+([A-Za-z0-9\-]+)", "drug"),
-            (r"for\s+([A-Za-z0-9' \-]+\sdisease)", "disease"),
-            (r"disease\s+([A-Za-z0-9' \-]+)", "disease"),
-            (r"associated with\s+([A-Za-z0-9' \-]+)", "drug"),
-            (r"trials for\s+([A-Za-z0-9\-]+)", "drug"),
-            (r"is\s+([A-Za-z0-9\-]+)\s+approved", "drug"),
-            (r"for\s+([A-Za-z0-9\-]+)\s+in\s+phase", "drug"),
-        ]
-        for pat, etype in patterns:
-            m = re.search(pat, query, re.I)
+        span = None
+        # Case-insensitive matching and ``lower`` only agree on ASCII text.
+        gated = query.isascii()
+        for pattern, etype, literals in self._ENTITY_RES:
+            if gated and not literals <= words:
+                continue
+            m = pattern.search(query)
             if m:
-                entity = re.sub(r"\s+phase.*", "", m.group(1)).strip()
+                group = m.group(1)
+                entity = self._PHASE_SUFFIX_RE.sub("", group).strip()
+                start = m.start(1) + len(group) - len(group.lstrip())
+                span = (start, start + len(entity))
                 entity_type = etype
                 break
 
         if entity_type is None:
-            if "drug" in text:
-                entity_type = "drug"
-            elif "gene" in text:
-                entity_type = "gene"
-            elif "disease" in text:
-                entity_type = "disease"
-            elif "target" in text:
-                entity_type = "target"
+            entity_type = next((k for k in self.TYPE_KEYWORDS if k in words), None)
 
         # Additional fallback heuristics to guess the entity from common phrasing
         if entity is None:
-            if re.search(r"phase|approved|trials?", text):
-                m = re.search(r"(?:for|is)\s+([A-Za-z0-9\-]+)", text)
+            if words & self._FALLBACK_HINTS:
+                m = self._FALLBACK_ENTITY_RE.search(text)
                 if m:
                     entity = m.group(1)
                     # override entity_type only if not explicitly set to gene/disease
@@ -73,15 +185,12 @@ class QueryParserAgent:
                         entity_type = "drug"
 
         filters: Dict[str, Any] = {}
-        m = re.search(r"phase[-\s]*(\d+)", text)
-        if m:
-            filters["phase"] = m.group(1)
-        m = re.search(r"expression\s*[>=]+\s*(\d+(?:\.\d+)?)", text)
-        if m:
-            filters["expression_threshold"] = m.group(1)
-        m = re.search(r"\b(human|mouse|rat|zebrafish)\b", text)
-        if m:
-            filters["species"] = m.group(1)
+        for name, pattern, literals in self._FILTER_RES:
+            if not words & literals:
+                continue
+            m = pattern.search(text)
+            if m:
+                filters[name] = m.group(1)
 
         result = {
             "entity": entity,
@@ -93,5 +202,19 @@ class QueryParserAgent:
         if entity is None or entity_type is None:
             print("QueryParserAgent debug:", result)
 
-        return result
+        return result, span
+
+    def _parse_with_fallback(self, query: str) -> _Parsed:
+        result, span = self._parse(query)
+        if not result["entity"]:
+            m = self._FOR_ENTITY_RE.search(query)
+            if m:
+                result["entity"] = m.group(1)
+                span = m.span(1)
+                if not result["entity_type"]:
+                    result["entity_type"] = "drug"
+
+        if result["entity"] and result["entity_type"] == "disease" and "for" in query.lower():
+            result["entity_type"] = "drug"
 
+        return result, span
@@ -0,0 +1,185 @@
+"""Compact record types for retrieved rows.
+
+Open Targets and ClinicalTrials.gov rows are parsed into ``__slots__`` classes
+instead of nested dictionaries.  They take about a third of the memory of the
+equivalent flat dictionaries and field access is an attribute lookup.  Each
+record is also a read-only ``Mapping`` over its flattened fields, so code
+written for the dictionaries used so far (``row.get("score")``, ``dict(row)``,
+``pd.DataFrame(rows)``, equality with a dict) keeps working.  As with those
+dictionaries, fields that are ``None`` are absent from the mapping view.
+
+Example::
+
+    rows = parse_targets(get_targets_for_disease("EFO_0000270"))
+    rows[0].approvedSymbol == rows[0]["approvedSymbol"]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Record(Mapping):
+    """Base class: a slotted record with a ``Mapping`` view of its non-``None`` fields."""
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.__slots__ if getattr(self, name) is not None)
+
+    def __len__(self) -> int:
+        return sum(getattr(self, name) is not None for name in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a plain dictionary."""
+        values = (getattr(self, name) for name in self.__slots__)
+        return {name: value for name, value in zip(self.__slots__, values) if value is not None}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+class TargetAssociation(_Record):
+    """A target associated with a disease (``associatedTargets`` row)."""
+
+    __slots__ = ("id", "approvedSymbol", "score")
+
+    def __init__(
+        self, id: Optional[str] = None, approvedSymbol: Optional[str] = None, score: Any = None
+    ) -> None:
+        self.id = id
+        self.approvedSymbol = approvedSymbol
+        self.score = score
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "TargetAssociation":
+        target = row.get("target") or {}
+        return cls(target.get("id"), target.get("approvedSymbol"), row.get("score"))
+
+
+class Indication(_Record):
+    """A disease a drug is indicated for (``indications`` row)."""
+
+    __slots__ = ("id", "name", "phase", "status")
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        name: Optional[str] = None,
+        phase: Any = None,
+        status: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.phase = phase
+        self.status = status
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Indication":
+        disease = row.get("disease") or {}
+        return cls(disease.get("id"), disease.get("name"), row.get("phase"), row.get("status"))
+
+
+class Trial(_Record):
+    """A clinical trial as yielded by ``iter_trials_for_disease``."""
+
+    __slots__ = ("title", "phase", "status", "drug", "nct")
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        phase: Optional[str] = None,
+        status: Optional[str] = None,
+        drug: Optional[str] = None,
+        nct: Optional[str] = None,
+    ) -> None:
+        self.title = title
+        self.phase = phase
+        self.status = status
+        self.drug = drug
+        self.nct = nct
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Trial":
+        get = row.get
+        return cls(get("title"), get("phase"), get("status"), get("drug"), get("nct"))
+
+
+class ExpressionRecord(_Record):
+    """RNA expression of a target in one tissue (``expressions`` row)."""
+
+    __slots__ = ("target", "tissue", "expression")
+
+    def __init__(
+        self, target: Optional[str] = None, tissue: Optional[str] = None, expression: Any = None
+    ) -> None:
+        self.target = target
+        self.tissue = tissue
+        self.expression = expression
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any], target: Optional[str] = None) -> "ExpressionRecord":
+        tissue = row.get("tissue") or {}
+        rna = row.get("rna") or {}
+        return cls(target, tissue.get("label"), rna.get("value"))
+
+
+def _rows(response: Optional[Dict[str, Any]], root: str, collection: str) -> List[Dict]:
+    entity = ((response or {}).get("data") or {}).get(root) or {}
+    return (entity.get(collection) or {}).get("rows") or []
+
+
+def parse_targets(data: Any) -> List[TargetAssociation]:
+    """Parse a ``get_targets_for_disease`` response, or an iterable of its rows."""
+    rows = _rows(data, "disease", "associatedTargets") if isinstance(data, dict) else data
+    from_row = TargetAssociation.from_row
+    return [from_row(row) for row in rows or ()]
+
+
+def parse_indications(data: Any) -> List[Indication]:
+    """Parse a ``get_diseases_for_drug`` response, or an iterable of its rows."""
+    rows = _rows(data, "drug", "indications") if isinstance(data, dict) else data
+    from_row = Indication.from_row
+    return [from_row(row) for row in rows or ()]
+
+
+def parse_trials(rows: Iterable[Dict[str, Any]], drug: Optional[str] = None) -> List[Trial]:
+    """Parse ``get_trials_for_disease`` rows, optionally tagging them with ``drug``."""
+    trials = [Trial.from_row(row) for row in rows or ()]
+    if drug is not None:
+        for trial in trials:
+            trial.drug = drug
+    return trials
+
+
+def parse_expressions(data: Optional[Dict[str, Any]]) -> List[ExpressionRecord]:
+    """Parse a target ``expressions`` response into expression records."""
+    entity = ((data or {}).get("data") or {}).get("target") or {}
+    target = entity.get("id")
+    return [ExpressionRecord.from_row(row, target) for row in entity.get("expressions") or ()]
@@ -0,0 +1,135 @@
+"""Asyncio interface to the Open Targets and ClinicalTrials.gov retriever.
+
+The coroutines here mirror the blocking helpers in ``retriever_opentargets``
+and return exactly the same shapes, so their results can be passed to
+``MatcherAgent`` unchanged.  Each call runs the blocking helper in a worker
+thread, sharing the pooled HTTP session, and the ``gather_*`` helpers fetch
+many IDs concurrently behind a semaphore.
+
+Single calls use the event loop's default executor unless ``executor`` is
+given; that pool is capped at ``min(32, os.cpu_count() + 4)`` threads.  The
+``gather_*`` helpers run on a dedicated pool of ``concurrency`` threads, so
+raising ``concurrency`` really puts that many requests in flight.  Very high
+values are still limited by the per-host ``pool_maxsize`` of the HTTP client.
+
+Example::
+
+    import asyncio
+    from grid_agentic_ai.agents.retriever_async import gather_diseases_for_drugs
+
+    results = asyncio.run(gather_diseases_for_drugs(["CHEMBL941", "CHEMBL1421"]))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from . import retriever_opentargets as retriever
+
+DEFAULT_CONCURRENCY = 8
+
+
+async def _run_blocking(executor: Optional[Executor], func: Callable[..., Any], *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def get_targets_for_disease_async(
+    efo_id: str, executor: Optional[Executor] = None
+) -> Optional[Dict]:
+    """Async counterpart of ``get_targets_for_disease``."""
+    return await _run_blocking(executor, retriever.get_targets_for_disease, efo_id)
+
+
+async def get_diseases_for_drug_async(
+    chembl_id: str, executor: Optional[Executor] = None
+) -> Optional[Dict]:
+    """Async counterpart of ``get_diseases_for_drug``."""
+    return await _run_blocking(executor, retriever.get_diseases_for_drug, chembl_id)
+
+
+async def get_trials_for_disease_async(
+    disease_name: str,
+    phase: Optional[str] = None,
+    status: Optional[str] = None,
+    max_results: Optional[int] = retriever.DEFAULT_TRIALS_LIMIT,
+    executor: Optional[Executor] = None,
+) -> list:
+    """Async counterpart of ``get_trials_for_disease``."""
+    return await _run_blocking(
+        executor,
+        retriever.get_trials_for_disease,
+        disease_name,
+        phase,
+        status=status,
+        max_results=max_results,
+    )
+
+
+async def gather_with_concurrency(
+    func: Callable[[str], Awaitable[Any]],
+    ids: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[str, Any]:
+    """Run ``func`` for every unique ID with at most ``concurrency`` calls in flight.
+
+    Returns a dictionary mapping each ID to its result, in input order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    unique = list(dict.fromkeys(ids))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(item: str) -> Any:
+        async with semaphore:
+            return await func(item)
+
+    results = await asyncio.gather(*(_run(item) for item in unique))
+    return dict(zip(unique, results))
+
+
+async def _gather_on_pool(
+    fetch: Callable[[str, Executor], Awaitable[Any]],
+    ids: Iterable[str],
+    concurrency: int,
+) -> Dict[str, Any]:
+    """``gather_with_concurrency`` on a dedicated pool of ``concurrency`` threads."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="retriever")
+    try:
+        return await gather_with_concurrency(lambda item: fetch(item, pool), ids, concurrency)
+    finally:
+        pool.shutdown(wait=False)
+
+
+async def gather_targets_for_diseases(
+    efo_ids: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+) -> Dict[str, Optional[Dict]]:
+    """Fetch associated targets for many diseases concurrently."""
+    return await _gather_on_pool(get_targets_for_disease_async, efo_ids, concurrency)
+
+
+async def gather_diseases_for_drugs(
+    chembl_ids: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+) -> Dict[str, Optional[Dict]]:
+    """Fetch indications for many drugs concurrently."""
+    return await _gather_on_pool(get_diseases_for_drug_async, chembl_ids, concurrency)
+
+
+async def gather_trials_for_diseases(
+    disease_names: Iterable[str],
+    phase: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    status: Optional[str] = None,
+    max_results: Optional[int] = retriever.DEFAULT_TRIALS_LIMIT,
+) -> Dict[str, list]:
+    """Fetch ClinicalTrials.gov studies for many diseases concurrently."""
+
+    async def _fetch(name: str, pool: Executor) -> list:
+        return await get_trials_for_disease_async(name, phase, status, max_results, pool)
+
+    return await _gather_on_pool(_fetch, disease_names, concurrency)
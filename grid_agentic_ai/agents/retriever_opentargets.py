@@ -1,54 +1,176 @@
 """Utilities for retrieving data from the Open Targets platform and ClinicalTrials.gov."""
 
-from typing import Optional, Dict, Any, Callable
-import time
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator
+import os
+from urllib.parse import urlsplit
 
 try:
     import requests  # type: ignore
 except Exception:  # optional fallback
     requests = None  # type: ignore
 
+from .cache import ResponseCache, DEFAULT_CACHE_PATH
+from .http_client import get_client
+from .retry import get_policy
+from .singleflight import SingleFlight
+from .local_backend import LocalOpenTargetsStore
+from .query_builder import build_query
+
 OPENTARGETS_URL = "https://api.platform.opentargets.org/api/v4/graphql"
 
+# Rows requested per page when walking ``associatedTargets``.
+DEFAULT_PAGE_SIZE = 500
+
+# Largest page the ClinicalTrials.gov study_fields endpoint returns.
+TRIALS_PAGE_SIZE = 1000
+
+# Trials returned by ``get_trials_for_disease`` unless ``max_results`` is given.
+DEFAULT_TRIALS_LIMIT = 100
+
+# Number of entities packed into one aliased GraphQL document by the bulk helpers.
+DEFAULT_BATCH_SIZE = 25
+
+_DISEASE_TARGETS_SELECTION = """
+        id
+        name
+        associatedTargets {
+          rows {
+            target {
+              id
+              approvedSymbol
+            }
+            score
+          }
+        }
+"""
+
+_DRUG_INDICATIONS_SELECTION = """
+        id
+        name
+        indications {
+          rows {
+            disease {
+              id
+              name
+            }
+            phase
+            status
+          }
+        }
+"""
+
+
+class RetrievalError(RuntimeError):
+    """A page of a paged result set could not be fetched.
+
+    Raised by the ``iter_*`` helpers so that a failed request is not mistaken
+    for the end of the results.
+    """
+
+
+_cache: Optional[ResponseCache] = None
+_inflight = SingleFlight()
+_backend: Optional[LocalOpenTargetsStore] = None
+
+
+def configure_cache(
+    path: str = DEFAULT_CACHE_PATH,
+    ttl: float = 24 * 3600,
+    max_entries: int = 10000,
+) -> ResponseCache:
+    """Enable the persistent response cache used by ``_post``."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = ResponseCache(path, ttl=ttl, max_entries=max_entries)
+    return _cache
+
+
+def disable_cache() -> None:
+    """Turn off response caching."""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return hit/miss statistics of the response cache (empty when disabled)."""
+    return _cache.stats() if _cache is not None else {}
+
+
+def use_local_backend(path: Optional[str]) -> Optional[LocalOpenTargetsStore]:
+    """Answer Open Targets lookups from a local store at ``path``.
+
+    Pass ``None`` to switch back to the live GraphQL API. Raises
+    ``FileNotFoundError`` if no store exists at ``path``.
+    """
+    global _backend
+    store = LocalOpenTargetsStore(path) if path else None
+    if _backend is not None:
+        _backend.close()
+    _backend = store
+    return _backend
+
+
+if os.environ.get("GRID_OT_CACHE"):
+    configure_cache(os.environ["GRID_OT_CACHE"])
+
+if os.environ.get("GRID_OT_BACKEND"):
+    use_local_backend(os.environ["GRID_OT_BACKEND"])
+
 
 def _post(query: str, variables: Dict[str, Any]) -> Optional[Dict]:
-    """Internal helper to POST a GraphQL query with basic error handling."""
+    """Internal helper to POST a GraphQL query with basic error handling.
+
+    Concurrent calls for the same query and variables share one request.
+    """
+    key = ResponseCache.make_key(query, variables)
+    if _cache is not None:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
     if not requests:
         return None
+    return _inflight.do(key, lambda: _fetch(query, variables, key))
+
+
+def _fetch(query: str, variables: Dict[str, Any], key: str) -> Optional[Dict]:
+    """POST ``query`` to Open Targets and cache a successful response."""
 
     def _do_post() -> Any:
-        return requests.post(
+        return get_client().post(
             OPENTARGETS_URL,
             json={"query": query, "variables": variables},
-            timeout=10,
         )
 
     try:
-        response = _request_with_retry(_do_post)
+        response = _request_with_retry(_do_post, urlsplit(OPENTARGETS_URL).hostname or "")
         if response is not None:
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            if _cache is not None and isinstance(data, dict) and not data.get("errors"):
+                _cache.set(key, data)
+            return data
     except requests.exceptions.RequestException as exc:  # type: ignore[attr-defined]
         print("Open Targets request failed:", exc)
     return None
 
 
-def _request_with_retry(func: Callable[[], Any]) -> Optional[Any]:
-    """Call `func` with retry logic for network issues."""
+def _request_with_retry(func: Callable[[], Any], host: str = "") -> Optional[Any]:
+    """Call `func` under the shared retry policy for network issues."""
     if not requests:
         return None
-    for attempt in range(3):
-        try:
-            return func()
-        except requests.exceptions.RequestException as exc:  # type: ignore[attr-defined]
-            if attempt == 2:
-                print("Final failure:", exc)
-            time.sleep(2)
-    return None
+    return get_policy().call(
+        func, host, retry_on=(requests.exceptions.RequestException,)  # type: ignore[attr-defined]
+    )
 
 
 def get_targets_for_disease(efo_id: str) -> Optional[Dict]:
     """Return targets associated with a disease (EFO ID) from Open Targets."""
+    if _backend is not None:
+        return _backend.get_targets_for_disease(efo_id)
     query = """
     query GetTargetsForDisease($efoId: String!) {
       disease(efoId: $efoId) {
@@ -70,8 +192,73 @@ def get_targets_for_disease(efo_id: str) -> Optional[Dict]:
     return _post(query, variables)
 
 
+def iter_targets_for_disease(
+    efo_id: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    min_score: Optional[float] = None,
+    top_n: Optional[int] = None,
+) -> Iterator[Dict]:
+    """Yield every ``associatedTargets`` row of a disease, one page at a time.
+
+    Rows have the same structure as those returned by ``get_targets_for_disease``
+    and arrive in the API's score order (highest first), so iteration stops as
+    soon as a row scores below ``min_score`` or ``top_n`` rows have been
+    yielded. Only one page is held in memory at a time.
+
+    Raises ``RetrievalError`` if a page cannot be fetched, instead of ending
+    the iteration early.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if _backend is not None:
+        yield from _backend.iter_targets_for_disease(efo_id, min_score, top_n)
+        return
+    if not requests:
+        return
+    query = """
+    query GetTargetsForDiseasePage($efoId: String!, $index: Int!, $size: Int!) {
+      disease(efoId: $efoId) {
+        associatedTargets(page: {index: $index, size: $size}) {
+          count
+          rows {
+            target {
+              id
+              approvedSymbol
+            }
+            score
+          }
+        }
+      }
+    }
+    """
+    yielded = 0
+    index = 0
+    while top_n is None or yielded < top_n:
+        payload = _post(query, {"efoId": efo_id, "index": index, "size": page_size})
+        if not isinstance(payload, dict) or payload.get("errors"):
+            raise RetrievalError(
+                f"Open Targets request for page {index} of {efo_id} targets failed"
+            )
+        disease = (payload.get("data") or {}).get("disease") or {}
+        associations = disease.get("associatedTargets") or {}
+        rows = associations.get("rows") or []
+        for row in rows:
+            if min_score is not None and (row.get("score") or 0) < min_score:
+                return
+            yield row
+            yielded += 1
+            if top_n is not None and yielded >= top_n:
+                return
+        count = associations.get("count")
+        index += 1
+        if len(rows) < page_size or (count is not None and index * page_size >= count):
+            return
+
+
 def get_diseases_for_drug(chembl_id: str) -> Optional[Dict]:
     """Return diseases associated with a drug (ChEMBL ID) from Open Targets."""
+    if _backend is not None:
+        return _backend.get_diseases_for_drug(chembl_id)
     query = """
     query GetDiseasesForDrug($chemblId: String!) {
       drug(chemblId: $chemblId) {
@@ -94,34 +281,183 @@ def get_diseases_for_drug(chembl_id: str) -> Optional[Dict]:
     return _post(query, variables)
 
 
-def get_trials_for_disease(disease_name: str, phase: Optional[str] = None) -> list:
-    """Return trials from ClinicalTrials.gov for a given disease and optional phase."""
+def get_for_intent(
+    parsed: Dict[str, Any],
+    entity_id: str,
+    page_size: Optional[int] = None,
+    order_by_score: Optional[str] = None,
+) -> Optional[Dict]:
+    """Fetch only the fields a parsed query needs for ``entity_id``.
+
+    The document comes from ``query_builder.build_query``; the response keeps
+    the usual ``data -> root -> collection`` layout with a smaller selection.
+    """
+    if _backend is not None:
+        root = parsed.get("entity_type")
+        if root == "drug":
+            return _backend.get_diseases_for_drug(entity_id)
+        if root == "disease":
+            return _backend.get_targets_for_disease(entity_id)
+    query, variables = build_query(
+        parsed, entity_id, page_size=page_size, order_by_score=order_by_score
+    )
+    return _post(query, variables)
+
+
+def _post_batched(
+    ids: Iterable[str],
+    root: str,
+    argument: str,
+    selection: str,
+    operation: str,
+    chunk_size: int,
+) -> Dict[str, Optional[Dict]]:
+    """POST aliased GraphQL documents for ``ids`` and split the response per ID.
+
+    Every entity of a chunk is requested under its own alias (``e0``, ``e1``...)
+    in a single document. Each value of the returned mapping has the same shape
+    as the corresponding single-entity helper, or is ``None`` when the request
+    for its chunk failed.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    unique = list(dict.fromkeys(ids))
+    results: Dict[str, Optional[Dict]] = {}
+    if _backend is not None:
+        lookup = (
+            _backend.get_targets_for_disease if root == "disease"
+            else _backend.get_diseases_for_drug
+        )
+        return {entity_id: lookup(entity_id) for entity_id in unique}
+    for start in range(0, len(unique), chunk_size):
+        chunk = unique[start:start + chunk_size]
+        definitions = ", ".join(f"$id{i}: String!" for i in range(len(chunk)))
+        fields = "".join(
+            f"      e{i}: {root}({argument}: $id{i}) {{{selection}      }}\n"
+            for i in range(len(chunk))
+        )
+        query = f"query {operation}({definitions}) {{\n{fields}    }}"
+        variables = {f"id{i}": entity_id for i, entity_id in enumerate(chunk)}
+        payload = _post(query, variables)
+        data = (payload or {}).get("data") or {}
+        for i, entity_id in enumerate(chunk):
+            results[entity_id] = None if payload is None else {"data": {root: data.get(f"e{i}")}}
+    return results
+
+
+def get_targets_for_diseases(
+    efo_ids: Iterable[str], chunk_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, Optional[Dict]]:
+    """Return targets for many diseases, ``chunk_size`` diseases per request.
+
+    The result maps each EFO ID to the same structure ``get_targets_for_disease``
+    returns for it.
+    """
+    return _post_batched(
+        efo_ids, "disease", "efoId", _DISEASE_TARGETS_SELECTION,
+        "GetTargetsForDiseases", chunk_size,
+    )
+
+
+def get_diseases_for_drugs(
+    chembl_ids: Iterable[str], chunk_size: int = DEFAULT_BATCH_SIZE
+) -> Dict[str, Optional[Dict]]:
+    """Return indications for many drugs, ``chunk_size`` drugs per request.
+
+    The result maps each ChEMBL ID to the same structure ``get_diseases_for_drug``
+    returns for it.
+    """
+    return _post_batched(
+        chembl_ids, "drug", "chemblId", _DRUG_INDICATIONS_SELECTION,
+        "GetDiseasesForDrugs", chunk_size,
+    )
+
+
+def _trials_expression(
+    disease_name: str, phase: Optional[str] = None, status: Optional[str] = None
+) -> str:
+    """Build a ClinicalTrials.gov search expression with the filters pushed down."""
+    expr = disease_name
+    if phase:
+        expr += f' AND AREA[Phase]"{phase}"'
+    if status:
+        expr += f' AND AREA[OverallStatus]"{status}"'
+    return expr
+
+
+def iter_trials_for_disease(
+    disease_name: str,
+    phase: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: int = TRIALS_PAGE_SIZE,
+    max_results: Optional[int] = None,
+) -> Iterator[Dict[str, str]]:
+    """Yield trials from ClinicalTrials.gov page by page.
+
+    The phase and status filters are sent to the API as part of the search
+    expression and re-checked on each row, and only the fields the pipeline
+    uses are requested. Iteration stops after ``max_results`` trials or when
+    the result set is exhausted; a failed request raises ``RetrievalError``.
+    """
     if not requests:
-        return []
+        return
+    if not 1 <= page_size <= TRIALS_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {TRIALS_PAGE_SIZE}")
 
+    url = "https://clinicaltrials.gov/api/query/study_fields"
     params = {
-        "expr": disease_name,
-        "fields": "BriefTitle,Phase,Status,StudyType",
-        "max_rnk": 100,
+        "expr": _trials_expression(disease_name, phase, status),
+        "fields": "BriefTitle,Phase,OverallStatus",
         "fmt": "json",
     }
-    url = "https://clinicaltrials.gov/api/query/study_fields"
+    yielded = 0
+    min_rank = 1
+    while max_results is None or yielded < max_results:
+        params["min_rnk"] = min_rank
+        params["max_rnk"] = min_rank + page_size - 1
+        try:
+            resp = get_client().get(url, params=params)
+            resp.raise_for_status()
+            data = resp.json()
+        except requests.exceptions.RequestException as exc:  # type: ignore[attr-defined]
+            raise RetrievalError(
+                f"ClinicalTrials.gov request for trials from rank {min_rank} failed: {exc}"
+            ) from exc
+
+        response = data.get("StudyFieldsResponse", {})
+        fields = response.get("StudyFields", [])
+        for entry in fields:
+            title = (entry.get("BriefTitle") or [""])[0]
+            trial_phase = (entry.get("Phase") or [""])[0]
+            trial_status = (entry.get("OverallStatus") or [""])[0]
+            if phase is not None and trial_phase.lower() != phase.lower():
+                continue
+            if status is not None and trial_status.lower() != status.lower():
+                continue
+            yield {"title": title, "phase": trial_phase, "status": trial_status}
+            yielded += 1
+            if max_results is not None and yielded >= max_results:
+                return
+
+        found = response.get("NStudiesFound")
+        min_rank += page_size
+        if len(fields) < page_size or (found is not None and min_rank > found):
+            return
 
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.exceptions.RequestException as exc:  # type: ignore[attr-defined]
-        print("ClinicalTrials.gov request failed:", exc)
-        return []
 
-    trials = []
-    fields = data.get("StudyFieldsResponse", {}).get("StudyFields", [])
-    for entry in fields:
-        title = entry.get("BriefTitle", [""])[0]
-        trial_phase = entry.get("Phase", [""])[0]
-        status = entry.get("Status", [""])[0]
-        if phase is None or trial_phase.lower() == phase.lower():
-            trials.append({"title": title, "phase": trial_phase, "status": status})
+def get_trials_for_disease(
+    disease_name: str,
+    phase: Optional[str] = None,
+    status: Optional[str] = None,
+    max_results: Optional[int] = DEFAULT_TRIALS_LIMIT,
+) -> list:
+    """Return trials from ClinicalTrials.gov for a given disease and optional phase.
 
-    return trials
+    At most ``max_results`` trials are returned; use ``iter_trials_for_disease``
+    to walk the full result set. An empty list is returned if a request fails.
+    """
+    try:
+        return list(iter_trials_for_disease(disease_name, phase, status, max_results=max_results))
+    except RetrievalError as exc:
+        print(exc)
+        return []
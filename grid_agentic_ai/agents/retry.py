@@ -0,0 +1,270 @@
+"""Retry policy shared by the GRID network agents.
+
+``RetryPolicy`` wraps a request callable with:
+
+- jittered exponential backoff between attempts,
+- a global retry budget so that retries cannot multiply load during an outage,
+- honouring ``Retry-After`` on 429/503 responses, and
+- a per-host circuit breaker that fails fast while a host is unhealthy.
+
+Every decision is counted and exposed through ``RetryPolicy.stats``.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Type
+
+RETRY_STATUSES = (429, 502, 503, 504)
+RETRY_AFTER_STATUSES = (429, 503)
+
+
+class CircuitBreaker:
+    """Track consecutive failures per host and short-circuit unhealthy hosts.
+
+    After ``failure_threshold`` consecutive failures a host is *open* and all
+    calls are rejected until ``reset_timeout`` seconds have passed. The host
+    is then *half-open*: exactly one call is let through as a probe while
+    every other call keeps failing fast. Success of the probe closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """Return ``True`` if a request to ``host`` may be attempted."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if host in self._probing:
+                return False
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                self._probing.add(host)
+                return True
+            return False
+
+    def release(self, host: str) -> None:
+        """End a probe without an outcome, letting the next call probe instead."""
+        with self._lock:
+            self._probing.discard(host)
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._probing.discard(host)
+
+    def record_failure(self, host: str) -> bool:
+        """Record a failure and return ``True`` if the circuit just opened."""
+        with self._lock:
+            if host in self._probing:
+                # the half-open probe failed: open the circuit again
+                self._probing.discard(host)
+                self._opened_at[host] = time.monotonic()
+                return True
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold and host not in self._opened_at:
+                self._opened_at[host] = time.monotonic()
+                return True
+            return False
+
+    def open_hosts(self) -> list:
+        with self._lock:
+            return sorted(self._opened_at)
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of first attempts.
+
+    Each first attempt deposits ``ratio`` tokens (up to ``max_tokens``) and each
+    retry withdraws one token; when the bucket is empty no further retries are
+    made anywhere in the process.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+def _retry_after_seconds(response: Any) -> Optional[float]:
+    """Parse the ``Retry-After`` header of ``response`` into seconds."""
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Execute request callables with backoff, a retry budget and circuit breaking.
+
+    Parameters
+    ----------
+    max_attempts:
+        Total number of attempts per call, including the first one.
+    base_delay, max_delay:
+        The delay before retry ``n`` is drawn uniformly from
+        ``[0, min(max_delay, base_delay * 2 ** n)]`` ("full jitter").
+    max_retry_after:
+        Upper bound on how long a ``Retry-After`` header may make us wait.
+    budget, breaker:
+        Shared ``RetryBudget`` and ``CircuitBreaker`` instances.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_retry_after: float = 60.0,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._counters = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "successes": 0,
+            "failures": 0,
+            "retry_after_honored": 0,
+            "budget_exhausted": 0,
+            "circuit_rejected": 0,
+            "circuit_opened": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def backoff(self, attempt: int) -> float:
+        """Return the jittered delay before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _failed(self, host: str) -> None:
+        if self.breaker.record_failure(host):
+            self._count("circuit_opened")
+
+    def call(
+        self,
+        func: Callable[[], Any],
+        host: str = "",
+        retry_on: Tuple[Type[BaseException], ...] = (OSError,),
+    ) -> Optional[Any]:
+        """Call ``func`` and retry transient failures.
+
+        ``func`` should perform one request and return the response. Exceptions
+        listed in ``retry_on`` and responses with a retryable status code are
+        retried. Returns the last response, or ``None`` if every attempt raised
+        or the circuit for ``host`` is open.
+        """
+        self._count("calls")
+        if not self.breaker.allow(host):
+            self._count("circuit_rejected")
+            return None
+        self.budget.deposit()
+
+        for attempt in range(self.max_attempts):
+            self._count("attempts")
+            delay = None
+            try:
+                response = func()
+            except retry_on:
+                self._failed(host)
+                response = None
+            except BaseException:
+                # not a host failure; don't leave a half-open probe pending
+                self.breaker.release(host)
+                raise
+            else:
+                status = getattr(response, "status_code", None)
+                if status not in RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    self._count("successes")
+                    return response
+                self._failed(host)
+                if status in RETRY_AFTER_STATUSES:
+                    delay = _retry_after_seconds(response)
+
+            if attempt == self.max_attempts - 1:
+                break
+            if not self.breaker.allow(host):
+                self._count("circuit_rejected")
+                break
+            if not self.budget.withdraw():
+                self._count("budget_exhausted")
+                break
+            if delay is not None:
+                self._count("retry_after_honored")
+                delay = min(delay, self.max_retry_after)
+            else:
+                delay = self.backoff(attempt)
+            self._count("retries")
+            time.sleep(delay)
+
+        self._count("failures")
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the policy counters."""
+        with self._lock:
+            snapshot: Dict[str, Any] = dict(self._counters)
+        snapshot["budget_tokens"] = self.budget.tokens
+        snapshot["open_circuits"] = self.breaker.open_hosts()
+        return snapshot
+
+
+_policy = RetryPolicy()
+
+
+def get_policy() -> RetryPolicy:
+    """Return the process-wide retry policy."""
+    return _policy
+
+
+def configure_retry(**kwargs: Any) -> RetryPolicy:
+    """Replace the process-wide retry policy with one built from ``kwargs``."""
+    global _policy
+    _policy = RetryPolicy(**kwargs)
+    return _policy
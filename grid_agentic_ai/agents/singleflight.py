@@ -0,0 +1,64 @@
+"""Request coalescing for GRID agents.
+
+``SingleFlight`` makes concurrent calls that share a key run the underlying
+function only once: the first caller executes it and every caller that
+arrives while it is in flight waits for, and receives, the same result (or
+exception).  Once the call completes the key is forgotten, so later calls
+run again.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicate identical in-flight calls across threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return ``func()``, sharing the result with concurrent callers of ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many calls were executed and how many shared a result."""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
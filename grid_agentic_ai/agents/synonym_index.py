@@ -0,0 +1,226 @@
+"""Local synonym index for offline term resolution.
+
+The index maps casefolded synonyms of diseases (EFO), genes (HGNC) and drugs
+(ChEMBL) to their identifiers.  It is stored as one compact file of sorted
+records plus an offset table, which ``SynonymIndex`` memory-maps and
+binary-searches; opening it costs a single ``mmap`` call regardless of size.
+
+File layout (little-endian)::
+
+    b"GRIDSYN1" | uint32 record count | uint32 offsets[count + 1] | records
+
+Each record is ``key \\t type \\t resolved_id \\t label \\t extra_id`` encoded as
+UTF-8, sorted by ``key \\t type``.  Build an index from the release dumps with::
+
+    python -m grid_agentic_ai.agents.synonym_index synonyms.idx \\
+        --efo efo.obo --hgnc hgnc_complete_set.txt --chembl chembl_synonyms.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"GRIDSYN1"
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+
+SOURCES = {
+    "disease": "EFO (local index)",
+    "gene": "HGNC (local index)",
+    "drug": "ChEMBL (local index)",
+}
+
+# (term_type, synonym, resolved_id, label, extra_id)
+SynonymRecord = Tuple[str, str, str, str, str]
+
+
+def normalize_key(term: str) -> str:
+    """Return the lookup form of ``term``: whitespace-collapsed and casefolded."""
+    return " ".join(term.split()).casefold()
+
+
+def _efo_records(stanza: Optional[Dict[str, List[str]]]) -> Iterator[SynonymRecord]:
+    if not stanza or "true" in stanza.get("is_obsolete", []):
+        return
+    ids, names = stanza.get("id"), stanza.get("name")
+    if not ids or not names:
+        return
+    synonyms = [
+        s.split('"')[1] for s in stanza.get("synonym", []) if " EXACT" in s and s.count('"') >= 2
+    ]
+    for synonym in [names[0]] + synonyms:
+        yield ("disease", synonym, ids[0], names[0], "")
+
+
+def iter_efo_obo(path: str) -> Iterator[SynonymRecord]:
+    """Yield disease names and exact synonyms from an EFO ``.obo`` file."""
+    stanza: Optional[Dict[str, List[str]]] = None
+    with open(path, encoding="utf-8") as fh:
+        for raw in fh:
+            line = raw.strip()
+            if line.startswith("["):
+                yield from _efo_records(stanza)
+                stanza = {} if line == "[Term]" else None
+            elif stanza is not None and ":" in line:
+                tag, value = line.split(":", 1)
+                stanza.setdefault(tag, []).append(value.strip())
+    yield from _efo_records(stanza)
+
+
+def iter_hgnc_tsv(path: str) -> Iterator[SynonymRecord]:
+    """Yield approved, alias and previous symbols from the HGNC complete set."""
+    with open(path, encoding="utf-8", newline="") as fh:
+        for row in csv.DictReader(fh, delimiter="\t"):
+            symbol = row.get("symbol")
+            if not symbol:
+                continue
+            entrez = row.get("entrez_id") or ""
+            names = [symbol]
+            for column in ("alias_symbol", "prev_symbol"):
+                names += [n for n in (row.get(column) or "").strip('"').split("|") if n]
+            for name in names:
+                yield ("gene", name, symbol, symbol, entrez)
+
+
+def iter_chembl_synonyms(path: str) -> Iterator[SynonymRecord]:
+    """Yield drug names from a ChEMBL TSV with ``chembl_id``, ``pref_name``, ``synonym``."""
+    with open(path, encoding="utf-8", newline="") as fh:
+        for row in csv.DictReader(fh, delimiter="\t"):
+            chembl_id = row.get("chembl_id")
+            if not chembl_id:
+                continue
+            pref_name = row.get("pref_name") or ""
+            for name in (pref_name, row.get("synonym") or ""):
+                if name:
+                    yield ("drug", name, chembl_id, pref_name or name, "")
+
+
+def build_synonym_index(records: Iterable[SynonymRecord], path: str) -> int:
+    """Write ``records`` to an index file at ``path`` and return the record count.
+
+    When a synonym maps to several IDs of the same type, a record whose
+    synonym is its own label (an approved symbol or preferred name) wins over
+    aliases, synonyms and previous symbols, wherever it appears in
+    ``records``; otherwise the first record wins.
+    """
+    entries: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+    preferred = set()
+    for term_type, synonym, resolved_id, label, extra in records:
+        key = normalize_key(synonym)
+        if not key or "\t" in key or "\n" in key:
+            continue
+        entry = (key, term_type)
+        is_preferred = key == normalize_key(label)
+        if entry not in entries or (is_preferred and entry not in preferred):
+            entries[entry] = (resolved_id, label, extra)
+        if is_preferred:
+            preferred.add(entry)
+
+    blobs: List[bytes] = []
+    for (key, term_type), (resolved_id, label, extra) in entries.items():
+        fields = (key, term_type, resolved_id, label, extra)
+        blobs.append("\t".join(f.replace("\t", " ") for f in fields).encode("utf-8"))
+    blobs.sort()
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, len(blobs)))
+        offset = 0
+        for blob in blobs:
+            fh.write(_OFFSET.pack(offset))
+            offset += len(blob)
+        fh.write(_OFFSET.pack(offset))
+        for blob in blobs:
+            fh.write(blob)
+    os.replace(tmp_path, path)
+    return len(blobs)
+
+
+class SynonymIndex:
+    """Read-only, memory-mapped view of a synonym index file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a GRID synonym index")
+        self._offsets = _HEADER.size
+        self._data = self._offsets + _OFFSET.size * (self._count + 1)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, i: int) -> bytes:
+        start = _OFFSET.unpack_from(self._mm, self._offsets + _OFFSET.size * i)[0]
+        end = _OFFSET.unpack_from(self._mm, self._offsets + _OFFSET.size * (i + 1))[0]
+        return self._mm[self._data + start:self._data + end]
+
+    def lookup(self, term_type: str, query: str) -> Optional[Dict]:
+        """Return a ``normalize_term``-style result for ``query`` or ``None``."""
+        prefix = f"{normalize_key(query)}\t{term_type}\t".encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self._count:
+            return None
+        record = self._record(lo)
+        if not record.startswith(prefix):
+            return None
+        _, _, resolved_id, label, extra = record.decode("utf-8").split("\t")
+        result = {
+            "input": query,
+            "resolved_id": resolved_id,
+            "label": label,
+            "source": SOURCES.get(term_type, "local index"),
+        }
+        if extra:
+            result["entrez_id"] = extra
+        return result
+
+    def terms(self, term_type: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Yield ``(term_type, key)`` for every indexed synonym."""
+        for i in range(self._count):
+            key, record_type = self._record(i).decode("utf-8").split("\t", 2)[:2]
+            if term_type is None or record_type == term_type:
+                yield record_type, key
+
+    def close(self) -> None:
+        self._mm.close()
+        self._fh.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a synonym index from EFO, HGNC and ChEMBL dumps."""
+    argp = argparse.ArgumentParser(description="Build a GRID synonym index")
+    argp.add_argument("output", help="Path of the index file to write")
+    argp.add_argument("--efo", help="EFO ontology in OBO format")
+    argp.add_argument("--hgnc", help="HGNC complete set TSV")
+    argp.add_argument("--chembl", help="ChEMBL synonyms TSV (chembl_id, pref_name, synonym)")
+    args = argp.parse_args(argv)
+
+    def records() -> Iterator[SynonymRecord]:
+        if args.efo:
+            yield from iter_efo_obo(args.efo)
+        if args.hgnc:
+            yield from iter_hgnc_tsv(args.hgnc)
+        if args.chembl:
+            yield from iter_chembl_synonyms(args.chembl)
+
+    count = build_synonym_index(records(), args.output)
+    print(f"Wrote {count} synonyms to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
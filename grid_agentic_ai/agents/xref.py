@@ -0,0 +1,161 @@
+"""Local PubChem CID <-> ChEMBL ID cross-reference table.
+
+PubChem resolves drug names to CIDs while Open Targets is keyed on ChEMBL
+IDs.  ``XrefTable`` maps between the two offline.  Both identifiers are
+stored as integers (``CHEMBL941`` -> 941) in two open-addressing hash tables
+of ``uint32`` pairs, one per direction, so a lookup is a couple of probes into
+a memory-mapped file.
+
+File layout (little-endian)::
+
+    b"GRIDXRF1" | uint32 capacity | (uint32 key, uint32 value)[capacity] x 2
+
+The first table is keyed on CID, the second on ChEMBL number; key 0 marks an
+empty slot.  Build a table from the UniChem ChEMBL-to-PubChem mapping
+(``src1src22.txt.gz``) with::
+
+    python -m grid_agentic_ai.agents.xref xref.bin src1src22.txt.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"GRIDXRF1"
+_HEADER = struct.Struct("<8sI")
+_SLOT = struct.Struct("<II")
+_MAX_ID = 0xFFFFFFFF
+
+
+def _hash(key: int, mask: int) -> int:
+    return ((key * 2654435761) & 0xFFFFFFFF) & mask
+
+
+def chembl_number(chembl_id: Union[str, int]) -> Optional[int]:
+    """Return the numeric part of ``CHEMBL<n>`` or ``None`` if it is not one."""
+    text = str(chembl_id).strip().upper()
+    if text.startswith("CHEMBL") and text[6:].isdigit():
+        number = int(text[6:])
+        return number if 0 < number <= _MAX_ID else None
+    return None
+
+
+def _cid_number(cid: Union[str, int]) -> Optional[int]:
+    text = str(cid).strip()
+    if text.isdigit() and 0 < int(text) <= _MAX_ID:
+        return int(text)
+    return None
+
+
+def iter_unichem_pairs(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield ``(chembl_id, cid)`` pairs from a UniChem ``src1src22`` mapping file.
+
+    Header lines and rows that do not hold a ChEMBL ID and a CID are skipped.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            fields = line.split()
+            if len(fields) >= 2 and chembl_number(fields[0]) and _cid_number(fields[1]):
+                yield fields[0], fields[1]
+
+
+def _table(pairs: Dict[int, int], capacity: int) -> bytearray:
+    mask = capacity - 1
+    buf = bytearray(capacity * _SLOT.size)
+    keys = [0] * capacity
+    for key, value in pairs.items():
+        slot = _hash(key, mask)
+        while keys[slot]:
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        _SLOT.pack_into(buf, slot * _SLOT.size, key, value)
+    return buf
+
+
+def build_xref_table(pairs: Iterable[Tuple[Union[str, int], Union[str, int]]], path: str) -> int:
+    """Write ``(chembl_id, cid)`` pairs to a table at ``path`` and return its size.
+
+    When an identifier maps to several others the first pair wins.
+    """
+    by_cid: Dict[int, int] = {}
+    by_chembl: Dict[int, int] = {}
+    for chembl_id, cid in pairs:
+        chembl, cid_num = chembl_number(chembl_id), _cid_number(cid)
+        if chembl and cid_num:
+            by_cid.setdefault(cid_num, chembl)
+            by_chembl.setdefault(chembl, cid_num)
+
+    # Keep the load factor at or below one half.
+    capacity = 2
+    while capacity < 2 * max(len(by_cid), len(by_chembl)):
+        capacity *= 2
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, capacity))
+        fh.write(_table(by_cid, capacity))
+        fh.write(_table(by_chembl, capacity))
+    os.replace(tmp_path, path)
+    return max(len(by_cid), len(by_chembl))
+
+
+class XrefTable:
+    """Read-only, memory-mapped view of a cross-reference table."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._capacity = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a GRID cross-reference table")
+        self._mask = self._capacity - 1
+        self._by_cid = _HEADER.size
+        self._by_chembl = self._by_cid + self._capacity * _SLOT.size
+
+    def _probe(self, base: int, key: Optional[int]) -> Optional[int]:
+        if not key:
+            return None
+        slot = _hash(key, self._mask)
+        for _ in range(self._capacity):
+            found, value = _SLOT.unpack_from(self._mm, base + slot * _SLOT.size)
+            if found == key:
+                return value
+            if found == 0:
+                return None
+            slot = (slot + 1) & self._mask
+        return None
+
+    def chembl_for_cid(self, cid: Union[str, int]) -> Optional[str]:
+        """Return the ChEMBL ID for a PubChem CID, or ``None``."""
+        number = self._probe(self._by_cid, _cid_number(cid))
+        return f"CHEMBL{number}" if number else None
+
+    def cid_for_chembl(self, chembl_id: str) -> Optional[int]:
+        """Return the PubChem CID for a ChEMBL ID, or ``None``."""
+        return self._probe(self._by_chembl, chembl_number(chembl_id))
+
+    def close(self) -> None:
+        self._mm.close()
+        self._fh.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Build a cross-reference table from a UniChem mapping file."""
+    argp = argparse.ArgumentParser(description="Build a GRID CID/ChEMBL cross-reference table")
+    argp.add_argument("output", help="Path of the table to write")
+    argp.add_argument("mapping", help="UniChem ChEMBL-to-PubChem mapping (src1src22.txt[.gz])")
+    args = argp.parse_args(argv)
+    count = build_xref_table(iter_unichem_pairs(args.mapping), args.output)
+    print(f"Wrote {count} cross-references to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""File size and read-back benchmark for ``OutputGeneratorAgent`` exports.
+
+Writes a synthetic ``match_targets_to_drugs`` result in each export format
+and reports file size, write time and the time to read it back with
+``pyarrow`` (which is required)::
+
+    python -m grid_agentic_ai.benchmarks.bench_export --targets 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, List, Optional
+
+import pyarrow.csv
+import pyarrow.feather
+import pyarrow.json
+import pyarrow.parquet
+
+from grid_agentic_ai.agents.matcher import match_targets_to_drugs
+from grid_agentic_ai.agents.output_generator import OutputGeneratorAgent
+from grid_agentic_ai.benchmarks.bench_matcher import make_tables
+
+
+def formats(agent: OutputGeneratorAgent):
+    """Return ``(name, suffix, write, read)`` for each export format."""
+    return [
+        ("csv", "csv", agent.to_csv, pyarrow.csv.read_csv),
+        ("ndjson", "ndjson", agent.to_ndjson, pyarrow.json.read_json),
+        ("parquet zstd", "parquet", agent.to_parquet, pyarrow.parquet.read_table),
+        ("parquet snappy", "parquet",
+         lambda rows, path: agent.to_parquet(rows, path, compression="snappy"),
+         pyarrow.parquet.read_table),
+        ("arrow lz4", "arrow", agent.to_arrow, pyarrow.feather.read_table),
+        ("arrow zstd", "arrow",
+         lambda rows, path: agent.to_arrow(rows, path, compression="zstd"),
+         pyarrow.feather.read_table),
+    ]
+
+
+def timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argp = argparse.ArgumentParser(description="Benchmark export formats")
+    argp.add_argument("--targets", type=int, default=100000, help="Synthetic targets to join")
+    args = argp.parse_args(argv)
+
+    rows = match_targets_to_drugs(*make_tables(args.targets))
+    print(f"rows: {len(rows)}")
+    print(f"{'format':<15} {'size MB':>8} {'write s':>8} {'read s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, suffix, write, read in formats(OutputGeneratorAgent()):
+            path = os.path.join(tmp, f"out.{suffix}")
+            write_s = timed(lambda: write(rows, path))
+            read_s = timed(lambda: read(path))
+            size = os.path.getsize(path) / 1e6
+            print(f"{name:<15} {size:>8.2f} {write_s:>8.2f} {read_s:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Scaling benchmark for ``match_targets_to_drugs``.
+
+Joins synthetic association tables of increasing size with the indexed
+implementation (full sort and ``top_k``) and, for sizes where it finishes in
+reasonable time, the original nested loop (``legacy_match``)::
+
+    python -m grid_agentic_ai.benchmarks.bench_matcher --sizes 1000 5000 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+from grid_agentic_ai.agents.matcher import match_targets_to_drugs
+
+
+def legacy_match(targets: List[Dict], drug_data: List[Dict]) -> List[Dict]:
+    """The nested-loop join as it was before drugs were indexed, for comparison."""
+    matches: List[Dict] = []
+    for target in targets:
+        for drug in drug_data:
+            if drug.get("targetId") == target.get("id"):
+                matches.append({
+                    "target": target.get("approvedSymbol"),
+                    "drug": drug.get("drugName"),
+                    "status": drug.get("status"),
+                    "score": target.get("score", 0),
+                })
+    return sorted(matches, key=lambda x: x["score"], reverse=True)
+
+
+def make_tables(n_targets: int, pairs_per_target: float = 2.5, seed: int = 0):
+    """Return ``(targets, drug_data)`` with about ``pairs_per_target`` drugs per target."""
+    rng = random.Random(seed)
+    targets = [
+        {"id": f"ENSG{i:011d}", "approvedSymbol": f"GENE{i}", "score": round(rng.random(), 3)}
+        for i in range(n_targets)
+    ]
+    drug_data = [
+        {
+            "targetId": f"ENSG{rng.randrange(n_targets):011d}",
+            "drugName": f"DRUG{j}",
+            "status": rng.choice(["Phase 1", "Phase 2", "Phase 3", "Approved"]),
+        }
+        for j in range(int(n_targets * pairs_per_target))
+    ]
+    return targets, drug_data
+
+
+def timed(func: Callable[[], List[Dict]]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argp = argparse.ArgumentParser(description="Benchmark match_targets_to_drugs scaling")
+    argp.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000, 20000])
+    argp.add_argument("--top-k", type=int, default=100)
+    argp.add_argument(
+        "--legacy-limit", type=int, default=5000, help="Largest size to run the nested loop on"
+    )
+    args = argp.parse_args(argv)
+
+    print(f"{'targets':>8} {'pairs':>8} {'legacy s':>10} {'indexed s':>10} {'top-k s':>10}")
+    for size in args.sizes:
+        targets, drug_data = make_tables(size)
+        indexed = timed(lambda: match_targets_to_drugs(targets, drug_data))
+        top_k = timed(lambda: match_targets_to_drugs(targets, drug_data, top_k=args.top_k))
+        legacy = "-"
+        if size <= args.legacy_limit:
+            expected = legacy_match(targets, drug_data)
+            if match_targets_to_drugs(targets, drug_data) != expected:
+                raise SystemExit(f"Results differ from the nested loop at size {size}")
+            legacy = f"{timed(lambda: legacy_match(targets, drug_data)):.3f}"
+        print(f"{size:>8} {len(drug_data):>8} {legacy:>10} {indexed:>10.3f} {top_k:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
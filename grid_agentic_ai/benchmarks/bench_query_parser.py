@@ -0,0 +1,192 @@
+"""Throughput benchmark for ``QueryParserAgent.parse``.
+
+Parses a corpus of queries with the current parser, with and without the
+parse cache, and with the original per-call implementation
+(``legacy_parse``), and prints queries per second for each.  The run fails if
+the parser disagrees with ``legacy_parse`` on any query in a way that the
+``INTENDED_DIFFERENCES`` do not account for::
+
+    python -m grid_agentic_ai.benchmarks.bench_query_parser --size 50000
+    python -m grid_agentic_ai.benchmarks.bench_query_parser --corpus queries.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import itertools
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from grid_agentic_ai.agents import query_parser
+from grid_agentic_ai.agents.query_parser import QueryParserAgent, canonical_query
+
+TEMPLATES = [
+    "List drugs targeting {gene} in phase {phase} trials",
+    "Find diseases associated with {drug}",
+    "Describe gene {gene} expression in {species}",
+    "Show trials for {disease} disease phase {phase}",
+    "List genes with expression >= {level}",
+    "Which diseases is {drug} approved for?",
+    "Show trials for {drug} in Phase {phase}",
+    "List the diseases in Phase-{phase} for {drug}",
+    "Get drug {drug} indications",
+    "What targets are linked to {disease} disease",
+    "trials for {drug}",
+    "{gene} expression > {level} in {species} tissue",
+]
+
+VALUES = {
+    "gene": ["BRAF", "TP53", "EGFR", "KRAS", "ALK", "HER2"],
+    "drug": ["Imatinib", "Vemurafenib", "Rituximab", "Dasatinib", "Aspirin"],
+    "disease": ["Crohn's", "Alzheimer", "Parkinson", "celiac", "Graves"],
+    "phase": ["1", "2", "3", "4"],
+    "species": ["human", "mouse", "rat", "zebrafish", "dog"],
+    "level": ["1", "2.5", "10"],
+}
+
+
+def legacy_parse(query: str) -> Dict[str, Any]:
+    """The parser as it was before patterns were precompiled, for comparison."""
+    text = query.lower()
+    action = next((a for a in QueryParserAgent.ACTION_KEYWORDS if a in text), "unknown")
+    entity_type = None
+    entity = None
+    patterns = [
+        (r"in\s+phase[-\s]*\d+\s+for\s+([A-Za-z0-9\-]+)", "drug"),
+        (r"targeting\s+([A-Za-z0-9\-]+)", "target"),
+        (r"gene\s+([A-Za-z0-9\-]+)", "gene"),
+        (r"drug\s+([A-Za-z0-9\-]+)", "drug"),
+        (r"for\s+([A-Za-z0-9' \-]+\sdisease)", "disease"),
+        (r"disease\s+([A-Za-z0-9' \-]+)", "disease"),
+        (r"associated with\s+([A-Za-z0-9' \-]+)", "drug"),
+        (r"trials for\s+([A-Za-z0-9\-]+)", "drug"),
+        (r"is\s+([A-Za-z0-9\-]+)\s+approved", "drug"),
+        (r"for\s+([A-Za-z0-9\-]+)\s+in\s+phase", "drug"),
+    ]
+    for pat, etype in patterns:
+        m = re.search(pat, query, re.I)
+        if m:
+            entity = re.sub(r"\s+phase.*", "", m.group(1)).strip()
+            entity_type = etype
+            break
+    if entity_type is None:
+        for keyword in ("drug", "gene", "disease", "target"):
+            if keyword in text:
+                entity_type = keyword
+                break
+    if entity is None:
+        if re.search(r"phase|approved|trials?", text):
+            m = re.search(r"(?:for|is)\s+([A-Za-z0-9\-]+)", text)
+            if m:
+                entity = m.group(1)
+                if entity_type in {None, "disease"}:
+                    entity_type = "drug"
+    filters: Dict[str, Any] = {}
+    m = re.search(r"phase[-\s]*(\d+)", text)
+    if m:
+        filters["phase"] = m.group(1)
+    m = re.search(r"expression\s*[>=]+\s*(\d+(?:\.\d+)?)", text)
+    if m:
+        filters["expression_threshold"] = m.group(1)
+    m = re.search(r"\b(human|mouse|rat|zebrafish)\b", text)
+    if m:
+        filters["species"] = m.group(1)
+    return {"entity": entity, "entity_type": entity_type, "action": action, "filters": filters}
+
+
+def _strip_phase_suffix(query: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    if result["entity"]:
+        result["entity"] = re.sub(r"\s+phase.*", "", result["entity"], flags=re.I).strip()
+    return result
+
+
+# Deliberate behaviour changes since ``legacy_parse``, applied in order to its
+# result by ``expected_parse``.
+INTENDED_DIFFERENCES: List[Tuple[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]]] = [
+    (
+        "queries are parsed in their canonical_query form",
+        lambda query, result: legacy_parse(canonical_query(query)),
+    ),
+    ("a trailing 'phase ...' is stripped from the entity in any case", _strip_phase_suffix),
+]
+
+
+def expected_parse(query: str) -> Dict[str, Any]:
+    """Return ``legacy_parse(query)`` with the ``INTENDED_DIFFERENCES`` applied."""
+    result = legacy_parse(query)
+    for _, change in INTENDED_DIFFERENCES:
+        result = change(query, result)
+    return result
+
+
+def check_parser(parser: QueryParserAgent, corpus: List[str]) -> int:
+    """Exit if ``parser`` disagrees with ``expected_parse`` on any query.
+
+    Both the uncached and the cached parse are checked. Returns the number of
+    queries on which the intended differences change the legacy result.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [expected_parse(q) for q in corpus]
+        changed = sum(legacy_parse(q) != e for q, e in zip(corpus, expected))
+        for max_entries in (0, 1024):
+            query_parser.configure_parse_cache(max_entries)
+            mismatches = [q for q, e in zip(corpus, expected) if parser.parse(q) != e]
+            if mismatches:
+                raise SystemExit(
+                    f"Parsers disagree on {len(mismatches)} queries, e.g. {mismatches[0]!r}"
+                )
+    return changed
+
+
+def make_corpus(size: int, seed: int = 0) -> List[str]:
+    """Return ``size`` queries generated from ``TEMPLATES``."""
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(**{k: rng.choice(v) for k, v in VALUES.items()})
+        for _ in range(size)
+    ]
+
+
+def measure(parse: Callable[[str], Dict[str, Any]], corpus: List[str]) -> float:
+    """Return queries per second for ``parse`` over ``corpus``."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for query in corpus:
+            parse(query)
+        elapsed = time.perf_counter() - start
+    return len(corpus) / elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argp = argparse.ArgumentParser(description="Benchmark QueryParserAgent throughput")
+    argp.add_argument("--size", type=int, default=20000, help="Generated corpus size")
+    argp.add_argument("--corpus", help="File with one query per line instead of a generated corpus")
+    args = argp.parse_args(argv)
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as fh:
+            corpus = [line.rstrip("\n") for line in fh if line.strip()]
+    else:
+        corpus = make_corpus(args.size)
+
+    parser = QueryParserAgent()
+    changed = check_parser(parser, list(itertools.islice(corpus, 5000)))
+
+    legacy = measure(legacy_parse, corpus)
+    query_parser.configure_parse_cache(0)
+    uncached = measure(parser.parse, corpus)
+    query_parser.configure_parse_cache()
+    cached = measure(parser.parse, corpus)
+    print(f"queries:          {len(corpus)} ({len(set(corpus))} distinct)")
+    print(f"intended changes: {changed} of the checked queries differ from legacy_parse")
+    print(f"legacy parser:    {legacy:,.0f} queries/s")
+    print(f"uncached parse:   {uncached:,.0f} queries/s ({uncached / legacy:.1f}x)")
+    print(f"cached parse:     {cached:,.0f} queries/s ({cached / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
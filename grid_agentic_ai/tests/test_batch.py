@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import main
+
+
+@pytest.fixture
+def batch_file(tmp_path):
+    path = tmp_path / 'queries.jsonl'
+    path.write_text(
+        '{"id": "q1", "query": "Find diseases associated with Imatinib"}\n'
+        '"Describe gene TP53 expression in mouse"\n'
+        '\n'
+        '{"title": "no query"}\n'
+        'not json\n'
+        '{"id": "q6", "query": "Show trials for Crohn\'s disease phase 2"}\n'
+    )
+    return str(path)
+
+
+def fake_execute(query, resolve_any=False):
+    if 'Crohn' in query:
+        raise RuntimeError('boom')
+    return {'parsed': {'q': query}, 'normalized': None, 'retrieved': {'big': 1},
+            'matched': {}, 'summary': 'ok'}
+
+
+def run(batch_file, **kwargs):
+    out = io.StringIO()
+    count = main.run_batch(batch_file, out, **kwargs)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    return count, sorted(lines, key=lambda r: r['line'])
+
+
+def test_batch_writes_one_line_per_query(batch_file, monkeypatch):
+    monkeypatch.setattr(main, 'execute_query', fake_execute)
+    count, lines = run(batch_file, workers=2)
+    assert count == 5
+    assert [r['line'] for r in lines] == [0, 1, 3, 4, 5]
+    assert lines[0]['id'] == 'q1'
+    assert lines[0]['summary'] == 'ok'
+    assert 'retrieved' not in lines[0]
+    assert lines[1]['query'] == 'Describe gene TP53 expression in mouse'
+    assert 'No query text' in lines[2]['error']
+    assert 'Invalid JSON' in lines[3]['error']
+    assert lines[4]['error'] == 'RuntimeError: boom'
+
+
+def test_batch_resumes_from_offset(batch_file, monkeypatch):
+    monkeypatch.setattr(main, 'execute_query', fake_execute)
+    count, lines = run(batch_file, workers=1, offset=4)
+    assert count == 2
+    assert [r['line'] for r in lines] == [4, 5]
+
+
+def test_batch_resumes_from_partial_output(batch_file, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'execute_query', fake_execute)
+    output = tmp_path / 'results.ndjson'
+    # Lines 5 and 1 finished out of order; line 3 was cut short by a crash.
+    output.write_text('{"line": 5, "error": "x"}\n{"line": 1, "summary": "ok"}\n{"line": 3, "su')
+    assert main.completed_lines(str(output)) == {1, 5}
+
+    main.main(['--batch', batch_file, '--resume', '--output', str(output), '--workers', '2'])
+    written = output.read_text().splitlines()[3:]
+    assert sorted(json.loads(line)['line'] for line in written) == [0, 3, 4]
+    assert main.completed_lines(str(output)) == {0, 1, 3, 4, 5}
+
+
+def test_execute_query_fetches_intent_fields(monkeypatch):
+    calls = []
+
+    def fake_get_for_intent(parsed, entity_id):
+        calls.append((parsed['entity_type'], entity_id))
+        return {'data': {'drug': {'id': entity_id, 'indications': {'rows': [
+            {'disease': {'id': 'EFO_1', 'name': 'CML'}, 'phase': 2, 'status': 'Phase 2'},
+        ]}}}}
+
+    monkeypatch.setattr(
+        main, 'normalize_term', lambda t, q: {'input': q, 'resolved_id': 'CHEMBL941'}
+    )
+    monkeypatch.setattr(main, 'get_for_intent', fake_get_for_intent)
+    result = main.execute_query('Get drug Imatinib indications')
+    assert calls == [('drug', 'CHEMBL941')]
+    assert result['retrieved']['diseases'][0]['name'] == 'CML'
+
+
+def test_batch_rejects_bad_worker_count(batch_file):
+    with pytest.raises(ValueError):
+        main.run_batch(batch_file, io.StringIO(), workers=0)
@@ -0,0 +1,82 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import cache
+from grid_agentic_ai.agents.cache import ResponseCache
+
+
+def test_set_get_roundtrip(tmp_path):
+    c = ResponseCache(str(tmp_path / 'c.sqlite'))
+    key = ResponseCache.make_key('query { x }', {'id': 1})
+    assert c.get(key) is None
+    c.set(key, {'data': {'x': 1}})
+    assert c.get(key) == {'data': {'x': 1}}
+    stats = c.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+
+def test_cache_persists_between_instances(tmp_path):
+    path = str(tmp_path / 'c.sqlite')
+    c = ResponseCache(path)
+    c.set('k', [1, 2, 3])
+    c.close()
+    assert ResponseCache(path).get('k') == [1, 2, 3]
+
+
+def test_make_key_ignores_whitespace_and_variable_order():
+    a = ResponseCache.make_key('query {\n  x\n}', {'a': 1, 'b': 2})
+    b = ResponseCache.make_key('query { x }', {'b': 2, 'a': 1})
+    assert a == b
+    assert a != ResponseCache.make_key('query { x }', {'a': 2, 'b': 2})
+
+
+def test_ttl_expiry(monkeypatch):
+    now = {'t': 1000.0}
+    monkeypatch.setattr(cache.time, 'time', lambda: now['t'])
+    c = ResponseCache(':memory:', ttl=10)
+    c.set('k', 'v')
+    now['t'] += 5
+    assert c.get('k') == 'v'
+    now['t'] += 10
+    assert c.get('k') is None
+    assert c.stats()['expired'] == 1
+    assert c.stats()['entries'] == 0
+
+
+def test_lru_eviction():
+    c = ResponseCache(':memory:', max_entries=2)
+    c.set('a', 1)
+    c.set('b', 2)
+    assert c.get('a') == 1
+    c.set('c', 3)
+    assert c.get('b') is None
+    assert c.get('a') == 1
+    assert c.get('c') == 3
+    assert c.stats()['evictions'] == 1
+
+
+def test_memory_lru_eviction_and_stats():
+    c = cache.LRUCache(max_entries=2)
+    c.set(('gene', 'a'), 1)
+    c.set(('gene', 'b'), 2)
+    assert c.get(('gene', 'a')) == 1
+    c.set(('gene', 'c'), 3)
+    assert c.get(('gene', 'b')) is None
+    assert len(c) == 2
+    assert c.stats() == {'hits': 1, 'misses': 1, 'expired': 0, 'evictions': 1, 'entries': 2}
+
+
+def test_memory_per_entry_ttl(monkeypatch):
+    now = {'t': 0.0}
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now['t'])
+    c = cache.LRUCache(ttl=100)
+    c.set('long', 1)
+    c.set('short', 2, ttl=5)
+    now['t'] = 10
+    assert c.get('short') is None
+    assert c.get('long') == 1
+    assert c.stats()['expired'] == 1
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+np = pytest.importorskip('numpy')
+
+from grid_agentic_ai.agents.columnar import ExpressionColumns
+from grid_agentic_ai.agents.matcher import MatcherAgent
+
+
+def make_records(n, id_key, seed=0):
+    rng = random.Random(seed)
+    values = [None, float('nan'), 0, 2, '3.5', 5.0, 7, 10.25]
+    return [
+        {
+            id_key: f'T{i}',
+            'tissue': rng.choice(['liver', 'brain', None]),
+            'expression': rng.choice(values),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'expression_threshold': 5},
+    {'tissue': 'liver'},
+    {'tissue': 'brain', 'expression_threshold': '2.5'},
+    {'tissue': 'lung', 'expression_threshold': 0},
+])
+def test_expression_data_matches_dict_path(filters):
+    agent = MatcherAgent()
+    parsed = {'action': 'describe', 'entity_type': 'target', 'filters': filters}
+    records = make_records(500, 'target')
+    expected = agent.match(parsed, {'expression_data': records})
+    table = ExpressionColumns.from_records(records)
+    assert agent.match(parsed, {'expression_data': table}) == expected
+
+
+@pytest.mark.parametrize(
+    'filters', [{}, {'expression_threshold': 5}, {'expression_threshold': '0'}]
+)
+def test_targets_match_dict_path(filters):
+    agent = MatcherAgent()
+    parsed = {'action': 'describe', 'entity_type': 'gene', 'filters': filters}
+    records = make_records(500, 'id', seed=1)
+    expected = agent.match(parsed, {'targets': records})
+    table = ExpressionColumns.from_records(records, id_key='id')
+    assert agent.match(parsed, {'targets': table}) == expected
+
+
+def test_targets_require_id_keyed_columns():
+    agent = MatcherAgent()
+    parsed = {'action': 'describe', 'entity_type': 'gene', 'filters': {}}
+    table = ExpressionColumns.from_records([{'id': 'ENSG1', 'expression': 3.0}])
+    with pytest.raises(ValueError, match="id_key='id'"):
+        agent.match(parsed, {'targets': table})
+
+
+def test_columns_from_arrays():
+    table = ExpressionColumns(
+        np.array(['T1', 'T2', 'T3']),
+        np.array([1.0, np.nan, 6.0]),
+        np.array(['liver', 'liver', 'brain']),
+    )
+    assert len(table) == 3
+    assert table.rows(table.select(threshold=0)) == [
+        {'target': 'T1', 'expression': 1.0, 'tissue': 'liver'},
+        {'target': 'T3', 'expression': 6.0, 'tissue': 'brain'},
+    ]
+    assert table.select(tissue='liver').tolist() == [0]
+    assert list(table)[1] == {'target': 'T2', 'expression': None, 'tissue': 'liver'}
+    with pytest.raises(ValueError):
+        ExpressionColumns(['T1'], [1.0, 2.0])
@@ -0,0 +1,117 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import normalizer
+from grid_agentic_ai.agents.fuzzy import FuzzyIndex, FuzzyMatch, bounded_levenshtein
+from grid_agentic_ai.agents.synonym_index import build_synonym_index
+
+NAMES = [
+    ('drug', 'imatinib'),
+    ('drug', 'dasatinib'),
+    ('drug', 'nilotinib'),
+    ('disease', "crohn's disease"),
+    ('disease', 'crohn disease'),
+    ('gene', 'tp53'),
+    ('gene', 'tp63'),
+]
+
+
+def test_bounded_levenshtein():
+    assert bounded_levenshtein('imatinb', 'imatinib', 2) == 1
+    assert bounded_levenshtein('kitten', 'sitting', 3) == 3
+    assert bounded_levenshtein('kitten', 'sitting', 2) is None
+    assert bounded_levenshtein('abc', 'abcdef', 2) is None
+    assert bounded_levenshtein('', 'ab', 2) == 2
+
+
+def test_search_ranks_and_scores():
+    index = FuzzyIndex(NAMES)
+    assert index.search('Imatinb') == [FuzzyMatch('imatinib', 'drug', 1, 0.875)]
+    matches = index.search('crohns disease', term_type='disease')
+    assert [m.term for m in matches] == ["crohn's disease", 'crohn disease']
+    assert index.search('tp53', max_distance=1) == [
+        FuzzyMatch('tp53', 'gene', 0, 1.0),
+        FuzzyMatch('tp63', 'gene', 1, 0.75),
+    ]
+    assert index.search('imatinib', term_type='gene') == []
+    assert index.search('') == []
+
+
+def test_gram_filter_matches_brute_force():
+    rng = random.Random(7)
+    alphabet = 'abcde'
+    words = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 9))) for _ in range(400)}
+    index = FuzzyIndex(('x', w) for w in words)
+    for _ in range(50):
+        query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+        expected = sorted(w for w in words if bounded_levenshtein(query, w, 2) is not None)
+        got = sorted(m.term for m in index.search(query, max_distance=2, limit=len(words)))
+        assert got == expected
+
+
+def not_found(term_type, query):
+    return {'input': query, 'resolved_id': None, 'error': normalizer.NOT_FOUND}
+
+
+def test_normalize_term_corrects_typos(tmp_path, monkeypatch):
+    path = str(tmp_path / 'syn.idx')
+    build_synonym_index([
+        ('drug', 'imatinib', 'CHEMBL941', 'IMATINIB', ''),
+        ('drug', 'dasatinib', 'CHEMBL1421', 'DASATINIB', ''),
+        ('gene', 'tp53', 'TP53', 'TP53', '7157'),
+        ('gene', 'tp63', 'TP63', 'TP63', '8626'),
+    ], path)
+    monkeypatch.setattr(normalizer, '_resolve_term', not_found)
+    monkeypatch.setattr(normalizer, '_resolve_genes_batch', lambda genes: {})
+    normalizer.use_synonym_index(path)
+    try:
+        normalizer.use_fuzzy_index(min_confidence=0.8)
+        res = normalizer.normalize_term('drug', 'imatinb')
+        ambiguous = normalizer.normalize_term('gene', 'tp73')
+        bulk = normalizer.normalize_terms([('drug', 'imatinb'), ('gene', 'tp73')])
+    finally:
+        normalizer.use_fuzzy_index(enabled=False)
+        normalizer.use_synonym_index(None)
+    assert res == {
+        'input': 'imatinb',
+        'resolved_id': 'CHEMBL941',
+        'label': 'IMATINIB',
+        'source': 'ChEMBL (local index)',
+        'matched': 'imatinib',
+        'confidence': 0.875,
+    }
+    assert ambiguous['resolved_id'] is None
+    assert bulk == [res, ambiguous]
+
+
+def test_correction_only_applies_to_unresolved_terms(monkeypatch):
+    calls = []
+
+    def resolve(term_type, query):
+        calls.append(query)
+        if query.lower() in {'brca2', 'imatinib'}:
+            return {'input': query, 'resolved_id': query.upper(), 'source': 'remote'}
+        return not_found(term_type, query)
+
+    monkeypatch.setattr(normalizer, '_resolve_term', resolve)
+    monkeypatch.setattr(normalizer, '_resolve_genes_batch', lambda genes: {})
+    monkeypatch.setattr(normalizer, '_memory_cache', normalizer.LRUCache(max_entries=64))
+    normalizer.use_fuzzy_index(FuzzyIndex([('gene', 'BRCA1'), ('drug', 'imatinib')]))
+    try:
+        gene = normalizer.normalize_term('gene', 'BRCA2')
+        typo = normalizer.normalize_term('drug', 'imatinb')
+        bulk = normalizer.normalize_terms([('gene', 'BRCA2'), ('drug', 'imatinb')])
+        normalizer.use_fuzzy_index(FuzzyIndex([('gene', 'BRCA1')]), min_confidence=0.5)
+        short = normalizer.normalize_term('gene', 'BRCA3')
+    finally:
+        normalizer.use_fuzzy_index(enabled=False)
+
+    assert gene == {'input': 'BRCA2', 'resolved_id': 'BRCA2', 'source': 'remote'}
+    assert typo['resolved_id'] == 'IMATINIB' and typo['matched'] == 'imatinib'
+    assert typo['input'] == 'imatinb'
+    assert bulk == [gene, typo]
+    assert short['resolved_id'] is None and 'matched' not in short
+    assert calls == ['BRCA2', 'imatinb', 'imatinib', 'BRCA3']
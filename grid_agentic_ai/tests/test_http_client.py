@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import http_client
+from grid_agentic_ai.agents.http_client import HTTPClient
+
+
+class RecordingSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(('GET', url, kwargs))
+        return 'response'
+
+    def post(self, url, **kwargs):
+        self.calls.append(('POST', url, kwargs))
+        return 'response'
+
+    def close(self):
+        pass
+
+
+def test_default_and_per_host_timeouts():
+    client = HTTPClient(timeout=7, hosts={'mygene.info': {'timeout': 3}})
+    assert client.timeout_for('https://mygene.info/v3/query?q=x') == 3
+    assert client.timeout_for('https://example.org/') == 7
+
+
+def test_requests_reuse_one_session():
+    session = RecordingSession()
+    client = HTTPClient(timeout=5, session=session)
+    client.get('https://example.org/a', params={'q': 1})
+    client.post('https://example.org/b', json={}, timeout=1)
+    assert client.session is session
+    assert session.calls == [
+        ('GET', 'https://example.org/a', {'params': {'q': 1}, 'timeout': 5}),
+        ('POST', 'https://example.org/b', {'json': {}, 'timeout': 1}),
+    ]
+
+
+def test_get_client_is_shared(monkeypatch):
+    monkeypatch.setattr(http_client, '_client', None)
+    assert http_client.get_client() is http_client.get_client()
+    configured = http_client.configure_client(timeout=2, session=RecordingSession())
+    assert http_client.get_client() is configured
+    assert configured.timeout == 2
+
+
+def test_session_mounts_host_adapters():
+    if http_client.requests is None or http_client.HTTPAdapter is None:
+        pytest.skip('requests not installed')
+    client = HTTPClient(pool_maxsize=4, hosts={'mygene.info': {'pool_maxsize': 2}})
+    adapter = client.session.get_adapter('https://mygene.info/v3/query')
+    assert adapter._pool_maxsize == 2
+    assert client.session.get_adapter('https://example.org/')._pool_maxsize == 4
+    client.close()
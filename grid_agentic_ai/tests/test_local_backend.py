@@ -0,0 +1,137 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import local_backend
+from grid_agentic_ai.agents import retriever_opentargets as retriever
+from grid_agentic_ai.agents.local_backend import LocalOpenTargetsStore
+
+
+def write_dataset(root, name, records):
+    folder = root / name
+    folder.mkdir()
+    with open(folder / 'part-00000.json', 'w') as fh:
+        for rec in records:
+            fh.write(json.dumps(rec) + '\n')
+
+
+@pytest.fixture
+def release(tmp_path):
+    root = tmp_path / 'release'
+    root.mkdir()
+    write_dataset(root, 'targets', [
+        {'id': 'ENSG1', 'approvedSymbol': 'BRAF'},
+        {'id': 'ENSG2', 'approvedSymbol': 'KRAS'},
+    ])
+    write_dataset(root, 'diseases', [
+        {'id': 'EFO_1', 'name': 'melanoma'},
+        {'id': 'EFO_2', 'name': 'CML'},
+    ])
+    write_dataset(root, 'associationByOverallDirect', [
+        {'diseaseId': 'EFO_1', 'targetId': 'ENSG2', 'score': 0.4},
+        {'diseaseId': 'EFO_1', 'targetId': 'ENSG1', 'score': 0.9},
+    ])
+    write_dataset(root, 'molecule', [{'id': 'CHEMBL941', 'name': 'IMATINIB'}])
+    write_dataset(root, 'indication', [{
+        'id': 'CHEMBL941',
+        'indications': [
+            {'disease': 'EFO_2', 'maxPhaseForIndication': 4.0},
+            {'disease': 'EFO_1', 'maxPhaseForIndication': 2.0},
+        ],
+    }])
+    return root
+
+
+def test_build_and_query_targets(release, tmp_path):
+    store = LocalOpenTargetsStore.build(str(release), str(tmp_path / 'ot.sqlite'))
+    res = store.get_targets_for_disease('EFO_1')
+    assert res == {
+        'data': {
+            'disease': {
+                'id': 'EFO_1',
+                'name': 'melanoma',
+                'associatedTargets': {
+                    'rows': [
+                        {'target': {'id': 'ENSG1', 'approvedSymbol': 'BRAF'}, 'score': 0.9},
+                        {'target': {'id': 'ENSG2', 'approvedSymbol': 'KRAS'}, 'score': 0.4},
+                    ]
+                },
+            }
+        }
+    }
+    assert store.get_targets_for_disease('EFO_404') == {'data': {'disease': None}}
+    rows = list(store.iter_targets_for_disease('EFO_1', min_score=0.5))
+    assert [r['target']['id'] for r in rows] == ['ENSG1']
+
+
+def test_build_and_query_indications(release, tmp_path):
+    store = LocalOpenTargetsStore.build(str(release), str(tmp_path / 'ot.sqlite'))
+    drug = store.get_diseases_for_drug('CHEMBL941')['data']['drug']
+    assert drug['name'] == 'IMATINIB'
+    assert drug['indications']['rows'] == [
+        {'disease': {'id': 'EFO_2', 'name': 'CML'}, 'phase': 4.0, 'status': None},
+        {'disease': {'id': 'EFO_1', 'name': 'melanoma'}, 'phase': 2.0, 'status': None},
+    ]
+    assert store.get_diseases_for_drug('CHEMBL1') == {'data': {'drug': None}}
+
+
+def test_rebuild_replaces_existing_store(release, tmp_path):
+    path = str(tmp_path / 'ot.sqlite')
+    LocalOpenTargetsStore.build(str(release), path).close()
+    store = LocalOpenTargetsStore.build(str(release), path)
+    rows = store.get_targets_for_disease('EFO_1')['data']['disease']['associatedTargets']['rows']
+    assert len(rows) == 2
+
+
+def test_serving_store_is_read_only_and_must_exist(release, tmp_path):
+    missing = tmp_path / 'typo.sqlite'
+    with pytest.raises(FileNotFoundError):
+        LocalOpenTargetsStore(str(missing))
+    assert not missing.exists()
+
+    path = str(tmp_path / 'ot.sqlite')
+    LocalOpenTargetsStore.build(str(release), path).close()
+    store = LocalOpenTargetsStore(path)
+    with pytest.raises(local_backend.sqlite3.OperationalError):
+        store.ingest_targets([{'id': 'ENSG3', 'approvedSymbol': 'EGFR'}])
+    assert store.get_targets_for_disease('EFO_1')['data']['disease']['name'] == 'melanoma'
+    store.close()
+
+
+def test_parquet_release_files(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    folder = tmp_path / 'targets'
+    folder.mkdir()
+    table = pa.table({'id': ['ENSG1'], 'approvedSymbol': ['BRAF']})
+    pq.write_table(table, folder / 'part-0.parquet')
+    assert list(local_backend.iter_release_records(str(folder))) == [
+        {'id': 'ENSG1', 'approvedSymbol': 'BRAF'}
+    ]
+
+
+def test_retriever_uses_local_backend(release, tmp_path, monkeypatch):
+    path = str(tmp_path / 'ot.sqlite')
+    LocalOpenTargetsStore.build(str(release), path).close()
+
+    def no_network(*args, **kwargs):
+        raise AssertionError('network should not be used')
+
+    monkeypatch.setattr(retriever, '_post', no_network)
+    retriever.use_local_backend(path)
+    try:
+        targets = retriever.get_targets_for_disease('EFO_1')
+        drug = retriever.get_diseases_for_drug('CHEMBL941')
+        bulk = retriever.get_diseases_for_drugs(['CHEMBL941', 'CHEMBL1'])
+        streamed = list(retriever.iter_targets_for_disease('EFO_1', top_n=1))
+    finally:
+        retriever.use_local_backend(None)
+    assert targets['data']['disease']['name'] == 'melanoma'
+    assert drug['data']['drug']['id'] == 'CHEMBL941'
+    assert bulk['CHEMBL941'] == drug
+    assert bulk['CHEMBL1'] == {'data': {'drug': None}}
+    assert [r['target']['approvedSymbol'] for r in streamed] == ['BRAF']
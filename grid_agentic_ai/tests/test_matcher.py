@@ -28,6 +28,32 @@ def test_match_targets_empty():
     assert matcher.match_targets_to_drugs([{"id": "T1", "approvedSymbol": "A"}], []) == []
 
 
+def test_match_targets_same_as_nested_loop():
+    from grid_agentic_ai.benchmarks.bench_matcher import legacy_match, make_tables
+
+    targets, drugs = make_tables(300, seed=3)
+    for target in targets[::7]:
+        target["score"] = 0.5
+    expected = legacy_match(targets, drugs)
+    assert matcher.match_targets_to_drugs(targets, drugs) == expected
+    assert matcher.match_targets_to_drugs(iter(targets), iter(drugs), top_k=25) == expected[:25]
+    assert matcher.match_targets_to_drugs(targets, drugs, top_k=0) == []
+
+
+def test_match_targets_streams_targets():
+    def rows():
+        yield {"id": "T1", "approvedSymbol": "A", "score": 0.2}
+        yield {"id": "T2", "approvedSymbol": "B", "score": 0.7}
+
+    drugs = [
+        {"targetId": "T1", "drugName": "X"},
+        {"targetId": "T1", "drugName": "Y", "status": "Approved"},
+    ]
+    assert matcher.match_targets_to_drugs(rows(), drugs, top_k=1) == [
+        {"target": "A", "drug": "X", "status": None, "score": 0.2}
+    ]
+
+
 def test_matcher_list_diseases_by_phase():
     agent = MatcherAgent()
     parsed = {"action": "list", "entity_type": "disease", "filters": {"phase": "2"}}
@@ -17,9 +17,21 @@ if 'pubchempy' not in sys.modules:
     pcp_mod.get_compounds = lambda *a, **k: []
     sys.modules['pubchempy'] = pcp_mod
 
-import requests
+from grid_agentic_ai.agents import cache
+from grid_agentic_ai.agents import http_client
 from grid_agentic_ai.agents import normalizer
 
+class FakeSession:
+    def __init__(self, get=None, post=None):
+        self.get = get
+        self.post = post
+
+
+def use_session(monkeypatch, get, post=None):
+    client = http_client.HTTPClient(session=FakeSession(get=get, post=post))
+    monkeypatch.setattr(http_client, '_client', client)
+
+
 class FakeResponse:
     def __init__(self, json_data, status_code=200):
         self._json = json_data
@@ -40,9 +52,9 @@ def test_normalize_drug(monkeypatch):
 
 
 def test_normalize_gene(monkeypatch):
-    def fake_get(url):
+    def fake_get(url, timeout=None):
         return FakeResponse({'hits': [{'_id': '1', 'symbol': 'TEST'}]})
-    monkeypatch.setattr(requests, 'get', fake_get)
+    use_session(monkeypatch, fake_get)
     reload(normalizer)
     res = normalizer.normalize_term('gene', 'test')
     assert res['resolved_id'] == 'TEST'
@@ -50,9 +62,9 @@ def test_normalize_gene(monkeypatch):
 
 
 def test_normalize_disease(monkeypatch):
-    def fake_get(url):
+    def fake_get(url, timeout=None):
         return FakeResponse({'response': {'numFound': 1, 'docs': [{'obo_id': 'EFO:1', 'label': 'Disease'}]}})
-    monkeypatch.setattr(requests, 'get', fake_get)
+    use_session(monkeypatch, fake_get)
     reload(normalizer)
     res = normalizer.normalize_term('disease', 'dis')
     assert res['resolved_id'] == 'EFO:1'
@@ -63,3 +75,179 @@ def test_unknown_type():
     reload(normalizer)
     res = normalizer.normalize_term('foo', 'bar')
     assert res['resolved_id'] is None
+
+
+def test_repeat_lookups_are_cached(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return FakeResponse({'hits': [{'_id': '7157', 'symbol': 'TP53'}]})
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    first = normalizer.normalize_term('gene', 'TP53')
+    second = normalizer.normalize_term('gene', ' tp53 ')
+    assert len(calls) == 1
+    assert first['resolved_id'] == second['resolved_id'] == 'TP53'
+    assert second['input'] == ' tp53 '
+    stats = normalizer.cache_stats()['memory']
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_failures_use_negative_ttl(monkeypatch):
+    calls = []
+    clock = {'t': 0.0}
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        return FakeResponse({'hits': []})
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: clock['t'])
+    assert normalizer.normalize_term('gene', 'nothing')['resolved_id'] is None
+    assert normalizer.normalize_term('gene', 'nothing')['resolved_id'] is None
+    assert len(calls) == 1
+    clock['t'] += normalizer.NEGATIVE_TTL + 1
+    normalizer.normalize_term('gene', 'nothing')
+    assert len(calls) == 2
+
+
+def test_lookup_errors_are_not_cached(monkeypatch, tmp_path):
+    responses = [FakeResponse({}, status_code=503), FakeResponse({'hits': [{'symbol': 'TP53'}]})]
+
+    def fake_get(url, timeout=None):
+        return responses.pop(0)
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    monkeypatch.setattr(normalizer, '_request_with_retry', lambda func, host='': func())
+    normalizer.configure_cache(str(tmp_path / 'norm.sqlite'))
+    try:
+        failed = normalizer.normalize_term('gene', 'TP53')
+        res = normalizer.normalize_term('gene', 'TP53')
+    finally:
+        normalizer.configure_cache()
+    assert failed['resolved_id'] is None
+    assert failed['error'] == normalizer.LOOKUP_FAILED
+    assert res['resolved_id'] == 'TP53'
+
+
+def test_disk_tier_survives_memory_reset(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        docs = [{'obo_id': 'EFO:2', 'label': 'D'}]
+        return FakeResponse({'response': {'numFound': 1, 'docs': docs}})
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    path = str(tmp_path / 'norm.sqlite')
+    normalizer.configure_cache(path)
+    try:
+        normalizer.normalize_term('disease', 'asthma')
+        normalizer.configure_cache(path)
+        res = normalizer.normalize_term('disease', 'Asthma')
+        stats = normalizer.cache_stats()
+    finally:
+        normalizer.configure_cache()
+    assert len(calls) == 1
+    assert res['resolved_id'] == 'EFO:2'
+    assert stats['disk']['hits'] == 1
+
+
+def test_normalize_terms_batches_genes(monkeypatch):
+    posts = []
+
+    def fake_post(url, data=None, timeout=None):
+        posts.append(data)
+        assert url == normalizer.MYGENE_BATCH_URL
+        return FakeResponse([
+            {'query': 'BRAF', '_id': '673', 'symbol': 'BRAF'},
+            {'query': 'p53', '_id': '7157', 'symbol': 'TP53'},
+            {'query': 'p53', '_id': '9999', 'symbol': 'OTHER'},
+            {'query': 'nogene', 'notfound': True},
+        ])
+
+    def fake_get(url, timeout=None):
+        assert 'ebi.ac.uk' in url
+        docs = [{'obo_id': 'EFO:9', 'label': 'Asthma'}]
+        return FakeResponse({'response': {'numFound': 1, 'docs': docs}})
+
+    use_session(monkeypatch, fake_get, fake_post)
+    reload(normalizer)
+    items = [
+        ('gene', 'BRAF'),
+        ('disease', 'asthma'),
+        ('gene', 'p53'),
+        ('gene', 'nogene'),
+        ('gene', 'braf'),
+    ]
+    res = normalizer.normalize_terms(items)
+
+    assert len(posts) == 1
+    assert posts[0]['q'] == 'BRAF,p53,nogene'
+    assert [r['input'] for r in res] == ['BRAF', 'asthma', 'p53', 'nogene', 'braf']
+    assert [r['resolved_id'] for r in res] == ['BRAF', 'EFO:9', 'TP53', None, 'BRAF']
+    assert res[2]['entrez_id'] == '7157'
+    assert normalizer.normalize_term('gene', 'p53')['resolved_id'] == 'TP53'
+
+
+def test_normalize_terms_falls_back_when_batch_fails(monkeypatch):
+    def fake_post(url, data=None, timeout=None):
+        return FakeResponse({}, status_code=500)
+
+    def fake_get(url, timeout=None):
+        return FakeResponse({'hits': [{'_id': '1', 'symbol': 'EGFR'}]})
+
+    use_session(monkeypatch, fake_get, fake_post)
+    reload(normalizer)
+    res = normalizer.normalize_terms([('gene', 'egfr'), ('foo', 'bar')])
+    assert res[0]['resolved_id'] == 'EGFR'
+    assert res[1]['resolved_id'] is None
+
+
+def test_normalize_any_prefers_exact_hit(monkeypatch):
+    def fake_get(url, timeout=None):
+        if 'mygene' in url:
+            return FakeResponse({'hits': [{'_id': '673', 'symbol': 'BRAF'}]})
+        docs = [{'obo_id': 'EFO:1', 'label': 'BRAF-mutant melanoma'}]
+        return FakeResponse({'response': {'numFound': 1, 'docs': docs}})
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    res = normalizer.normalize_any('braf', ['disease', 'drug', 'gene'])
+    assert res['type'] == 'gene'
+    assert res['resolved_id'] == 'BRAF'
+    assert res['input'] == 'braf'
+
+
+def test_normalize_any_gives_up_at_deadline(monkeypatch):
+    import threading
+    release = threading.Event()
+
+    def fake_get(url, timeout=None):
+        if 'mygene' in url:
+            release.wait(5)
+            return FakeResponse({'hits': [{'_id': '1', 'symbol': 'SLOW'}]})
+        docs = [{'obo_id': 'EFO:2', 'label': 'Slow fever'}]
+        return FakeResponse({'response': {'numFound': 1, 'docs': docs}})
+
+    use_session(monkeypatch, fake_get)
+    reload(normalizer)
+    try:
+        res = normalizer.normalize_any('slow', ['gene', 'disease'], timeout=0.2)
+    finally:
+        release.set()
+    assert res['type'] == 'disease'
+    assert res['resolved_id'] == 'EFO:2'
+
+
+def test_normalize_any_reports_failure(monkeypatch):
+    use_session(monkeypatch, lambda url, timeout=None: FakeResponse({}, status_code=404))
+    reload(normalizer)
+    res = normalizer.normalize_any('nothing', ['gene', 'disease'])
+    assert res['resolved_id'] is None
+    assert 'type' not in res
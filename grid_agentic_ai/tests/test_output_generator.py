@@ -1,7 +1,10 @@
+import json
 import sys
 import os
 import types
 
+import pytest
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from grid_agentic_ai.agents import output_generator
@@ -82,3 +85,133 @@ def test_plot_network_success(tmp_path, monkeypatch):
     agent.plot_network(['A', 'B'], [('A', 'B')], str(out_file))
     assert out_file.exists()
 
+
+def test_to_csv_streams_generator_with_fields(tmp_path):
+    agent = OutputGeneratorAgent()
+    rows = ({'a': i, 'b': i * 2, 'c': 'x'} for i in range(3))
+    out = tmp_path / 'out.csv'
+    assert agent.to_csv(rows, str(out), fields=['b', 'a']) == 3
+    assert out.read_text().splitlines() == ['b,a', '0,0', '2,1', '4,2']
+
+
+def test_to_csv_header_from_first_row(tmp_path):
+    agent = OutputGeneratorAgent()
+    out = tmp_path / 'out.csv'
+    with pytest.warns(UserWarning, match='c'):
+        agent.to_csv(iter([{'a': 1, 'b': 2}, {'a': 3, 'c': 5}]), str(out))
+    assert out.read_text().splitlines() == ['a,b', '1,2', '3,']
+    assert agent.to_csv(iter([]), str(out)) == 0
+    assert out.read_text() == ''
+    agent.to_csv({'x': 1}, str(out))
+    assert out.read_text().splitlines() == ['key,value', 'x,1']
+
+
+def test_to_csv_record_header_and_dropped_keys(tmp_path):
+    from grid_agentic_ai.agents.records import Indication
+
+    agent = OutputGeneratorAgent()
+    out = tmp_path / 'out.csv'
+    rows = [Indication('E1', 'A', 4.0, None), Indication('E2', 'B', 2.0, 'Recruiting')]
+    assert agent.to_csv(rows, str(out)) == 2
+    assert out.read_text().splitlines() == [
+        'id,name,phase,status', 'E1,A,4.0,', 'E2,B,2.0,Recruiting'
+    ]
+    with pytest.warns(UserWarning, match='status'):
+        agent.to_csv([{'a': 1}, {'a': 2, 'status': 'x'}], str(out))
+    assert out.read_text().splitlines() == ['a', '1', '2']
+
+
+def test_to_ndjson(tmp_path):
+    from grid_agentic_ai.agents.records import TargetAssociation
+
+    agent = OutputGeneratorAgent()
+    out = tmp_path / 'out.ndjson'
+    rows = (TargetAssociation(f'ENSG{i}', f'G{i}', i / 2) for i in range(3))
+    assert agent.to_ndjson(rows, str(out)) == 3
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert lines[1] == {'id': 'ENSG1', 'approvedSymbol': 'G1', 'score': 0.5}
+    assert agent.to_ndjson({'x': 1}, str(out)) == 1
+    assert agent.to_ndjson(None, str(out)) == 0
+
+
+def _match_rows(n):
+    phases = ['Phase 1', 'Phase 2', 4]
+    return [
+        {'target': f'GENE{i % 5}', 'drug': f'DRUG{i}', 'phase': phases[i % 3], 'score': i / n}
+        for i in range(n)
+    ]
+
+
+def test_to_parquet_roundtrip(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    agent = OutputGeneratorAgent()
+    rows = _match_rows(50)
+    out = tmp_path / 'out.parquet'
+    assert agent.to_parquet(iter(rows), str(out), batch_size=16) == 50
+    table = pq.read_table(str(out))
+    assert pa.types.is_dictionary(table.schema.field('target').type)
+    assert pa.types.is_dictionary(table.schema.field('phase').type)
+    assert table.schema.field('drug').type == pa.string()
+    back = table.to_pylist()
+    assert back[2] == {'target': 'GENE2', 'drug': 'DRUG2', 'phase': '4', 'score': 0.04}
+    assert [r['target'] for r in back] == [r['target'] for r in rows]
+
+    assert agent.to_parquet(rows, str(out), compression=None, dictionary=[]) == 50
+    assert pq.read_table(str(out)).schema.field('target').type == pa.string()
+
+
+def test_to_arrow_shares_dictionaries_across_batches(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    from pyarrow import feather
+    from grid_agentic_ai.agents.records import Indication
+
+    agent = OutputGeneratorAgent()
+    rows = [
+        Indication(f'EFO_{i}', f'D{i}', i % 4, 'Recruiting' if i % 2 else None)
+        for i in range(40)
+    ]
+    out = tmp_path / 'out.arrow'
+    assert agent.to_arrow(rows, str(out), compression='zstd', batch_size=7) == 40
+    table = feather.read_table(str(out))
+    assert pa.types.is_dictionary(table.schema.field('status').type)
+    assert table.to_pylist() == [{**r.to_dict(), 'status': r.status} for r in rows]
+
+
+def test_columnar_empty_and_missing_pyarrow(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    agent = OutputGeneratorAgent()
+    out = tmp_path / 'out.parquet'
+    assert agent.to_parquet([], str(out)) == 0
+    assert not out.exists()
+    monkeypatch.setattr(output_generator, 'pq', None)
+    with pytest.raises(RuntimeError):
+        agent.to_parquet(_match_rows(2), str(out))
+
+
+def test_columnar_type_drift_across_batches(tmp_path):
+    pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    agent = OutputGeneratorAgent()
+    out = tmp_path / 'out.parquet'
+    with pytest.raises(ValueError, match="'x'"):
+        agent.to_parquet([{'x': 1}, {'x': 2}, {'x': 2.5}], str(out), batch_size=2)
+    with pytest.raises(ValueError, match="'x'"):
+        agent.to_parquet([{'x': 1.5}, {'x': 2.0}, {'x': 'n/a'}], str(out), batch_size=2)
+
+    rows = [{'x': 1.5, 'y': 'a'}, {'x': 2.0, 'y': 'b'}, {'x': 3, 'y': 4}, {'x': None, 'y': None}]
+    assert agent.to_parquet(rows, str(out), batch_size=2, dictionary=[]) == 4
+    assert pq.read_table(str(out)).to_pylist() == [
+        {'x': 1.5, 'y': 'a'}, {'x': 2.0, 'y': 'b'}, {'x': 3.0, 'y': '4'}, {'x': None, 'y': None}
+    ]
+
+
+def test_to_arrow_dictionary_empty_in_first_batch(tmp_path):
+    pytest.importorskip('pyarrow')
+    from pyarrow import feather
+
+    agent = OutputGeneratorAgent()
+    rows = [{'status': None if i < 5 else 'ok'} for i in range(10)]
+    out = tmp_path / 'out.arrow'
+    assert agent.to_arrow(rows, str(out), batch_size=3) == 10
+    assert feather.read_table(str(out)).to_pylist() == rows
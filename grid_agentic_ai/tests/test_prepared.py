@@ -0,0 +1,89 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents.matcher import MatcherAgent
+from grid_agentic_ai.agents.prepared import PreparedData
+
+
+def make_retrieval(n=400, seed=0):
+    rng = random.Random(seed)
+    phases = ['Phase 1', 'phase 2 ongoing', 'PHASE 3', 2, '4', 'Approved']
+    values = [None, float('nan'), 0, 1.5, '2', 5, 7.25, 12]
+    return {
+        'diseases': [
+            {'name': f'D{i}', rng.choice(['status', 'phase']): rng.choice(phases)} for i in range(n)
+        ],
+        'trials': [
+            {
+                'nct': str(i),
+                'drug': rng.choice(['DrugA', 'DrugB', None]),
+                'phase': rng.choice(phases),
+            }
+            for i in range(n)
+        ],
+        'targets': [
+            {
+                'id': f'T{i}',
+                'snps': rng.choice([[], ['rs1'], None]),
+                'expression': rng.choice(values),
+            }
+            for i in range(n)
+        ],
+        'expression_data': [
+            {
+                'target': f'T{i}',
+                'tissue': rng.choice(['liver', 'brain']),
+                'expression': rng.choice(values),
+            }
+            for i in range(n)
+        ],
+    }
+
+
+QUERIES = [
+    {'action': 'list', 'entity_type': 'disease', 'filters': {'phase': '2'}},
+    {'action': 'find', 'entity_type': 'disease', 'filters': {'phase': 'Phase 3'}},
+    {'action': 'list', 'entity_type': 'disease', 'filters': {'phase': '9'}},
+    {'action': 'list', 'entity_type': 'drug', 'entity': 'DrugA', 'filters': {'phase': '2'}},
+    {'action': 'list', 'entity_type': 'drug', 'entity': 'DrugC', 'filters': {'phase': '1'}},
+    {'action': 'list', 'entity_type': 'target', 'filters': {'snp': True}},
+    {
+        'action': 'describe',
+        'entity_type': 'target',
+        'filters': {'tissue': 'liver', 'expression_threshold': 5},
+    },
+    {'action': 'describe', 'entity_type': 'gene', 'filters': {'expression_threshold': '1.5'}},
+    {'action': 'describe', 'entity_type': 'target', 'filters': {'tissue': 'lung'}},
+]
+
+
+@pytest.mark.parametrize('parsed', QUERIES)
+def test_prepared_matches_plain_retrieval(parsed):
+    agent = MatcherAgent()
+    retrieved = make_retrieval()
+    prepared = PreparedData(retrieved)
+    assert agent.match(parsed, prepared) == agent.match(parsed, retrieved)
+    assert agent.match(parsed, prepared) == agent.match(parsed, retrieved)
+
+
+@pytest.mark.parametrize('filters', [{}, {'expression_threshold': 5}])
+def test_prepared_gene_expression(filters):
+    agent = MatcherAgent()
+    retrieved = make_retrieval(seed=1)
+    del retrieved['expression_data']
+    parsed = {'action': 'describe', 'entity_type': 'gene', 'filters': filters}
+    assert agent.match(parsed, PreparedData(retrieved)) == agent.match(parsed, retrieved)
+
+
+def test_prepared_data_is_a_mapping():
+    retrieved = {'diseases': [{'name': 'D1', 'phase': '1'}]}
+    prepared = PreparedData(retrieved)
+    assert dict(prepared) == retrieved
+    assert prepared.get('targets') is None
+    assert prepared.diseases_by_phase(1) == [{'name': 'D1', 'phase': '1'}]
+    assert prepared.expression_data(None, 0) == []
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import query_builder
+from grid_agentic_ai.agents import retriever_opentargets as retriever
+from grid_agentic_ai.agents.query_builder import build_query
+
+
+def compact(doc):
+    return ' '.join(doc.split())
+
+
+def test_drug_phase_intent_selects_phase_and_status():
+    doc, variables = build_query({'entity_type': 'drug', 'filters': {'phase': '2'}}, 'CHEMBL941')
+    assert variables == {'id': 'CHEMBL941'}
+    assert compact(doc) == (
+        'query DrugIndications($id: String!) { drug(chemblId: $id) { id indications { '
+        'rows { disease { id name } phase status } } } }'
+    )
+
+
+def test_drug_intent_without_filters_skips_phase():
+    doc, _ = build_query({'entity_type': 'drug', 'filters': {}}, 'CHEMBL941')
+    assert 'phase' not in doc and 'status' not in doc
+
+
+def test_disease_intent_with_paging_and_ordering():
+    doc, variables = build_query(
+        {'entity_type': 'disease'}, 'EFO_1', page_size=50, page_index=2, order_by_score='score'
+    )
+    assert variables == {'id': 'EFO_1', 'index': 2, 'size': 50, 'orderByScore': 'score'}
+    assert (
+        'associatedTargets(page: {index: $index, size: $size}, orderByScore: $orderByScore)'
+        in doc
+    )
+    assert 'count' in doc
+    assert compact(doc).endswith('rows { target { id approvedSymbol } score } } } }')
+
+
+def test_gene_expression_intent_requests_expressions():
+    doc, variables = build_query(
+        {'entity_type': 'gene', 'filters': {'tissue': 'liver'}}, 'ENSG1', page_size=10
+    )
+    assert variables == {'id': 'ENSG1'}
+    assert 'target(ensemblId: $id)' in doc
+    assert 'expressions { tissue { label } rna { value } }' in compact(doc)
+
+
+def test_compiled_documents_are_cached():
+    query_builder.compile_query.cache_clear()
+    first, _ = build_query({'entity_type': 'disease'}, 'EFO_1')
+    second, _ = build_query({'entity_type': 'disease'}, 'EFO_2')
+    assert first is second
+    assert query_builder.compile_query.cache_info().hits == 1
+
+
+def test_unknown_entity_type():
+    with pytest.raises(ValueError):
+        build_query({'entity_type': None}, 'x')
+
+
+def test_get_for_intent_posts_built_document(monkeypatch):
+    sent = {}
+
+    def fake_post(query, variables):
+        sent.update(query=query, variables=variables)
+        return {'data': {'drug': None}}
+
+    monkeypatch.setattr(retriever, '_post', fake_post)
+    res = retriever.get_for_intent({'entity_type': 'drug', 'filters': {}}, 'CHEMBL1')
+    assert res == {'data': {'drug': None}}
+    assert sent['variables'] == {'id': 'CHEMBL1'}
+    assert 'DrugIndications' in sent['query']
@@ -1,8 +1,11 @@
 import os
 import sys
 
+import pytest
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
+from grid_agentic_ai.agents import query_parser
 from grid_agentic_ai.agents.query_parser import QueryParserAgent
 
 parser = QueryParserAgent()
@@ -54,3 +57,67 @@ def test_parse_list_diseases_for_drug_phase_query():
     assert res["entity"] == "Imatinib"
     assert res["entity_type"] == "drug"
     assert res["filters"].get("phase") == "2"
+
+
+def test_matches_legacy_parser(capsys):
+    from grid_agentic_ai.benchmarks.bench_query_parser import legacy_parse, make_corpus
+
+    corpus = make_corpus(2000, seed=1) + [
+        "",
+        "TARGETING kras\nin PHASE 3",
+        "Is Ｋinase-1 approved for rats?",
+        "drugs for Graves disease targeting TSHR",
+        "Which trial is Aspirin in? phase 4, zebrafish",
+        "genes with expression 3 in humans",
+    ]
+    for query in corpus:
+        assert parser.parse(query) == legacy_parse(query), query
+
+
+def parser_stub(query):
+    return {"entity": None, "entity_type": None, "action": "unknown", "filters": {}}, None
+
+
+def test_benchmark_accepts_only_intended_differences(monkeypatch):
+    from grid_agentic_ai.benchmarks import bench_query_parser as bench
+
+    queries = [
+        "Find diseases associated with Imatinib  mesylate",
+        "Find diseases associated with Imatinib Phase 2",
+        "Find diseases associated with Crohn’s disease",
+    ]
+    try:
+        assert bench.check_parser(parser, queries) == 3
+        monkeypatch.setattr(QueryParserAgent, '_parse', lambda self, q: parser_stub(q))
+        with pytest.raises(SystemExit):
+            bench.check_parser(QueryParserAgent(), queries)
+    finally:
+        query_parser.configure_parse_cache()
+
+
+def test_parse_cache_keys_on_canonical_text():
+    query_parser.configure_parse_cache()
+    first = parser.parse("Find diseases associated with Vemurafenib")
+    first["filters"]["phase"] = "9"
+    first["entity"] = "changed"
+
+    again = parser.parse("  find   DISEASES associated with VEMURAFENIB? ")
+    assert again == {
+        "entity": "VEMURAFENIB",
+        "entity_type": "drug",
+        "action": "find",
+        "filters": {},
+    }
+    assert parser.parse("Show trials for Crohn’s disease phase 2")["entity"] == "Crohn's disease"
+    assert parser.parse("SHOW TRIALS FOR CROHN'S DISEASE PHASE 2")["entity"] == "CROHN'S DISEASE"
+    assert query_parser.parse_cache_stats()["hits"] == 2
+
+
+def test_parse_with_fallback(capsys):
+    query_parser.configure_parse_cache(0)
+    res = parser.parse_with_fallback("Results for Nilotinib please")
+    assert res["entity"] == "Nilotinib"
+    assert res["entity_type"] == "drug"
+    assert parser.parse_with_fallback("Drugs for Graves disease")["entity_type"] == "drug"
+    assert query_parser.parse_cache_stats() == {}
+    query_parser.configure_parse_cache()
@@ -0,0 +1,74 @@
+import json
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents.matcher import MatcherAgent
+from grid_agentic_ai.agents.output_generator import OutputGeneratorAgent
+from grid_agentic_ai.agents.records import (
+    ExpressionRecord,
+    Indication,
+    TargetAssociation,
+    Trial,
+    parse_expressions,
+    parse_indications,
+    parse_targets,
+    parse_trials,
+)
+
+TARGETS = {'data': {'disease': {'id': 'EFO_1', 'associatedTargets': {'rows': [
+    {'target': {'id': 'ENSG1', 'approvedSymbol': 'BRAF'}, 'score': 0.9},
+    {'target': {'id': 'ENSG2', 'approvedSymbol': 'KRAS'}, 'score': 0.4},
+]}}}}
+
+INDICATIONS = {'data': {'drug': {'id': 'CHEMBL941', 'indications': {'rows': [
+    {'disease': {'id': 'EFO_2', 'name': 'CML'}, 'phase': 4, 'status': None},
+    {'disease': {'id': 'EFO_3', 'name': 'GIST'}, 'phase': 2, 'status': 'Phase 2 recruiting'},
+]}}}}
+
+
+def test_parse_targets_and_dict_view():
+    rows = parse_targets(TARGETS)
+    assert rows[0] == {'id': 'ENSG1', 'approvedSymbol': 'BRAF', 'score': 0.9}
+    assert rows[0].approvedSymbol == 'BRAF'
+    assert rows[1]['score'] == 0.4
+    assert parse_targets(TARGETS['data']['disease']['associatedTargets']['rows']) == rows
+    assert parse_targets({'data': {'disease': None}}) == []
+    assert parse_targets(None) == []
+    assert not hasattr(rows[0], '__dict__')
+
+
+def test_none_fields_are_absent():
+    ind = parse_indications(INDICATIONS)[0]
+    assert ind.status is None
+    assert 'status' not in ind
+    assert ind.get('status', 'n/a') == 'n/a'
+    assert dict(ind) == ind.to_dict() == {'id': 'EFO_2', 'name': 'CML', 'phase': 4}
+    assert len(ind) == 3
+    assert repr(ind) == "Indication(id='EFO_2', name='CML', phase=4, status=None)"
+    assert pickle.loads(pickle.dumps(ind)) == ind
+
+
+def test_trials_and_expressions():
+    rows = [{'title': 'T', 'phase': 'Phase 2', 'status': 'Recruiting'}]
+    trials = parse_trials(rows, drug='DrugA')
+    assert trials == [Trial('T', 'Phase 2', 'Recruiting', 'DrugA')]
+    data = {'data': {'target': {'id': 'ENSG1', 'expressions': [
+        {'tissue': {'label': 'liver'}, 'rna': {'value': 5}},
+    ]}}}
+    assert parse_expressions(data) == [ExpressionRecord('ENSG1', 'liver', 5)]
+    assert TargetAssociation(score=1) == {'score': 1}
+
+
+def test_records_work_with_matcher_and_output(tmp_path):
+    agent = MatcherAgent()
+    parsed = {'action': 'list', 'entity_type': 'disease', 'filters': {'phase': '2'}}
+    diseases = parse_indications(INDICATIONS)
+    assert agent.match(parsed, {'diseases': diseases}) == {'diseases_by_phase': [diseases[1]]}
+
+    path = tmp_path / 'out.json'
+    OutputGeneratorAgent().to_json(diseases, str(path))
+    assert json.loads(path.read_text())[0] == {'id': 'EFO_2', 'name': 'CML', 'phase': 4}
+    assert 'GIST' in OutputGeneratorAgent().to_table([Indication('EFO_3', 'GIST')])
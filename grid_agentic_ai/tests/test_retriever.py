@@ -16,10 +16,30 @@ if not hasattr(requests_mod, 'exceptions'):
     exc_mod = types.SimpleNamespace(RequestException=Exception)
     requests_mod.exceptions = exc_mod
 
+import pytest
+
 import requests
+from grid_agentic_ai.agents import http_client
+from grid_agentic_ai.agents import retry
 from grid_agentic_ai.agents import retriever_opentargets as retriever
 
 
+@pytest.fixture(autouse=True)
+def fresh_retry_policy(monkeypatch):
+    monkeypatch.setattr(retry, '_policy', retry.RetryPolicy())
+
+
+class FakeSession:
+    def __init__(self, post=None, get=None):
+        self.post = post
+        self.get = get
+
+
+def use_session(monkeypatch, **methods):
+    client = http_client.HTTPClient(session=FakeSession(**methods))
+    monkeypatch.setattr(http_client, '_client', client)
+
+
 class FakeResponse:
     def __init__(self, json_data, status_code=200):
         self._json = json_data
@@ -39,12 +59,37 @@ def test_post_success(monkeypatch):
         assert json['variables'] == {'x': 1}
         return FakeResponse({'ok': True})
 
-    monkeypatch.setattr(requests, 'post', fake_post)
+    use_session(monkeypatch, post=fake_post)
     reload(retriever)
     res = retriever._post('query', {'x': 1})
     assert res == {'ok': True}
 
 
+def test_requests_use_per_host_timeouts(monkeypatch):
+    seen = []
+
+    def fake_post(url, json=None, timeout=None):
+        seen.append(timeout)
+        return FakeResponse({'data': {}})
+
+    def fake_get(url, params=None, timeout=None):
+        seen.append(timeout)
+        return FakeResponse({'studies': []})
+
+    client = http_client.HTTPClient(
+        session=FakeSession(post=fake_post, get=fake_get),
+        hosts={
+            'api.platform.opentargets.org': {'timeout': 3},
+            'clinicaltrials.gov': {'timeout': 7},
+        },
+    )
+    monkeypatch.setattr(http_client, '_client', client)
+    reload(retriever)
+    retriever._post('query', {'x': 2})
+    list(retriever.iter_trials_for_disease('asthma'))
+    assert seen == [3, 7]
+
+
 def test_post_no_requests(monkeypatch):
     monkeypatch.setattr(retriever, 'requests', None)
     res = retriever._post('query', {})
@@ -60,8 +105,8 @@ def test_post_retry_success(monkeypatch):
             raise requests.exceptions.RequestException('fail')
         return FakeResponse({'ok': True})
 
-    monkeypatch.setattr(requests, 'post', fake_post)
-    monkeypatch.setattr(retriever.time, 'sleep', lambda x: None)
+    use_session(monkeypatch, post=fake_post)
+    monkeypatch.setattr(retry.time, 'sleep', lambda x: None)
     reload(retriever)
     res = retriever._post('query', {'x': 1})
     assert res == {'ok': True}
@@ -72,8 +117,8 @@ def test_post_retry_failure(monkeypatch):
     def fake_post(url, json=None, timeout=None):
         raise requests.exceptions.RequestException('fail')
 
-    monkeypatch.setattr(requests, 'post', fake_post)
-    monkeypatch.setattr(retriever.time, 'sleep', lambda x: None)
+    use_session(monkeypatch, post=fake_post)
+    monkeypatch.setattr(retry.time, 'sleep', lambda x: None)
     reload(retriever)
     res = retriever._post('query', {})
     assert res is None
@@ -97,7 +142,7 @@ def test_get_targets_for_disease(monkeypatch):
             }
         })
 
-    monkeypatch.setattr(requests, 'post', fake_post)
+    use_session(monkeypatch, post=fake_post)
     reload(retriever)
     res = retriever.get_targets_for_disease('EFO:1')
     assert res['data']['disease']['associatedTargets']['rows'][0]['target']['approvedSymbol'] == 'BRAF'
@@ -122,7 +167,7 @@ def test_get_diseases_for_drug(monkeypatch):
             }
         })
 
-    monkeypatch.setattr(requests, 'post', fake_post)
+    use_session(monkeypatch, post=fake_post)
     reload(retriever)
     res = retriever.get_diseases_for_drug('CHEMBL1')
     assert res['data']['drug']['indications']['rows'][0]['disease']['name'] == 'Disease A'
@@ -131,25 +176,26 @@ def test_get_diseases_for_drug(monkeypatch):
 def test_get_trials_for_disease(monkeypatch):
     def fake_get(url, params=None, timeout=None):
         assert 'study_fields' in url
-        assert params['expr'] == 'Cancer'
+        assert params['expr'] == 'Cancer AND AREA[Phase]"Phase 2"'
+        assert params['fields'] == 'BriefTitle,Phase,OverallStatus'
         return FakeResponse({
             'StudyFieldsResponse': {
                 'StudyFields': [
                     {
                         'BriefTitle': ['Trial A'],
                         'Phase': ['Phase 2'],
-                        'Status': ['Recruiting'],
+                        'OverallStatus': ['Recruiting'],
                     },
                     {
                         'BriefTitle': ['Trial B'],
                         'Phase': ['Phase 1'],
-                        'Status': ['Completed'],
+                        'OverallStatus': ['Completed'],
                     },
                 ]
             }
         })
 
-    monkeypatch.setattr(requests, 'get', fake_get)
+    use_session(monkeypatch, get=fake_get)
     reload(retriever)
     res = retriever.get_trials_for_disease('Cancer', phase='Phase 2')
     assert res == [{'title': 'Trial A', 'phase': 'Phase 2', 'status': 'Recruiting'}]
@@ -159,7 +205,250 @@ def test_get_trials_for_disease_error(monkeypatch):
     def fake_get(url, params=None, timeout=None):
         raise requests.exceptions.RequestException('fail')
 
-    monkeypatch.setattr(requests, 'get', fake_get)
+    use_session(monkeypatch, get=fake_get)
     reload(retriever)
     res = retriever.get_trials_for_disease('Cancer')
     assert res == []
+
+
+def test_post_uses_cache(monkeypatch, tmp_path):
+    calls = {'c': 0}
+
+    def fake_post(url, json=None, timeout=None):
+        calls['c'] += 1
+        return FakeResponse({'data': {'n': calls['c']}})
+
+    use_session(monkeypatch, post=fake_post)
+    reload(retriever)
+    retriever.configure_cache(str(tmp_path / 'ot.sqlite'))
+    try:
+        first = retriever._post('query', {'x': 1})
+        second = retriever._post('query', {'x': 1})
+        other = retriever._post('query', {'x': 2})
+        stats = retriever.cache_stats()
+    finally:
+        retriever.disable_cache()
+    assert first == second == {'data': {'n': 1}}
+    assert other == {'data': {'n': 2}}
+    assert calls['c'] == 2
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+
+def test_post_does_not_cache_errors(monkeypatch):
+    calls = {'c': 0}
+
+    def fake_post(url, json=None, timeout=None):
+        calls['c'] += 1
+        return FakeResponse({'errors': [{'message': 'bad'}]})
+
+    use_session(monkeypatch, post=fake_post)
+    reload(retriever)
+    retriever.configure_cache(':memory:')
+    try:
+        retriever._post('query', {})
+        retriever._post('query', {})
+    finally:
+        retriever.disable_cache()
+    assert calls['c'] == 2
+
+
+def test_get_diseases_for_drugs_batches_with_aliases(monkeypatch):
+    sent = []
+
+    def fake_post(url, json=None, timeout=None):
+        sent.append(json)
+        variables = json['variables']
+        data = {
+            f'e{i}': {'id': variables[f'id{i}'], 'indications': {'rows': []}}
+            for i in range(len(variables))
+        }
+        return FakeResponse({'data': data})
+
+    use_session(monkeypatch, post=fake_post)
+    reload(retriever)
+    ids = ['CHEMBL1', 'CHEMBL2', 'CHEMBL3', 'CHEMBL1', 'CHEMBL4', 'CHEMBL5']
+    res = retriever.get_diseases_for_drugs(ids, chunk_size=2)
+
+    assert len(sent) == 3
+    assert 'GetDiseasesForDrugs' in sent[0]['query']
+    assert 'e1: drug(chemblId: $id1)' in sent[0]['query']
+    assert sent[1]['variables'] == {'id0': 'CHEMBL3', 'id1': 'CHEMBL4'}
+    assert list(res) == ['CHEMBL1', 'CHEMBL2', 'CHEMBL3', 'CHEMBL4', 'CHEMBL5']
+    assert res['CHEMBL4'] == {'data': {'drug': {'id': 'CHEMBL4', 'indications': {'rows': []}}}}
+
+
+def test_get_targets_for_diseases_failed_chunk(monkeypatch):
+    def fake_post(url, json=None, timeout=None):
+        if json['variables'].get('id0') == 'EFO_2':
+            raise requests.exceptions.RequestException('fail')
+        return FakeResponse({'data': {'e0': {'id': 'EFO_1'}}})
+
+    use_session(monkeypatch, post=fake_post)
+    monkeypatch.setattr(retry.time, 'sleep', lambda x: None)
+    reload(retriever)
+    res = retriever.get_targets_for_diseases(['EFO_1', 'EFO_2'], chunk_size=1)
+    assert res == {'EFO_1': {'data': {'disease': {'id': 'EFO_1'}}}, 'EFO_2': None}
+
+
+def _paged_targets(total):
+    scores = [round(1 - i / total, 4) for i in range(total)]
+
+    def fake_post(url, json=None, timeout=None):
+        assert 'GetTargetsForDiseasePage' in json['query']
+        index, size = json['variables']['index'], json['variables']['size']
+        fake_post.pages.append(index)
+        rows = [
+            {'target': {'id': f'T{i}', 'approvedSymbol': f'S{i}'}, 'score': scores[i]}
+            for i in range(index * size, min((index + 1) * size, total))
+        ]
+        return FakeResponse({
+            'data': {'disease': {'associatedTargets': {'count': total, 'rows': rows}}}
+        })
+
+    fake_post.pages = []
+    return fake_post
+
+
+def test_iter_targets_for_disease_walks_all_pages(monkeypatch):
+    fake_post = _paged_targets(10)
+    use_session(monkeypatch, post=fake_post)
+    reload(retriever)
+    rows = list(retriever.iter_targets_for_disease('EFO:1', page_size=4))
+    assert [r['target']['id'] for r in rows] == [f'T{i}' for i in range(10)]
+    assert fake_post.pages == [0, 1, 2]
+
+
+def test_iter_targets_for_disease_stops_early(monkeypatch):
+    fake_post = _paged_targets(10)
+    use_session(monkeypatch, post=fake_post)
+    reload(retriever)
+    rows = list(retriever.iter_targets_for_disease('EFO:1', page_size=3, top_n=4))
+    assert len(rows) == 4
+    assert fake_post.pages == [0, 1]
+
+    fake_post.pages.clear()
+    rows = list(retriever.iter_targets_for_disease('EFO:1', page_size=3, min_score=0.75))
+    assert [r['score'] for r in rows] == [1.0, 0.9, 0.8]
+    assert fake_post.pages == [0, 1]
+
+
+def test_iter_targets_for_disease_request_failure(monkeypatch):
+    def fake_post(url, json=None, timeout=None):
+        raise requests.exceptions.RequestException('fail')
+
+    use_session(monkeypatch, post=fake_post)
+    monkeypatch.setattr(retry.time, 'sleep', lambda x: None)
+    reload(retriever)
+    with pytest.raises(retriever.RetrievalError):
+        list(retriever.iter_targets_for_disease('EFO:1'))
+
+
+def test_iter_targets_for_disease_failed_page_is_not_the_end(monkeypatch):
+    paged = _paged_targets(10)
+
+    def fake_post(url, json=None, timeout=None):
+        if json['variables']['index'] == 1:
+            raise requests.exceptions.RequestException('fail')
+        return paged(url, json=json, timeout=timeout)
+
+    use_session(monkeypatch, post=fake_post)
+    monkeypatch.setattr(retry.time, 'sleep', lambda x: None)
+    reload(retriever)
+    rows = []
+    with pytest.raises(retriever.RetrievalError):
+        for row in retriever.iter_targets_for_disease('EFO:1', page_size=4):
+            rows.append(row)
+    assert len(rows) == 4
+
+
+def test_iter_trials_for_disease_pages(monkeypatch):
+    requested = []
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append((params['min_rnk'], params['max_rnk']))
+        start = params['min_rnk']
+        stop = min(params['max_rnk'], 5)
+        return FakeResponse({
+            'StudyFieldsResponse': {
+                'NStudiesFound': 5,
+                'StudyFields': [
+                    {
+                        'BriefTitle': [f'Trial {i}'],
+                        'Phase': ['Phase 3'],
+                        'OverallStatus': ['Recruiting'],
+                    }
+                    for i in range(start, stop + 1)
+                ],
+            }
+        })
+
+    use_session(monkeypatch, get=fake_get)
+    reload(retriever)
+    trials = retriever.iter_trials_for_disease('Asthma', status='Recruiting', page_size=2)
+    assert [t['title'] for t in trials] == [f'Trial {i}' for i in range(1, 6)]
+    assert requested == [(1, 2), (3, 4), (5, 6)]
+
+    requested.clear()
+    res = retriever.get_trials_for_disease('Asthma', max_results=3)
+    assert len(res) == 3
+    assert requested == [(1, 1000)]
+
+
+def test_iter_trials_for_disease_failed_page_raises(monkeypatch):
+    def fake_get(url, params=None, timeout=None):
+        if params['min_rnk'] > 1:
+            raise requests.exceptions.RequestException('fail')
+        return FakeResponse({
+            'StudyFieldsResponse': {
+                'NStudiesFound': 4,
+                'StudyFields': [
+                    {'BriefTitle': ['T'], 'Phase': [], 'OverallStatus': ['Recruiting']}
+                ] * 2,
+            }
+        })
+
+    use_session(monkeypatch, get=fake_get)
+    reload(retriever)
+    trials = retriever.iter_trials_for_disease('Asthma', page_size=2)
+    assert len([next(trials), next(trials)]) == 2
+    with pytest.raises(retriever.RetrievalError):
+        next(trials)
+
+
+def test_get_trials_for_disease_is_bounded_by_default(monkeypatch):
+    requested = []
+
+    def fake_get(url, params=None, timeout=None):
+        requested.append(params['min_rnk'])
+        return FakeResponse({
+            'StudyFieldsResponse': {
+                'NStudiesFound': 5000,
+                'StudyFields': [
+                    {'BriefTitle': ['T'], 'Phase': [], 'OverallStatus': ['Recruiting']}
+                ] * (params['max_rnk'] - params['min_rnk'] + 1),
+            }
+        })
+
+    use_session(monkeypatch, get=fake_get)
+    reload(retriever)
+    assert len(retriever.get_trials_for_disease('Cancer')) == retriever.DEFAULT_TRIALS_LIMIT
+    assert requested == [1]
+
+
+def test_iter_trials_for_disease_status_filter(monkeypatch):
+    def fake_get(url, params=None, timeout=None):
+        assert params['expr'] == 'Asthma AND AREA[OverallStatus]"Completed"'
+        return FakeResponse({
+            'StudyFieldsResponse': {
+                'StudyFields': [
+                    {'BriefTitle': ['A'], 'Phase': [], 'OverallStatus': ['Completed']},
+                    {'BriefTitle': ['B'], 'Phase': ['Phase 1'], 'OverallStatus': ['Recruiting']},
+                ]
+            }
+        })
+
+    use_session(monkeypatch, get=fake_get)
+    reload(retriever)
+    res = retriever.get_trials_for_disease('Asthma', status='Completed')
+    assert res == [{'title': 'A', 'phase': '', 'status': 'Completed'}]
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import retriever_async
+from grid_agentic_ai.agents import retriever_opentargets as retriever
+
+
+def test_async_counterparts_return_sync_shapes(monkeypatch):
+    payload = {'data': {'drug': {'indications': {'rows': []}}}}
+    monkeypatch.setattr(retriever, 'get_diseases_for_drug', lambda cid: payload)
+    monkeypatch.setattr(retriever, 'get_targets_for_disease', lambda efo: {'efo': efo})
+    monkeypatch.setattr(
+        retriever, 'get_trials_for_disease',
+        lambda name, phase=None, status=None, max_results=100: [{'title': name, 'phase': phase}],
+    )
+
+    assert asyncio.run(retriever_async.get_diseases_for_drug_async('CHEMBL1')) == payload
+    assert asyncio.run(retriever_async.get_targets_for_disease_async('EFO_1')) == {'efo': 'EFO_1'}
+    trials = asyncio.run(retriever_async.get_trials_for_disease_async('Cancer', 'Phase 2'))
+    assert trials == [{'title': 'Cancer', 'phase': 'Phase 2'}]
+
+
+def test_gather_respects_concurrency_limit(monkeypatch):
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0, 'calls': []}
+
+    def fake_get(chembl_id):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['calls'].append(chembl_id)
+        time.sleep(0.01)
+        with lock:
+            state['active'] -= 1
+        return {'id': chembl_id}
+
+    monkeypatch.setattr(retriever, 'get_diseases_for_drug', fake_get)
+    ids = [f'CHEMBL{i}' for i in range(12)] + ['CHEMBL0']
+    results = asyncio.run(retriever_async.gather_diseases_for_drugs(ids, concurrency=3))
+
+    assert list(results) == [f'CHEMBL{i}' for i in range(12)]
+    assert results['CHEMBL5'] == {'id': 'CHEMBL5'}
+    assert len(state['calls']) == 12
+    assert state['peak'] <= 3
+
+
+def test_gather_runs_beyond_default_executor_cap(monkeypatch):
+    concurrency = 40
+    barrier = threading.Barrier(concurrency, timeout=5)
+
+    def fake_get(efo_id):
+        barrier.wait()
+        return efo_id
+
+    monkeypatch.setattr(retriever, 'get_targets_for_disease', fake_get)
+    ids = [f'EFO_{i}' for i in range(concurrency)]
+    results = asyncio.run(
+        retriever_async.gather_targets_for_diseases(ids, concurrency=concurrency)
+    )
+    assert list(results.values()) == ids
+
+
+def test_gather_trials_passes_filters(monkeypatch):
+    monkeypatch.setattr(
+        retriever, 'get_trials_for_disease',
+        lambda name, phase=None, status=None, max_results=100: [(name, phase, status, max_results)],
+    )
+    results = asyncio.run(retriever_async.gather_trials_for_diseases(['A', 'B'], phase='Phase 1'))
+    assert results == {'A': [('A', 'Phase 1', None, 100)], 'B': [('B', 'Phase 1', None, 100)]}
+    results = asyncio.run(retriever_async.gather_trials_for_diseases(
+        ['A'], status='Recruiting', max_results=None
+    ))
+    assert results == {'A': [('A', None, 'Recruiting', None)]}
+
+
+def test_gather_rejects_bad_concurrency():
+    async def fetch(x):
+        return x
+
+    with pytest.raises(ValueError):
+        asyncio.run(retriever_async.gather_with_concurrency(fetch, ['a'], concurrency=0))
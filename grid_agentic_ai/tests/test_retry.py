@@ -0,0 +1,180 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import retry
+from grid_agentic_ai.agents.retry import CircuitBreaker, RetryBudget, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def failing(exc=ConnectionError):
+    def func():
+        func.calls += 1
+        raise exc('down')
+    func.calls = 0
+    return func
+
+
+def sequence(*responses):
+    items = list(responses)
+
+    def func():
+        func.calls += 1
+        item = items.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+    func.calls = 0
+    return func
+
+
+def record_sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_exponential_backoff_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(retry.random, 'uniform', lambda a, b: b)
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+    assert [policy.backoff(n) for n in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_retries_then_succeeds(monkeypatch):
+    sleeps = record_sleeps(monkeypatch)
+    policy = RetryPolicy(max_attempts=3)
+    ok = FakeResponse()
+    func = sequence(ConnectionError('x'), ConnectionError('y'), ok)
+    assert policy.call(func, 'h') is ok
+    assert func.calls == 3
+    assert len(sleeps) == 2
+    stats = policy.stats()
+    assert stats['retries'] == 2 and stats['successes'] == 1
+
+
+def test_gives_up_without_sleeping_after_last_attempt(monkeypatch):
+    sleeps = record_sleeps(monkeypatch)
+    policy = RetryPolicy(max_attempts=3)
+    func = failing()
+    assert policy.call(func, 'h') is None
+    assert func.calls == 3
+    assert len(sleeps) == 2
+    assert policy.stats()['failures'] == 1
+
+
+def test_honours_retry_after(monkeypatch):
+    sleeps = record_sleeps(monkeypatch)
+    policy = RetryPolicy(max_retry_after=30)
+    ok = FakeResponse()
+    func = sequence(
+        FakeResponse(429, {'Retry-After': '7'}), FakeResponse(503, {'Retry-After': '120'}), ok
+    )
+    assert policy.call(func, 'h') is ok
+    assert sleeps == [7.0, 30]
+    assert policy.stats()['retry_after_honored'] == 2
+
+
+def test_last_retryable_response_is_returned(monkeypatch):
+    record_sleeps(monkeypatch)
+    policy = RetryPolicy(max_attempts=2)
+    busy = FakeResponse(502)
+    assert policy.call(sequence(busy, busy), 'h') is busy
+
+
+def test_retry_budget_limits_retries(monkeypatch):
+    record_sleeps(monkeypatch)
+    policy = RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0, max_tokens=2))
+    func = failing()
+    assert policy.call(func, 'h') is None
+    assert func.calls == 3
+    assert policy.stats()['budget_exhausted'] == 1
+
+
+def test_circuit_breaker_fails_fast_and_recovers(monkeypatch):
+    record_sleeps(monkeypatch)
+    clock = {'t': 100.0}
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock['t'])
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    policy = RetryPolicy(max_attempts=2, breaker=breaker)
+
+    down = failing()
+    policy.call(down, 'bad')
+    policy.call(down, 'bad')
+    assert down.calls == 3
+    assert policy.stats()['open_circuits'] == ['bad']
+
+    assert policy.call(down, 'bad') is None
+    assert down.calls == 3
+    assert policy.call(sequence(FakeResponse()), 'good').status_code == 200
+
+    clock['t'] += 10
+    ok = FakeResponse()
+    assert policy.call(sequence(ok), 'bad') is ok
+    stats = policy.stats()
+    assert stats['open_circuits'] == []
+    assert stats['circuit_opened'] == 1
+    assert stats['circuit_rejected'] >= 1
+
+
+def test_half_open_circuit_admits_one_probe(monkeypatch):
+    clock = {'t': 100.0}
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock['t'])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure('h')
+    assert not breaker.allow('h')
+
+    clock['t'] += 10
+    assert breaker.allow('h')
+    assert not breaker.allow('h')
+    assert breaker.record_failure('h')
+    assert not breaker.allow('h')
+
+    clock['t'] += 10
+    assert breaker.allow('h')
+    assert not breaker.allow('h')
+    breaker.record_success('h')
+    assert breaker.allow('h') and breaker.allow('h')
+    assert breaker.open_hosts() == []
+
+
+def test_probe_is_released_when_call_raises(monkeypatch):
+    clock = {'t': 100.0}
+    monkeypatch.setattr(retry.time, 'monotonic', lambda: clock['t'])
+    policy = RetryPolicy(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10))
+    policy.breaker.record_failure('h')
+    clock['t'] += 10
+
+    def func():
+        raise KeyError('bug')
+
+    try:
+        policy.call(func, 'h', retry_on=(ConnectionError,))
+    except KeyError:
+        pass
+    assert policy.breaker.allow('h')
+
+
+def test_non_retryable_exception_propagates():
+    policy = RetryPolicy()
+
+    def func():
+        raise KeyError('bug')
+
+    try:
+        policy.call(func, 'h', retry_on=(ConnectionError,))
+    except KeyError:
+        pass
+    else:
+        raise AssertionError('KeyError should propagate')
+
+
+def test_configure_retry_replaces_shared_policy(monkeypatch):
+    monkeypatch.setattr(retry, '_policy', retry._policy)
+    policy = retry.configure_retry(max_attempts=1)
+    assert retry.get_policy() is policy
@@ -0,0 +1,80 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import normalizer
+from grid_agentic_ai.agents.cache import LRUCache
+from grid_agentic_ai.agents.singleflight import SingleFlight
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def slow(calls, value=None, exc=None):
+    def func():
+        calls.append(1)
+        time.sleep(0.05)
+        if exc is not None:
+            raise exc
+        return value
+    return func
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    results, errors = run_concurrently(8, lambda: flight.do('EFO_1', slow(calls, {'ok': 1})))
+    assert len(calls) == 1
+    assert results == [{'ok': 1}] * 8
+    stats = flight.stats()
+    assert stats['executed'] == 1
+    assert stats['shared'] == 7
+    assert stats['in_flight'] == 0
+
+
+def test_errors_are_shared_and_key_is_released():
+    flight = SingleFlight()
+    calls = []
+    _, errors = run_concurrently(4, lambda: flight.do('k', slow(calls, exc=ValueError('boom'))))
+    assert len(calls) == 1
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert flight.do('k', lambda: 'again') == 'again'
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+    assert flight.stats()['executed'] == 2
+
+
+def test_normalize_term_coalesces_and_copies(monkeypatch):
+    calls = []
+    monkeypatch.setattr(normalizer, '_inflight', SingleFlight())
+    monkeypatch.setattr(normalizer, '_memory_cache', LRUCache())
+    monkeypatch.setattr(
+        normalizer, '_resolve_term', lambda t, q: slow(calls, {'input': q, 'resolved_id': 'X'})()
+    )
+    results, _ = run_concurrently(5, lambda: normalizer.normalize_term('drug', 'Imatinib'))
+    assert len(calls) == 1
+    assert all(r == {'input': 'Imatinib', 'resolved_id': 'X'} for r in results)
+    results[0]['resolved_id'] = 'changed'
+    assert results[1]['resolved_id'] == 'X'
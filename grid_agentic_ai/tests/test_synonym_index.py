@@ -0,0 +1,143 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import normalizer
+from grid_agentic_ai.agents import synonym_index
+from grid_agentic_ai.agents.synonym_index import SynonymIndex, build_synonym_index
+
+EFO_OBO = """format-version: 1.2
+
+[Term]
+id: EFO:0000270
+name: asthma
+synonym: "Bronchial Asthma" EXACT []
+synonym: "reactive airway" RELATED []
+
+[Term]
+id: EFO:0000384
+name: Crohn's disease
+synonym: "Crohn disease" EXACT []
+
+[Term]
+id: EFO:0009999
+name: old term
+is_obsolete: true
+
+[Typedef]
+id: part_of
+name: part of
+"""
+
+HGNC_TSV = (
+    "hgnc_id\tsymbol\tname\talias_symbol\tprev_symbol\tentrez_id\n"
+    "HGNC:11998\tTP53\ttumor protein p53\tp53|LFS1\t\t7157\n"
+    "HGNC:1097\tBRAF\tB-Raf\tBRAF1\t\t673\n"
+)
+
+CHEMBL_TSV = (
+    "chembl_id\tpref_name\tsynonym\n"
+    "CHEMBL941\tIMATINIB\tGleevec\n"
+    "CHEMBL941\tIMATINIB\tSTI-571\n"
+)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    (tmp_path / 'efo.obo').write_text(EFO_OBO)
+    (tmp_path / 'hgnc.tsv').write_text(HGNC_TSV)
+    (tmp_path / 'chembl.tsv').write_text(CHEMBL_TSV)
+    path = str(tmp_path / 'synonyms.idx')
+    synonym_index.main([
+        path,
+        '--efo', str(tmp_path / 'efo.obo'),
+        '--hgnc', str(tmp_path / 'hgnc.tsv'),
+        '--chembl', str(tmp_path / 'chembl.tsv'),
+    ])
+    return path
+
+
+def test_lookup_by_name_and_synonym(index_path):
+    index = SynonymIndex(index_path)
+    assert index.lookup('disease', '  bronchial   ASTHMA ') == {
+        'input': '  bronchial   ASTHMA ',
+        'resolved_id': 'EFO:0000270',
+        'label': 'asthma',
+        'source': 'EFO (local index)',
+    }
+    assert index.lookup('disease', "crohn's disease")['resolved_id'] == 'EFO:0000384'
+    assert index.lookup('gene', 'p53') == {
+        'input': 'p53',
+        'resolved_id': 'TP53',
+        'label': 'TP53',
+        'source': 'HGNC (local index)',
+        'entrez_id': '7157',
+    }
+    assert index.lookup('drug', 'gleevec')['resolved_id'] == 'CHEMBL941'
+    assert index.lookup('drug', 'Imatinib')['label'] == 'IMATINIB'
+
+
+def test_lookup_misses(index_path):
+    index = SynonymIndex(index_path)
+    assert index.lookup('disease', 'reactive airway') is None
+    assert index.lookup('disease', 'old term') is None
+    assert index.lookup('gene', 'asthma') is None
+    assert index.lookup('gene', 'zzz') is None
+    assert index.lookup('drug', '') is None
+
+
+def test_terms_and_first_id_wins(tmp_path):
+    path = str(tmp_path / 'idx')
+    count = build_synonym_index(
+        [
+            ('gene', 'A', 'ID1', 'A', ''),
+            ('gene', 'a', 'ID2', 'A', ''),
+            ('drug', 'a', 'D1', 'A', ''),
+        ],
+        path,
+    )
+    index = SynonymIndex(path)
+    assert count == len(index) == 2
+    assert index.lookup('gene', 'A')['resolved_id'] == 'ID1'
+    assert sorted(index.terms()) == [('drug', 'a'), ('gene', 'a')]
+    assert list(index.terms('drug')) == [('drug', 'a')]
+
+
+def test_approved_symbol_beats_earlier_alias(tmp_path):
+    (tmp_path / 'hgnc.tsv').write_text(
+        "hgnc_id\tsymbol\tname\talias_symbol\tprev_symbol\tentrez_id\n"
+        "HGNC:1\tAAA1\tgene a\tBBB2\tCCC3\t1\n"
+        "HGNC:2\tBBB2\tgene b\t\t\t2\n"
+        "HGNC:3\tCCC3\tgene c\t\t\t3\n"
+    )
+    path = str(tmp_path / 'idx')
+    build_synonym_index(synonym_index.iter_hgnc_tsv(str(tmp_path / 'hgnc.tsv')), path)
+    index = SynonymIndex(path)
+    assert index.lookup('gene', 'BBB2')['resolved_id'] == 'BBB2'
+    assert index.lookup('gene', 'CCC3')['resolved_id'] == 'CCC3'
+    assert index.lookup('gene', 'AAA1')['resolved_id'] == 'AAA1'
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'bad.idx'
+    path.write_bytes(b'not an index at all')
+    with pytest.raises(ValueError):
+        SynonymIndex(str(path))
+
+
+def test_normalize_term_uses_index_before_network(index_path, monkeypatch):
+    def no_network(term_type, query):
+        raise AssertionError('network should not be used')
+
+    monkeypatch.setattr(normalizer, '_resolve_term', no_network)
+    normalizer.use_synonym_index(index_path)
+    try:
+        res = normalizer.normalize_term('gene', 'LFS1')
+        batch = normalizer.normalize_terms([('drug', 'STI-571'), ('disease', 'asthma')])
+    finally:
+        normalizer.use_synonym_index(None)
+    assert res['resolved_id'] == 'TP53'
+    assert [r['resolved_id'] for r in batch] == ['CHEMBL941', 'EFO:0000270']
@@ -0,0 +1,80 @@
+import gzip
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from grid_agentic_ai.agents import normalizer
+from grid_agentic_ai.agents import xref
+from grid_agentic_ai.agents.xref import XrefTable, build_xref_table, chembl_number
+
+UNICHEM = (
+    "From src:'1'\tTo src:'22'\n"
+    "CHEMBL941\t5291\n"
+    "CHEMBL1201581\t5291\n"
+    "CHEMBL25\t2244\n"
+    "not-a-row\n"
+)
+
+
+def test_lookup_both_directions(tmp_path):
+    mapping = tmp_path / 'src1src22.txt.gz'
+    with gzip.open(mapping, 'wt') as fh:
+        fh.write(UNICHEM)
+    path = str(tmp_path / 'xref.bin')
+    xref.main([path, str(mapping)])
+
+    table = XrefTable(path)
+    assert table.chembl_for_cid(5291) == 'CHEMBL941'
+    assert table.chembl_for_cid('2244') == 'CHEMBL25'
+    assert table.cid_for_chembl('chembl1201581') == 5291
+    assert table.cid_for_chembl('CHEMBL25') == 2244
+    assert table.chembl_for_cid(1) is None
+    assert table.cid_for_chembl('EFO:1') is None
+    table.close()
+
+
+def test_many_entries_with_collisions(tmp_path):
+    path = str(tmp_path / 'xref.bin')
+    pairs = [(f'CHEMBL{i * 7}', i * 3 + 1) for i in range(1, 5000)]
+    assert build_xref_table(pairs, path) == 4999
+    table = XrefTable(path)
+    assert all(table.chembl_for_cid(cid) == chembl for chembl, cid in pairs)
+    assert all(table.cid_for_chembl(chembl) == cid for chembl, cid in pairs)
+    assert table.chembl_for_cid(2) is None
+    table.close()
+
+
+def test_chembl_number():
+    assert chembl_number('CHEMBL941') == 941
+    assert chembl_number(' chembl12 ') == 12
+    assert chembl_number('CHEMBL') is None
+    assert chembl_number(941) is None
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(b'definitely not a table')
+    with pytest.raises(ValueError):
+        XrefTable(str(path))
+
+
+def test_normalize_term_adds_chembl_id(tmp_path, monkeypatch):
+    path = str(tmp_path / 'xref.bin')
+    build_xref_table([('CHEMBL941', 5291)], path)
+    fake_pcp = types.SimpleNamespace(get_compounds=lambda q, t: [types.SimpleNamespace(cid=5291)])
+    monkeypatch.setattr(normalizer, 'pcp', fake_pcp)
+    monkeypatch.setattr(normalizer, '_memory_cache', normalizer.LRUCache())
+    normalizer.use_xref_table(path)
+    try:
+        res = normalizer.normalize_term('drug', 'Imatinib')
+        batch = normalizer.normalize_terms([('drug', 'imatinib')])
+    finally:
+        normalizer.use_xref_table(None)
+    assert res['resolved_id'] == 5291
+    assert res['chembl_id'] == 'CHEMBL941'
+    assert batch[0]['chembl_id'] == 'CHEMBL941'
+    assert 'chembl_id' not in normalizer.normalize_term('drug', 'imatinib')
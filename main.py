@@ -1,46 +1,66 @@
 import argparse
+import contextlib
+import itertools
+import json
 import os
 import sys
-import re
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from collections.abc import Mapping
+from typing import Collection, Iterator, Set, TextIO
 
 # Allow importing from the hyphenated folder (if needed)
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'grid_agentic_ai')))
 
 from agents.query_parser import QueryParserAgent
-from agents.normalizer import normalize_term
-from agents.retriever_opentargets import get_targets_for_disease, get_diseases_for_drug
+from agents.normalizer import TERM_TYPES, normalize_any, normalize_term
+from agents.retriever_opentargets import get_for_intent
 from agents.matcher import MatcherAgent
 from agents.summarizer import SummarizerAgent
 from agents.output_generator import OutputGeneratorAgent
+from agents.records import parse_indications, parse_targets
 
 
-def run_query_pipeline(query: str) -> None:
-    """Run the GRID pipeline for a single query."""
-    parser = QueryParserAgent()
-    parsed = parser.parse(query)
+def _fan_out(parsed: dict) -> dict | None:
+    """Resolve the entity with every resolver, trying the parser's guess first."""
+    guess = parsed.get('entity_type')
+    order = [guess] + [t for t in TERM_TYPES if t != guess] if guess in TERM_TYPES else TERM_TYPES
+    result = normalize_any(parsed['entity'], order)
+    if result.get('resolved_id') is None:
+        return None
+    if result['type'] != guess:
+        print(f"Resolved as {result['type']} instead of {guess}.")
+        parsed['entity_type'] = result['type']
+    return result
 
-    # Heuristic fallback if parsing failed
-    if not parsed.get('entity'):
-        m = re.search(r"for\s+([A-Za-z0-9\-]+)", query, re.I)
-        if m:
-            parsed['entity'] = m.group(1)
-            if not parsed.get('entity_type'):
-                parsed['entity_type'] = 'drug'
 
-    if 'phase' not in parsed.get('filters', {}):
-        m = re.search(r"phase[-\s]*(\d+)", query, re.I)
-        if m:
-            parsed.setdefault('filters', {})['phase'] = m.group(1)
+def execute_query(query: str, resolve_any: bool = False) -> dict:
+    """Run parsing, normalization, retrieval, matching and summarization for a query.
 
-    if parsed.get('entity') and parsed.get('entity_type') == 'disease' and 'for' in query.lower():
-        parsed['entity_type'] = 'drug'
+    Returns the output of every stage; ``summary`` is ``None`` when the query
+    type is not supported. With ``resolve_any`` the entity is resolved against
+    all entity types at once instead of only the parsed one.
+    """
+    parser = QueryParserAgent()
+    parsed = parser.parse_with_fallback(query)
 
     print("Parsed query:", parsed)
 
     # Normalize entity (e.g., resolve "Imatinib" to ChEMBL ID)
     normalized = None
-    if parsed.get('entity') and parsed.get('entity_type'):
+    if parsed.get('entity') and resolve_any:
+        normalized = _fan_out(parsed)
+    elif parsed.get('entity') and parsed.get('entity_type'):
         normalized = normalize_term(parsed['entity_type'], parsed['entity'])
+        if normalized is None or normalized.get('resolved_id') is None:
+            print("Normalization failed. Trying all entity types.")
+            normalized = _fan_out(parsed) or normalized
+    if parsed.get('entity') and parsed.get('entity_type'):
         if normalized is None or normalized.get('resolved_id') is None:
             print("Normalization failed. Using fallback term.")
             if normalized is None:
@@ -49,17 +69,20 @@ def run_query_pipeline(query: str) -> None:
             normalized.setdefault('source', 'user input')
     print("Normalized entity:", normalized)
 
-    # Retrieve data
+    # Retrieve only the fields this query needs
     retrieved = {}
     try:
         if parsed.get('entity_type') == 'drug':
-            chembl_id = normalized.get('resolved_id') if normalized else parsed.get('entity')
-            res = get_diseases_for_drug(str(chembl_id))
-            retrieved['diseases'] = res
+            chembl_id = (
+                normalized.get('chembl_id') or normalized.get('resolved_id')
+                if normalized else parsed.get('entity')
+            )
+            res = get_for_intent(parsed, str(chembl_id))
+            retrieved['diseases'] = parse_indications(res)
         elif parsed.get('entity_type') == 'disease':
             efo_id = normalized.get('resolved_id') if normalized else parsed.get('entity')
-            res = get_targets_for_disease(str(efo_id))
-            retrieved['targets'] = res
+            res = get_for_intent(parsed, str(efo_id))
+            retrieved['targets'] = parse_targets(res)
     except Exception as exc:
         print('Retriever error:', exc)
 
@@ -69,13 +92,30 @@ def run_query_pipeline(query: str) -> None:
     matcher = MatcherAgent()
     matched = matcher.match(parsed, retrieved)
     print('Matched results:', matched)
+
+    summary = None
+    if not (isinstance(matched, dict) and matched.get('message') == 'Query type not supported'):
+        summarizer = SummarizerAgent()
+        summary = summarizer.summarize(matched, context=parsed)
+
+    return {
+        "parsed": parsed,
+        "normalized": normalized,
+        "retrieved": retrieved,
+        "matched": matched,
+        "summary": summary,
+    }
+
+
+def run_query_pipeline(query: str, resolve_any: bool = False) -> None:
+    """Run the GRID pipeline for a single query and print the results."""
+    result = execute_query(query, resolve_any=resolve_any)
+    matched = result["matched"]
     if isinstance(matched, dict) and matched.get('message') == 'Query type not supported':
         print('Query type not supported')
         return
 
-    # Summarize
-    summarizer = SummarizerAgent()
-    summary = summarizer.summarize(matched, context=parsed)
+    summary = result["summary"]
     if summary:
         print('Summary:', summary)
     else:
@@ -93,17 +133,196 @@ def run_query_pipeline(query: str) -> None:
             print(table_str)
 
 
+def iter_batch(
+    path: str, field: str = "query", offset: int = 0, skip: Collection[int] = ()
+) -> Iterator[dict]:
+    """Yield ``{"line", "id", "query"}`` records from a JSONL file, skipping ``offset`` lines.
+
+    Each line is a JSON string or an object holding the query text in ``field``
+    (and optionally an ``id``). Blank lines count towards the offset. Line
+    numbers in ``skip`` are left out as well.
+    """
+    with open(path, encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh):
+            if line_no < offset or line_no in skip or not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield {"line": line_no, "id": None, "query": None, "error": f"Invalid JSON: {exc}"}
+                continue
+            if isinstance(record, dict):
+                query = record.get(field)
+                record_id = record.get("id", record.get("request_id"))
+            else:
+                query, record_id = record, None
+            if not isinstance(query, str) or not query.strip():
+                yield {"line": line_no, "id": record_id, "query": None,
+                       "error": f"No query text in field {field!r}"}
+                continue
+            yield {"line": line_no, "id": record_id, "query": query}
+
+
+def completed_lines(path: str) -> Set[int]:
+    """Return the input ``line`` numbers already present in an NDJSON output file.
+
+    A missing file has none; a line cut short by a crash is ignored, so its
+    query runs again.
+    """
+    done: Set[int] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("line"), int):
+                done.add(record["line"])
+    return done
+
+
+def _open_for_resume(path: str) -> TextIO:
+    """Open ``path`` for appending, first ending a line cut short by a crash."""
+    out = open(path, "a+", encoding="utf-8")
+    if out.tell():
+        out.seek(out.tell() - 1)
+        last = out.read(1)
+        if last != "\n":
+            out.write("\n")
+    return out
+
+
+def run_batch_record(record: dict, resolve_any: bool = False) -> dict:
+    """Run one batch record and return its NDJSON output object."""
+    if record.get("error"):
+        return record
+    try:
+        result = execute_query(record["query"], resolve_any=resolve_any)
+    except Exception as exc:
+        return dict(record, error=f"{type(exc).__name__}: {exc}")
+    del result["retrieved"]
+    return dict(record, **result)
+
+
+def _json_default(value: object) -> object:
+    return dict(value) if isinstance(value, Mapping) else str(value)
+
+
+def _quiet_worker() -> None:
+    # Keep pipeline progress output out of the NDJSON stream.
+    sys.stdout = sys.stderr
+
+
+def run_batch(
+    path: str,
+    out: TextIO,
+    workers: int = 8,
+    executor: str = "thread",
+    offset: int = 0,
+    field: str = "query",
+    resolve_any: bool = False,
+    skip: Collection[int] = (),
+) -> int:
+    """Stream queries from a JSONL file through a worker pool.
+
+    One NDJSON line is written to ``out`` per query as soon as it finishes, so
+    results are not in input order; each carries its input ``line`` number.
+    To resume an interrupted run, pass the lines already written as ``skip``
+    (see ``completed_lines``); ``offset`` skips the first ``offset`` input
+    lines. Returns the number of queries processed.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if executor == "process":
+        pool: Executor = ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker)
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    count = 0
+    records = iter_batch(path, field=field, offset=offset, skip=skip)
+    pending: set = set()
+    with pool, contextlib.redirect_stdout(sys.stderr):
+        while True:
+            # Keep a bounded number of queries in flight so input is streamed.
+            for record in itertools.islice(records, workers * 4 - len(pending)):
+                pending.add(pool.submit(run_batch_record, record, resolve_any))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                out.write(json.dumps(future.result(), default=_json_default) + "\n")
+                out.flush()
+                count += 1
+    return count
+
+
 def main(argv: list[str] | None = None) -> None:
     """Entry point for the CLI."""
     argp = argparse.ArgumentParser(description="Run GRID agentic pipeline")
     argp.add_argument("query", nargs="?", help="Query text")
     argp.add_argument("--query", dest="query_flag", help="Query text")
+    argp.add_argument(
+        "--resolve-any",
+        action="store_true",
+        help="Resolve the entity as a drug, gene and disease concurrently",
+    )
+    argp.add_argument("--batch", metavar="FILE", help="Run every query in a JSONL file")
+    argp.add_argument(
+        "--field", default="query", help="JSON field holding the query text (batch mode)"
+    )
+    argp.add_argument("--workers", type=int, default=8, help="Worker count (batch mode)")
+    argp.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Run batch queries on threads or processes",
+    )
+    argp.add_argument(
+        "--offset", type=int, default=0, help="Skip this many input lines (batch mode)"
+    )
+    argp.add_argument("--output", help="Append NDJSON results here instead of stdout")
+    argp.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip input lines whose results are already in --output (batch mode)",
+    )
     args = argp.parse_args(argv)
 
+    if args.batch:
+        if args.resume and not args.output:
+            argp.error("--resume requires --output")
+        skip: Collection[int] = ()
+        if args.resume:
+            skip = completed_lines(args.output)
+            print(f"Resuming: {len(skip)} queries already done", file=sys.stderr)
+            out: TextIO = _open_for_resume(args.output)
+        elif args.output:
+            out = open(args.output, "a", encoding="utf-8")
+        else:
+            out = sys.stdout
+        try:
+            count = run_batch(
+                args.batch,
+                out,
+                workers=args.workers,
+                executor=args.executor,
+                offset=args.offset,
+                field=args.field,
+                resolve_any=args.resolve_any,
+                skip=skip,
+            )
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"Processed {count} queries", file=sys.stderr)
+        return
+
     q = args.query or args.query_flag
     if not q:
         argp.error("No query provided")
-    run_query_pipeline(q)
+    run_query_pipeline(q, resolve_any=args.resolve_any)
 
 
 if __name__ == "__main__":